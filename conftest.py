@@ -0,0 +1,53 @@
+"""
+Shared pytest fixtures for Canvas Automation Flow
+Model objects here are built once per session (once per worker under xdist)
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+# Fixed due date; tests pass their own "now" so results never depend on the clock
+FIXED_DUE = datetime(2099, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="session")
+def sample_user():
+    """Student user shared by the tests that need one"""
+    from auth.auth_service import User, UserRole
+
+    return User(
+        id="test_user",
+        canvas_user_id="789",
+        email="test@example.com",
+        name="Test User",
+        role=UserRole.STUDENT,
+        access_token="dummy_token"
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_course():
+    """Course the sample assignment belongs to"""
+    from models.data_models import Course
+
+    return Course(
+        id="test_course",
+        canvas_course_id="123",
+        name="Test Course",
+        course_code="TC101"
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_assignment(sample_course):
+    """Assignment in sample_course, due at FIXED_DUE"""
+    from models.data_models import Assignment
+
+    return Assignment(
+        id="test_assignment",
+        canvas_assignment_id="456",
+        course_id=sample_course.id,
+        name="Test Assignment",
+        due_at=FIXED_DUE
+    )
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Example usage of the Canvas automation data models
+Run from the repository root: python examples/data_models_demo.py
+"""
+
+import os
+import sys
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.data_models import Course, Assignment
+
+
+def main():
+    # Create sample data
+    course = Course(
+        id="course_1",
+        canvas_course_id="12345",
+        name="Introduction to Computer Science",
+        course_code="CS101"
+    )
+
+    assignment = Assignment(
+        id="assign_1",
+        canvas_assignment_id="67890",
+        course_id="course_1",
+        name="Programming Assignment 1",
+        due_at=datetime.utcnow(),
+        points_possible=100.0
+    )
+
+    print("✅ Data models created successfully")
+    print(f"Course: {course.name}")
+    print(f"Assignment: {assignment.name}")
+    print(f"Is due soon: {assignment.is_due_soon()}")
+    print(f"Is overdue: {assignment.is_overdue()}")
+
+
+if __name__ == "__main__":
+    main()
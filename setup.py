@@ -26,8 +26,9 @@ def run_command(command, description):
 def check_python_version():
     """Check if Python version is compatible"""
     version = sys.version_info
-    if version.major < 3 or (version.major == 3 and version.minor < 8):
-        print("❌ Python 3.8+ is required")
+    # 3.11 for datetime.fromisoformat with a trailing Z and slotted dataclasses
+    if version < (3, 11):
+        print("❌ Python 3.11+ is required")
         return False
     print(f"✅ Python {version.major}.{version.minor}.{version.micro} detected")
     return True
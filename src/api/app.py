@@ -112,6 +112,29 @@ def get_canvas_client(user: User) -> CanvasAPIClient:
     )
 
 
+def _file_fields(file_data: Dict[str, Any], course_id: str) -> Dict[str, Any]:
+    """File constructor arguments for a Canvas file, in File field order"""
+    get = file_data.get
+    url = get('url', '')
+    return {
+        'id': f"file_{file_data['id']}",
+        'canvas_file_id': str(file_data['id']),
+        'course_id': course_id,
+        'folder_id': str(get('folder_id', '')),
+        'display_name': get('display_name', ''),
+        'filename': get('filename', ''),
+        'content_type': get('content-type', ''),
+        'size': get('size', 0),
+        'url': url,
+        'download_url': url,  # Same as url for Canvas
+        'thumbnail_url': get('thumbnail_url'),
+        'mime_class': get('mime_class', ''),
+        'locked': get('locked', False),
+        'hidden': get('hidden', False),
+        'uuid': get('uuid', '')
+    }
+
+
 # Authentication endpoints
 @app.route('/auth/login', methods=['GET'])
 def get_auth_url():
@@ -326,13 +349,8 @@ def get_course_assignments(course_id: str):
         assignments = []
         for assignment_data in assignments_data:
             # Convert workflow_state to AssignmentStatus enum
-            workflow_state = assignment_data.get('workflow_state', 'published')
-            if workflow_state == 'published':
-                status = AssignmentStatus.PUBLISHED
-            elif workflow_state == 'unpublished':
-                status = AssignmentStatus.UNPUBLISHED
-            else:
-                status = AssignmentStatus.DRAFT
+            status = AssignmentStatus.from_workflow_state(
+                assignment_data.get('workflow_state', 'published'))
             
             assignment = Assignment(
                 id=f"assign_{assignment_data['id']}",
@@ -348,11 +366,11 @@ def get_course_assignments(course_id: str):
             
             # Parse dates
             if assignment_data.get('due_at'):
-                assignment.due_at = datetime.fromisoformat(assignment_data['due_at'].replace('Z', '+00:00'))
+                assignment.due_at = datetime.fromisoformat(assignment_data['due_at'])
             if assignment_data.get('lock_at'):
-                assignment.lock_at = datetime.fromisoformat(assignment_data['lock_at'].replace('Z', '+00:00'))
+                assignment.lock_at = datetime.fromisoformat(assignment_data['lock_at'])
             if assignment_data.get('unlock_at'):
-                assignment.unlock_at = datetime.fromisoformat(assignment_data['unlock_at'].replace('Z', '+00:00'))
+                assignment.unlock_at = datetime.fromisoformat(assignment_data['unlock_at'])
             
             assignments.append(assignment.to_dict())
         
@@ -380,13 +398,8 @@ def get_assignment_details(course_id: str, assignment_id: str):
         assignment_data = client.get_assignment(course_id, assignment_id)
         
         # Convert workflow_state to AssignmentStatus enum
-        workflow_state = assignment_data.get('workflow_state', 'published')
-        if workflow_state == 'published':
-            status = AssignmentStatus.PUBLISHED
-        elif workflow_state == 'unpublished':
-            status = AssignmentStatus.UNPUBLISHED
-        else:
-            status = AssignmentStatus.DRAFT
+        status = AssignmentStatus.from_workflow_state(
+            assignment_data.get('workflow_state', 'published'))
         
         assignment = Assignment(
             id=f"assign_{assignment_data['id']}",
@@ -403,11 +416,11 @@ def get_assignment_details(course_id: str, assignment_id: str):
         
         # Parse dates
         if assignment_data.get('due_at'):
-            assignment.due_at = datetime.fromisoformat(assignment_data['due_at'].replace('Z', '+00:00'))
+            assignment.due_at = datetime.fromisoformat(assignment_data['due_at'])
         if assignment_data.get('lock_at'):
-            assignment.lock_at = datetime.fromisoformat(assignment_data['lock_at'].replace('Z', '+00:00'))
+            assignment.lock_at = datetime.fromisoformat(assignment_data['lock_at'])
         if assignment_data.get('unlock_at'):
-            assignment.unlock_at = datetime.fromisoformat(assignment_data['unlock_at'].replace('Z', '+00:00'))
+            assignment.unlock_at = datetime.fromisoformat(assignment_data['unlock_at'])
         
         return jsonify({'assignment': assignment.to_dict()})
         
@@ -452,7 +465,7 @@ def get_assignment_submissions(course_id: str, assignment_id: str):
             )
             
             if submission_data.get('submitted_at'):
-                submission.submitted_at = datetime.fromisoformat(submission_data['submitted_at'].replace('Z', '+00:00'))
+                submission.submitted_at = datetime.fromisoformat(submission_data['submitted_at'])
             
             submissions.append(submission.to_dict())
         
@@ -735,7 +748,7 @@ def create_reminder():
             canvas_assignment_id=str(assignment_data['id']),
             course_id=data.get('course_id'),
             name=assignment_data['name'],
-            due_at=datetime.fromisoformat(assignment_data['due_at'].replace('Z', '+00:00')) if assignment_data.get('due_at') else None
+            due_at=datetime.fromisoformat(assignment_data['due_at']) if assignment_data.get('due_at') else None
         )
         
         if not assignment.due_at:
@@ -838,27 +851,12 @@ def get_course_files(course_id: str):
         folder_id = request.args.get('folder_id')
         files_data = client.get_files(course_id, folder_id)
         
-        files = []
-        for file_data in files_data:
-            file_obj = File(
-                id=f"file_{file_data['id']}",
-                canvas_file_id=str(file_data['id']),
-                course_id=course_id,
-                folder_id=str(file_data.get('folder_id', '')),
-                display_name=file_data.get('display_name', ''),
-                filename=file_data.get('filename', ''),
-                content_type=file_data.get('content-type', ''),
-                size=file_data.get('size', 0),
-                url=file_data.get('url', ''),
-                download_url=file_data.get('url', ''),  # Same as url for Canvas
-                thumbnail_url=file_data.get('thumbnail_url'),
-                mime_class=file_data.get('mime_class', ''),
-                locked=file_data.get('locked', False),
-                hidden=file_data.get('hidden', False),
-                uuid=file_data.get('uuid', '')
-            )
-            
-            files.append(file_obj.to_dict())
+        # Built straight as File.to_dict() output; the route never uses the File
+        now = datetime.utcnow().isoformat()
+        files = [
+            {**_file_fields(file_data, course_id), 'created_at': now, 'updated_at': now}
+            for file_data in files_data
+        ]
         
         return jsonify({'files': files})
         
@@ -883,23 +881,7 @@ def get_file_details(course_id: str, file_id: str):
         
         file_data = client.get_file(course_id, file_id)
         
-        file_obj = File(
-            id=f"file_{file_data['id']}",
-            canvas_file_id=str(file_data['id']),
-            course_id=course_id,
-            folder_id=str(file_data.get('folder_id', '')),
-            display_name=file_data.get('display_name', ''),
-            filename=file_data.get('filename', ''),
-            content_type=file_data.get('content-type', ''),
-            size=file_data.get('size', 0),
-            url=file_data.get('url', ''),
-            download_url=file_data.get('url', ''),
-            thumbnail_url=file_data.get('thumbnail_url'),
-            mime_class=file_data.get('mime_class', ''),
-            locked=file_data.get('locked', False),
-            hidden=file_data.get('hidden', False),
-            uuid=file_data.get('uuid', '')
-        )
+        file_obj = File(**_file_fields(file_data, course_id))
         
         return jsonify({'file': file_obj.to_dict()})
         
@@ -1156,7 +1138,7 @@ def get_assignment_help():
             course_id=str(assignment_data.get('course_id', course_id)),
             name=assignment_data.get('name', ''),
             description=assignment_data.get('description', ''),
-            due_at=datetime.fromisoformat(assignment_data['due_at'].replace('Z', '+00:00')) if assignment_data.get('due_at') else None,
+            due_at=datetime.fromisoformat(assignment_data['due_at']) if assignment_data.get('due_at') else None,
             points_possible=assignment_data.get('points_possible', 0),
             grading_type=assignment_data.get('grading_type', 'points'),
             submission_types=assignment_data.get('submission_types', []),
@@ -1203,10 +1185,7 @@ def get_assignment_help():
             response = llm_service.perplexity_adapter.search_facts(prompt, max_results=5)
         else:
             # Use Groq for guidance and general help
-            messages = [
-                {"role": "system", "content": PromptTemplates.ACADEMIC_TUTOR},
-                {"role": "user", "content": prompt}
-            ]
+            messages = PromptTemplates.build_messages("academic_tutor", prompt)
             response = llm_service.adapter._make_request(messages, temperature=0.5, max_tokens=1500)
             
             # Format Groq response to match Perplexity structure
@@ -1327,7 +1306,7 @@ def explain_concept():
         # Build course context if provided
         from src.llm.prompt_templates import PromptContext, PromptTemplates
         
-        course_context = PromptContext(student_level=level)
+        course_data = {}
         
         if course_id:
             try:
@@ -1336,11 +1315,15 @@ def explain_concept():
                     access_token=g.canvas_token
                 )
                 course_data = client.get_course(course_id)
-                course_context.course_name = course_data.get('name')
-                course_context.course_subject = course_data.get('course_code')
             except:
                 pass
         
+        course_context = PromptContext(
+            course_name=course_data.get('name'),
+            course_subject=course_data.get('course_code'),
+            student_level=level
+        )
+        
         # Get context-aware prompt
         prompt = PromptTemplates.get_concept_explanation_prompt(
             concept, context, level, course_context
@@ -1350,10 +1333,7 @@ def explain_concept():
         if llm_service.perplexity_adapter:
             response = llm_service.perplexity_adapter.search_facts(prompt, max_results=10)
         else:
-            messages = [
-                {"role": "system", "content": PromptTemplates.ACADEMIC_TUTOR},
-                {"role": "user", "content": prompt}
-            ]
+            messages = PromptTemplates.build_messages("academic_tutor", prompt)
             response = llm_service.adapter._make_request(messages, temperature=0.3, max_tokens=1200)
             
             # Format Groq response to match Perplexity structure
@@ -1457,9 +1437,10 @@ def get_course_quizzes(course_id: str):
         )
         
         quizzes = quiz_service.get_course_quizzes(course_id)
+        now = datetime.utcnow()
         
         return jsonify({
-            'quizzes': [q.to_dict() for q in quizzes],
+            'quizzes': [q.to_dict(now=now) for q in quizzes],
             'count': len(quizzes)
         })
         
@@ -1505,7 +1486,8 @@ def start_quiz_attempt(course_id: str, quiz_id: str):
         if not quiz:
             return jsonify({'error': 'Quiz not found'}), 404
         
-        if not quiz.is_available():
+        now = datetime.utcnow()
+        if not quiz.is_available(now=now):
             return jsonify({'error': 'Quiz is not available'}), 403
         
         # Start the attempt
@@ -1513,7 +1495,7 @@ def start_quiz_attempt(course_id: str, quiz_id: str):
         
         return jsonify({
             'submission': submission_data,
-            'quiz': quiz.to_dict()
+            'quiz': quiz.to_dict(now=now)
         })
         
     except Exception as e:
@@ -84,7 +84,7 @@ class CourseConsistencyChecker:
             start_at = course.get('start_at')
             if start_at:
                 try:
-                    start_date = datetime.fromisoformat(start_at.replace('Z', '+00:00'))
+                    start_date = datetime.fromisoformat(start_at)
                     if start_date > now:
                         future_courses.append(course)
                 except (ValueError, AttributeError):
@@ -101,7 +101,7 @@ class CourseConsistencyChecker:
             end_at = course.get('end_at')
             if end_at:
                 try:
-                    end_date = datetime.fromisoformat(end_at.replace('Z', '+00:00'))
+                    end_date = datetime.fromisoformat(end_at)
                     if end_date < now:
                         past_courses.append(course)
                 except (ValueError, AttributeError):
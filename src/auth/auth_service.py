@@ -20,7 +20,7 @@ class UserRole(Enum):
     ADMIN = "admin"
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """User data model"""
     id: str
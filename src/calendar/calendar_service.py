@@ -115,7 +115,6 @@ class CalendarService:
         try:
             # Try ISO format
             if 'T' in date_str:
-                date_str = date_str.replace('Z', '+00:00')
                 return datetime.fromisoformat(date_str)
             else:
                 return datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
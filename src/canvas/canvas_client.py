@@ -5,18 +5,41 @@ Provides a robust interface to Canvas LMS API endpoints
 
 import time
 import json
+import hashlib
+import functools
+import threading
 import requests
+import httpx
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Generator
+from typing import Optional, Dict, Any, List, Generator, AsyncIterator
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 import logging
 from urllib.parse import urljoin, urlparse, parse_qs
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Canvas list payloads are large; orjson decodes them several times faster
+_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
 
 class CanvasAPIError(Exception):
-    """Base exception for Canvas API errors"""
-    pass
+    """Base exception for Canvas API errors
+    
+    status_code is the HTTP status when Canvas answered, and retry_after
+    the seconds its Retry-After header asked to wait, if any.
+    """
+    
+    def __init__(self, message: str = "", status_code: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
 
 
 class RateLimitError(CanvasAPIError):
@@ -34,6 +57,32 @@ class NotFoundError(CanvasAPIError):
     pass
 
 
+def _raise_for_status(status_code: int, text: str, endpoint: str, headers=None) -> None:
+    """Raise the CanvasAPIError subclass matching an error status"""
+    retry_after = None
+    try:
+        retry_after = float(headers.get('Retry-After')) if headers else None
+    except (TypeError, ValueError):
+        pass  # absent, or an HTTP date rather than seconds
+    
+    if status_code == 401:
+        raise AuthenticationError("Invalid or expired access token", status_code)
+    elif status_code == 404:
+        raise NotFoundError(f"Resource not found: {endpoint}", status_code)
+    elif status_code == 429:
+        raise RateLimitError("Rate limit exceeded", status_code, retry_after)
+    elif status_code >= 400:
+        raise CanvasAPIError(f"API error {status_code}: {text}", status_code, retry_after)
+
+
+# (ETag, body) per (base_url, token digest, cache key), least recently used
+# first. Shared by every CanvasAPIClient, since the API builds one per
+# request, and keyed by token so no user is served another's body
+_ETAGS: OrderedDict = OrderedDict()
+_ETAGS_MAX = 4096
+_ETAGS_LOCK = threading.Lock()
+
+
 @dataclass
 class RateLimitInfo:
     """Rate limit information"""
@@ -72,6 +121,10 @@ class CanvasAPIClient:
         # Caching
         self.cache = {}
         self.cache_ttl = 300  # 5 minutes default TTL
+        # This client's scope in _ETAGS, where (ETag, body) pairs outlive both
+        # cache_ttl and the client, so an expired entry is revalidated with
+        # If-None-Match rather than downloaded again
+        self._etag_scope = (self.base_url, hashlib.sha256(access_token.encode()).hexdigest()[:16])
         
         # Logging
         self.logger = logging.getLogger(__name__)
@@ -102,14 +155,8 @@ class CanvasAPIClient:
             self._update_rate_limit_info(response)
             
             # Handle errors
-            if response.status_code == 401:
-                raise AuthenticationError("Invalid or expired access token")
-            elif response.status_code == 404:
-                raise NotFoundError(f"Resource not found: {endpoint}")
-            elif response.status_code == 429:
-                raise RateLimitError("Rate limit exceeded")
-            elif not response.ok:
-                raise CanvasAPIError(f"API error {response.status_code}: {response.text}")
+            if not response.ok:
+                _raise_for_status(response.status_code, response.text, endpoint, response.headers)
             
             return response
             
@@ -150,6 +197,37 @@ class CanvasAPIClient:
         """Cache data with timestamp"""
         self.cache[key] = (data, datetime.utcnow())
     
+    def _get_revalidated(self, key: str, endpoint: str, **kwargs) -> Any:
+        """GET endpoint, sending the ETag last stored under key as If-None-Match
+        
+        Returns the stored body on 304, else the parsed one, storing it with
+        its new ETag. A 304 with nothing stored, say after an eviction, is
+        fetched again unconditionally.
+        """
+        store_key = (*self._etag_scope, key)
+        with _ETAGS_LOCK:
+            entry = _ETAGS.get(store_key)
+            if entry is not None:
+                _ETAGS.move_to_end(store_key)
+        headers = {'If-None-Match': entry[0]} if entry else None
+        response = self._make_request('GET', endpoint, headers=headers, **kwargs)
+        if response.status_code == 304:
+            if entry is not None:
+                return entry[1]
+            response = self._make_request('GET', endpoint, **kwargs)
+        
+        data = _loads(response.content)
+        etag = response.headers.get('ETag')
+        with _ETAGS_LOCK:
+            if etag:
+                _ETAGS[store_key] = (etag, data)
+                _ETAGS.move_to_end(store_key)
+                if len(_ETAGS) > _ETAGS_MAX:
+                    _ETAGS.popitem(last=False)
+            else:
+                _ETAGS.pop(store_key, None)
+        return data
+    
     def get_user_info(self) -> Dict[str, Any]:
         """Get current user information"""
         cache_key = "user_info"
@@ -158,7 +236,7 @@ class CanvasAPIClient:
             return cached
         
         response = self._make_request('GET', 'users/self')
-        data = response.json()
+        data = _loads(response.content)
         self._set_cache(cache_key, data)
         return data
     
@@ -180,7 +258,24 @@ class CanvasAPIClient:
             params['enrollment_role'] = enrollment_role
         
         response = self._make_request('GET', 'courses', params=params)
-        data = response.json()
+        data = _loads(response.content)
+        self._set_cache(cache_key, data)
+        return data
+    
+    def get_active_course_ids(self) -> List[str]:
+        """Ids of courses where the current user's enrollment is active
+        
+        Canvas filters server-side, so routes that fan out per course skip
+        invited, concluded and otherwise inaccessible ones without a request.
+        """
+        cache_key = "active_course_ids"
+        cached = self._get_cached(cache_key)
+        if cached:
+            return cached
+        
+        params = {'enrollment_state': 'active', 'per_page': 100}
+        response = self._make_request('GET', 'users/self/courses', params=params)
+        data = [str(course['id']) for course in _loads(response.content)]
         self._set_cache(cache_key, data)
         return data
     
@@ -192,7 +287,7 @@ class CanvasAPIClient:
             return cached
         
         response = self._make_request('GET', f'courses/{course_id}')
-        data = response.json()
+        data = _loads(response.content)
         self._set_cache(cache_key, data)
         return data
     
@@ -209,7 +304,7 @@ class CanvasAPIClient:
             params['assignment_ids[]'] = assignment_ids
         
         response = self._make_request('GET', f'courses/{course_id}/assignments', params=params)
-        data = response.json()
+        data = _loads(response.content)
         self._set_cache(cache_key, data)
         return data
     
@@ -221,7 +316,7 @@ class CanvasAPIClient:
             return cached
         
         response = self._make_request('GET', f'courses/{course_id}/assignments/{assignment_id}')
-        data = response.json()
+        data = _loads(response.content)
         
         # If this is a quiz assignment, fetch quiz questions
         if data.get('is_quiz_assignment') and data.get('quiz_id'):
@@ -244,7 +339,7 @@ class CanvasAPIClient:
         
         # Use assignments endpoint directly with assignment ID
         response = self._make_request('GET', f'assignments/{assignment_id}')
-        data = response.json()
+        data = _loads(response.content)
         self._set_cache(cache_key, data)
         return data
     
@@ -263,7 +358,7 @@ class CanvasAPIClient:
         response = self._make_request('GET', 
                                    f'courses/{course_id}/assignments/{assignment_id}/submissions',
                                    params=params)
-        data = response.json()
+        data = _loads(response.content)
         self._set_cache(cache_key, data)
         return data
     
@@ -275,7 +370,7 @@ class CanvasAPIClient:
             return cached
         
         response = self._make_request('GET', f'courses/{course_id}/quizzes/{quiz_id}/questions')
-        data = response.json()
+        data = _loads(response.content)
         self._set_cache(cache_key, data)
         return data
     
@@ -292,7 +387,7 @@ class CanvasAPIClient:
             params['student_ids[]'] = student_ids
         
         response = self._make_request('GET', f'courses/{course_id}/students/submissions', params=params)
-        data = response.json()
+        data = _loads(response.content)
         self._set_cache(cache_key, data)
         return data
     
@@ -309,7 +404,7 @@ class CanvasAPIClient:
             params['type[]'] = enrollment_type
         
         response = self._make_request('GET', f'courses/{course_id}/enrollments', params=params)
-        data = response.json()
+        data = _loads(response.content)
         self._set_cache(cache_key, data)
         return data
     
@@ -326,7 +421,7 @@ class CanvasAPIClient:
             params['enrollment_type[]'] = enrollment_type
         
         response = self._make_request('GET', f'courses/{course_id}/users', params=params)
-        data = response.json()
+        data = _loads(response.content)
         self._set_cache(cache_key, data)
         return data
     
@@ -336,7 +431,7 @@ class CanvasAPIClient:
         response = self._make_request('POST', 
                                     f'courses/{course_id}/assignments/{assignment_id}/submissions',
                                     json=submission_data)
-        return response.json()
+        return _loads(response.content)
     
     def update_submission(self, course_id: str, assignment_id: str, user_id: str,
                          submission_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -344,7 +439,7 @@ class CanvasAPIClient:
         response = self._make_request('PUT', 
                                     f'courses/{course_id}/assignments/{assignment_id}/submissions/{user_id}',
                                     json=submission_data)
-        return response.json()
+        return _loads(response.content)
     
     def get_rubric(self, course_id: str, assignment_id: str) -> Optional[Dict[str, Any]]:
         """Get rubric for an assignment"""
@@ -355,7 +450,7 @@ class CanvasAPIClient:
         
         try:
             response = self._make_request('GET', f'courses/{course_id}/assignments/{assignment_id}/rubric')
-            data = response.json()
+            data = _loads(response.content)
             self._set_cache(cache_key, data)
             return data
         except NotFoundError:
@@ -373,8 +468,7 @@ class CanvasAPIClient:
         if folder_id:
             params['folder_id'] = folder_id
         
-        response = self._make_request('GET', endpoint, params=params)
-        data = response.json()
+        data = self._get_revalidated(cache_key, endpoint, params=params)
         self._set_cache(cache_key, data)
         return data
     
@@ -385,8 +479,7 @@ class CanvasAPIClient:
         if cached:
             return cached
         
-        response = self._make_request('GET', f'courses/{course_id}/files/{file_id}')
-        data = response.json()
+        data = self._get_revalidated(cache_key, f'courses/{course_id}/files/{file_id}')
         self._set_cache(cache_key, data)
         return data
     
@@ -397,8 +490,7 @@ class CanvasAPIClient:
         if cached:
             return cached
         
-        response = self._make_request('GET', f'courses/{course_id}/folders')
-        data = response.json()
+        data = self._get_revalidated(cache_key, f'courses/{course_id}/folders')
         self._set_cache(cache_key, data)
         return data
     
@@ -412,8 +504,7 @@ class CanvasAPIClient:
         endpoint = f'courses/{course_id}/students/submissions'
         params = {'student_ids[]': ['self']} if user_id == 'self' else {'student_ids[]': [user_id]}
         
-        response = self._make_request('GET', endpoint, params=params)
-        data = response.json()
+        data = self._get_revalidated(cache_key, endpoint, params=params)
         self._set_cache(cache_key, data)
         return data
     
@@ -427,7 +518,7 @@ class CanvasAPIClient:
             params['per_page'] = per_page
             
             response = self._make_request('GET', endpoint, params=params)
-            data = response.json()
+            data = _loads(response.content)
             
             if not data:
                 break
@@ -445,12 +536,158 @@ class CanvasAPIClient:
     def clear_cache(self):
         """Clear all cached data"""
         self.cache.clear()
+        with _ETAGS_LOCK:
+            for store_key in [k for k in _ETAGS if k[:2] == self._etag_scope]:
+                del _ETAGS[store_key]
     
     def set_cache_ttl(self, ttl_seconds: int):
         """Set cache TTL in seconds"""
         self.cache_ttl = ttl_seconds
 
 
+class AsyncCanvasClient:
+    """Async Canvas API client for the reads done by background sync
+    
+    Covers the endpoints the sync service uses, with the same parameters and
+    errors as CanvasAPIClient. Requests go through the given httpx client,
+    so many users' syncs can be in flight on one event loop and share its
+    connection pool.
+    
+    Each getter takes an optional validators dict for conditional requests:
+    its 'etag' and 'last_modified' entries are sent as If-None-Match and
+    If-Modified-Since and refreshed from the response. When Canvas answers
+    304 Not Modified the getter returns None.
+    
+    The iter_* methods stream a list endpoint page by page, following the
+    Link header, so callers can process one page while the next is fetched.
+    """
+    
+    def __init__(self, base_url: str, access_token: str, http: httpx.AsyncClient):
+        self.base_url = base_url.rstrip('/')
+        self.http = http
+        self.headers = {
+            'Authorization': f'Bearer {access_token}',
+            'User-Agent': 'Canvas-Automation-Flow/1.0'
+        }
+    
+    async def _request(self, url: str, params: Optional[Dict[str, Any]],
+                       validators: Optional[Dict[str, str]]) -> Optional[httpx.Response]:
+        """GET a URL, mapping errors; None when a conditional request is not modified"""
+        headers = self.headers
+        if validators:
+            headers = dict(headers)
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        try:
+            response = await self.http.get(url, params=params, headers=headers)
+        except httpx.TimeoutException:
+            raise CanvasAPIError("Request timeout")
+        except httpx.TransportError:
+            raise CanvasAPIError("Connection error")
+        except httpx.HTTPError as e:
+            raise CanvasAPIError(f"Request failed: {e}")
+        
+        if response.status_code >= 400:
+            _raise_for_status(response.status_code, response.text, url, response.headers)
+        if validators is not None:
+            if response.status_code == 304:
+                return None
+            validators['etag'] = response.headers.get('ETag')
+            validators['last_modified'] = response.headers.get('Last-Modified')
+        return response
+    
+    def _url(self, endpoint: str) -> str:
+        return f"{self.base_url}/api/v1/{endpoint.lstrip('/')}"
+    
+    async def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                   validators: Optional[Dict[str, str]] = None) -> Any:
+        response = await self._request(self._url(endpoint), params, validators)
+        return None if response is None else _loads(response.content)
+    
+    async def get_page(self, url: str, params: Optional[Dict[str, Any]] = None,
+                       validators: Optional[Dict[str, str]] = None) -> Optional[tuple]:
+        """One page of a list endpoint as (items, next page URL or None)"""
+        response = await self._request(url, params, validators)
+        if response is None:
+            return None
+        return _loads(response.content), response.links.get('next', {}).get('url')
+    
+    async def iter_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                         validators: Optional[Dict[str, str]] = None,
+                         call=None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield each page of a list endpoint as it arrives
+        
+        call, if given, wraps every page request (e.g. for rate limiting and
+        retries) and is awaited as call(fetch). A 304 on the first page yields
+        no pages at all. Only the first page is conditional, so validators are
+        kept only when the whole list fit on it; otherwise a later page could
+        change unseen behind an unchanged first page.
+        """
+        url = self._url(endpoint)
+        while url:
+            fetch = functools.partial(self.get_page, url, params, validators)
+            result = await (call(fetch) if call is not None else fetch())
+            if result is None:
+                return
+            items, url = result
+            if url and validators is not None:
+                validators.clear()
+            # The next link already carries the query string
+            params, validators = None, None
+            yield items
+    
+    async def get_courses(self, enrollment_type: str = None, enrollment_role: str = None,
+                          validators: Optional[Dict[str, str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get courses for current user"""
+        return await self._get('courses', self._courses_params(enrollment_type, enrollment_role), validators)
+    
+    def iter_courses(self, enrollment_type: str = None, enrollment_role: str = None,
+                     validators: Optional[Dict[str, str]] = None, call=None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream every page of the current user's courses"""
+        return self.iter_pages('courses', self._courses_params(enrollment_type, enrollment_role), validators, call)
+    
+    def _courses_params(self, enrollment_type: Optional[str], enrollment_role: Optional[str]) -> Dict[str, Any]:
+        params = {
+            'include[]': ['term', 'enrollments', 'total_scores', 'current_grading_period_scores'],
+            'per_page': 100
+        }
+        if enrollment_type:
+            params['enrollment_type'] = enrollment_type
+        if enrollment_role:
+            params['enrollment_role'] = enrollment_role
+        return params
+    
+    async def get_assignments(self, course_id: str, assignment_ids: List[str] = None,
+                              validators: Optional[Dict[str, str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get assignments for a course"""
+        params = {}
+        if assignment_ids:
+            params['assignment_ids[]'] = assignment_ids
+        return await self._get(f'courses/{course_id}/assignments', params, validators)
+    
+    def iter_assignments(self, course_id: str, validators: Optional[Dict[str, str]] = None,
+                         call=None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream every page of a course's assignments"""
+        return self.iter_pages(f'courses/{course_id}/assignments', {'per_page': 100}, validators, call)
+    
+    async def get_submissions(self, course_id: str, assignment_id: str, student_ids: List[str] = None,
+                              validators: Optional[Dict[str, str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get submissions for an assignment"""
+        params = {}
+        if student_ids:
+            params['student_ids[]'] = student_ids
+        return await self._get(f'courses/{course_id}/assignments/{assignment_id}/submissions', params, validators)
+    
+    def iter_submissions(self, course_id: str, assignment_id: str,
+                         validators: Optional[Dict[str, str]] = None,
+                         call=None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream every page of an assignment's submissions"""
+        return self.iter_pages(f'courses/{course_id}/assignments/{assignment_id}/submissions',
+                               {'per_page': 100}, validators, call)
+
+
 # Example usage and testing
 if __name__ == "__main__":
     import os
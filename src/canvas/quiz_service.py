@@ -248,15 +248,15 @@ class CanvasQuizService:
         # Parse dates
         due_at = None
         if data.get('due_at'):
-            due_at = datetime.fromisoformat(data['due_at'].replace('Z', '+00:00'))
+            due_at = datetime.fromisoformat(data['due_at'])
         
         lock_at = None
         if data.get('lock_at'):
-            lock_at = datetime.fromisoformat(data['lock_at'].replace('Z', '+00:00'))
+            lock_at = datetime.fromisoformat(data['lock_at'])
         
         unlock_at = None
         if data.get('unlock_at'):
-            unlock_at = datetime.fromisoformat(data['unlock_at'].replace('Z', '+00:00'))
+            unlock_at = datetime.fromisoformat(data['unlock_at'])
         
         return Quiz(
             id=f"quiz_{data['id']}",
@@ -313,15 +313,15 @@ class CanvasQuizService:
         # Parse dates
         started_at = None
         if data.get('started_at'):
-            started_at = datetime.fromisoformat(data['started_at'].replace('Z', '+00:00'))
+            started_at = datetime.fromisoformat(data['started_at'])
         
         finished_at = None
         if data.get('finished_at'):
-            finished_at = datetime.fromisoformat(data['finished_at'].replace('Z', '+00:00'))
+            finished_at = datetime.fromisoformat(data['finished_at'])
         
         end_at = None
         if data.get('end_at'):
-            end_at = datetime.fromisoformat(data['end_at'].replace('Z', '+00:00'))
+            end_at = datetime.fromisoformat(data['end_at'])
         
         return QuizSubmission(
             id=f"quiz_submission_{data['id']}",
@@ -415,7 +415,7 @@ class EnhancedStudyPlanService:
         for assignment in assignments:
             if assignment.get('due_at'):
                 try:
-                    due_date = datetime.fromisoformat(assignment['due_at'].replace('Z', '+00:00'))
+                    due_date = datetime.fromisoformat(assignment['due_at'])
                     days_until_due = (due_date - datetime.now()).days
                     if 0 <= days_until_due <= days_ahead:
                         upcoming_assignments.append((assignment, days_until_due))
@@ -207,7 +207,7 @@ class FormattingService:
             # Format due date
             if due_date and due_date != 'No due date':
                 try:
-                    dt = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
+                    dt = datetime.fromisoformat(due_date)
                     due_date = dt.strftime('%Y-%m-%d')
                 except:
                     pass
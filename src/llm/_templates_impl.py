@@ -0,0 +1,926 @@
+"""
+Prompt template bodies and the PromptTemplates renderer
+Loaded on demand by prompt_templates
+"""
+
+import functools
+import re
+import string
+import sys
+import textwrap
+import threading
+import logging
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from .prompt_templates import PromptContext, PromptType
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+def _compact(text: str) -> str:
+    """Dedent a prompt literal and drop trailing whitespace once at import"""
+    return "\n".join(line.rstrip() for line in textwrap.dedent(text).strip().splitlines())
+
+
+# Fallback field values shared by every render
+_DEFAULT_DESC = sys.intern("No description provided")
+_DEFAULT_CONCEPT_CONTEXT = sys.intern("General explanation")
+
+
+# Prompt bodies are built once at import and rendered by _render.
+# Static instructions come first and per-request fields last, so every
+# render of a template shares the longest possible common prefix.
+
+# Discussion board assignments
+_DISCUSSION_HELP_TEMPLATE = _compact("""Help with Discussion Board Assignment
+
+As an academic discussion facilitator:
+
+1. **Understanding the Prompt**
+   - Identify key discussion questions
+   - Note required response elements
+   - Clarify expectations
+
+2. **Developing Your Response**
+   - Present main arguments/points
+   - Support with course concepts
+   - Include relevant examples
+   - Consider multiple perspectives
+
+3. **Peer Engagement**
+   - Suggest questions for classmates
+   - Identify areas for deeper discussion
+   - Connect to course themes
+
+4. **Academic Standards**
+   - Maintain scholarly tone
+   - Use proper citations if needed
+   - Demonstrate critical thinking
+
+Output Format (use Markdown with clear sections):
+## Summary
+- 2-4 bullet overview of what to do
+
+## Key Requirements
+- Bullet list pulled from the prompt and description
+
+## Response Plan
+1. Point 1
+2. Point 2
+3. Point 3
+
+## Example Talking Points
+- Bullet points the student can adapt
+
+## Citations (if used)
+- [1] Source Title — URL
+
+Provide guidance that helps the student develop their own thoughtful response.
+
+---
+{context_info}
+
+**Assignment:** {name}
+**Description:** {description}
+
+**Student Question:** {question}""")
+
+
+# Problem-solving assignments
+_PROBLEM_SOLVING_TEMPLATE = _compact("""Help with Problem-Solving Assignment
+
+As a problem-solving tutor:
+
+1. **Problem Analysis**
+   - Identify what's being asked
+   - List given information
+   - Determine relevant concepts/formulas
+
+2. **Solution Strategy**
+   - Outline solution approach
+   - Explain methodology
+   - Show step-by-step work
+
+3. **Mathematical Rigor**
+   - Use proper notation
+   - Show all steps clearly
+   - Explain reasoning at each step
+   - Use LaTeX for equations: $inline$ or $$display$$
+
+4. **Verification**
+   - Check answer reasonableness
+   - Verify units/dimensions
+   - Consider alternative approaches
+
+Output Format (use Markdown with clear sections):
+## Given
+- List all knowns
+
+## Find
+- What must be solved
+
+## Approach
+1. Step-by-step outline
+
+## Solution
+```math
+% Use LaTeX where appropriate
+```
+
+## Check
+- Dimensional analysis, edge-case check
+
+Focus on teaching problem-solving skills, not just providing answers.
+
+---
+{context_info}
+
+**Assignment:** {name}
+**Description:** {description}
+
+**Student Question:** {question}""")
+
+
+# Essay assignments
+_ESSAY_HELP_TEMPLATE = _compact("""Help with Essay Assignment
+
+As a writing tutor:
+
+1. **Understanding the Assignment**
+   - Analyze the prompt/question
+   - Identify required elements
+   - Note length and format requirements
+
+2. **Thesis Development**
+   - Help formulate a clear argument
+   - Ensure thesis is arguable and specific
+   - Connect to assignment requirements
+
+3. **Structure and Organization**
+   - Suggest essay outline
+   - Organize supporting arguments
+   - Plan introduction and conclusion
+
+4. **Academic Writing**
+   - Maintain formal academic tone
+   - Use evidence effectively
+   - Integrate sources properly
+   - Follow citation guidelines
+
+5. **Revision Strategy**
+   - Identify areas for strengthening
+   - Suggest improvements
+   - Check coherence and flow
+
+Output Format (use Markdown with clear sections):
+## Thesis (1-2 sentences)
+
+## Outline
+- Introduction: hook + thesis
+- Body Paragraph 1: topic sentence + evidence
+- Body Paragraph 2: topic sentence + evidence
+- Body Paragraph 3: topic sentence + evidence
+- Conclusion: synthesis + significance
+
+## Key Evidence/Examples
+- Bullet list of evidence to use
+
+## Style & Citations
+- Formatting and citation notes
+
+Guide the student in developing their own ideas and writing.
+
+---
+{context_info}
+
+**Assignment:** {name}
+**Description:** {description}
+
+**Student Question:** {question}""")
+
+
+# Research assignments
+_RESEARCH_HELP_TEMPLATE = _compact("""Help with Research Assignment
+
+As a research assistant:
+
+1. **Research Question Development**
+   - Clarify research focus
+   - Identify key variables/concepts
+   - Define scope appropriately
+
+2. **Source Identification**
+   - Suggest relevant databases/sources
+   - Identify key search terms
+   - Evaluate source credibility
+   - Provide actual sources with citations [1], [2], etc.
+
+3. **Research Synthesis**
+   - Organize findings thematically
+   - Identify patterns and gaps
+   - Connect sources to research question
+
+4. **Citation and Attribution**
+   - Use proper citation format
+   - Distinguish direct quotes from paraphrasing
+   - Maintain academic integrity
+
+5. **Critical Analysis**
+   - Evaluate source quality
+   - Compare different perspectives
+   - Identify limitations
+
+Output Format (use Markdown with clear sections):
+## Research Question
+
+## Search Strategy
+- Databases/keywords
+
+## Findings
+- Thematic bullets with inline citations [1], [2]
+
+## Synthesis
+- Short paragraph connecting findings to question
+
+## References
+- [1] Full citation — URL
+- [2] Full citation — URL
+
+Provide well-researched information with full citations.
+
+---
+{context_info}
+
+**Assignment:** {name}
+**Description:** {description}
+
+**Student Question:** {question}""")
+
+
+# Other assignment types
+_GENERAL_HELP_TEMPLATE = _compact("""Help with Assignment
+
+As an academic tutor:
+
+1. **Assignment Analysis**
+   - Understand what's required
+   - Identify key concepts
+   - Note evaluation criteria
+
+2. **Conceptual Understanding**
+   - Explain relevant concepts clearly
+   - Connect to course material
+   - Provide relevant examples
+
+3. **Approach Strategy**
+   - Suggest how to tackle the assignment
+   - Break into manageable steps
+   - Provide guidance for each part
+
+4. **Quality Standards**
+   - Academic rigor
+   - Proper formatting
+   - Clear communication
+   - Evidence-based reasoning
+
+5. **Learning Support**
+   - Explain reasoning
+   - Encourage critical thinking
+   - Build understanding, not just answers
+
+Output Format (use Markdown with clear sections):
+## Summary
+- 2-3 bullets
+
+## Requirements
+- Bullet list
+
+## Plan
+1. Step 1
+2. Step 2
+
+## Answer/Guidance
+- Structured paragraphs or bullets
+
+## Sources (if used)
+- [n] Title — URL
+
+Help the student develop skills and understanding.
+
+---
+{context_info}
+
+**Assignment:** {name}
+**Description:** {description}
+
+**Student Question:** {question}""")
+
+
+# Concept explanations
+_CONCEPT_EXPLANATION_TEMPLATE = _compact("""Explain Academic Concept
+
+Provide a comprehensive explanation:
+
+1. **Definition**
+   - Clear, precise definition
+   - Key terminology explained
+   - Essential characteristics
+
+2. **Core Understanding**
+   - Fundamental principles
+   - How it works
+   - Why it matters
+
+3. **Examples and Applications**
+   - Concrete examples
+   - Real-world applications
+   - Connection to broader concepts
+
+4. **Visual/Structural Understanding**
+   - Describe relationships
+   - Show connections
+   - Illustrate patterns
+
+5. **Common Misconceptions**
+   - Clarify confusion points
+   - Address typical misunderstandings
+
+Format:
+- Use Markdown: **bold**, *italic*, headers, lists
+- Use LaTeX for math: $inline$ and $$display$$
+- Include examples at appropriate level
+- Build from basics to advanced
+
+---
+{context_info}
+
+**Concept:** {concept}
+**Audience:** {audience}
+**Context:** {context}""")
+
+
+# Full assignment completion
+_COMPLETION_TEMPLATE = _compact("""Complete Assignment with Full Research and Citations
+
+Research and complete this assignment with:
+
+1. **Comprehensive Research**
+   - Use current, reliable sources
+   - Include diverse perspectives
+   - Cite all sources properly
+
+2. **Academic Quality**
+   - Clear structure and organization
+   - Strong thesis/argument (if applicable)
+   - Well-supported claims
+   - Critical analysis
+
+3. **Professional Formatting**
+   - Use Markdown structure
+   - Include LaTeX for equations
+   - Proper headings and sections
+   - Tables where appropriate
+
+4. **Citations**
+   - Inline citations: [1], [2], etc.
+   - Full source information
+   - Academic integrity
+
+5. **Completeness**
+   - Address all requirements
+   - Appropriate length and depth
+   - Polished and ready to submit
+
+Provide a complete, submission-ready response with full citations.
+
+---
+{context_info}
+
+**Assignment:** {name}
+**Description:** {description}
+
+{additional_context}""")
+
+
+# Assignment help templates by detected assignment type
+_HELP_TEMPLATES = {
+    "discussion": _DISCUSSION_HELP_TEMPLATE,
+    "problem_set": _PROBLEM_SOLVING_TEMPLATE,
+    "essay": _ESSAY_HELP_TEMPLATE,
+    "research": _RESEARCH_HELP_TEMPLATE,
+    "general": _GENERAL_HELP_TEMPLATE,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _split_template(template: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Split a format template once into (literal, field name) fragments"""
+    return tuple(
+        (literal, field)
+        for literal, field, _, _ in string.Formatter().parse(template)
+    )
+
+
+def _render(template: str, **values: str) -> str:
+    """Fill a template by joining its fragments with the field values
+
+    Values are spliced in as-is; the template is not re-parsed per call.
+    """
+    parts = []
+    append = parts.append
+    for literal, field in _split_template(template):
+        append(literal)
+        if field is not None:
+            append(str(values[field]))
+    return "".join(parts)
+
+
+# Templates by prompt type, for token budgeting
+_PROMPT_TYPE_TEMPLATES = {
+    PromptType.ASSIGNMENT_HELP: _GENERAL_HELP_TEMPLATE,
+    PromptType.DISCUSSION_POST: _DISCUSSION_HELP_TEMPLATE,
+    PromptType.PROBLEM_SOLVING: _PROBLEM_SOLVING_TEMPLATE,
+    PromptType.ESSAY_WRITING: _ESSAY_HELP_TEMPLATE,
+    PromptType.RESEARCH_ASSISTANCE: _RESEARCH_HELP_TEMPLATE,
+    PromptType.CONCEPT_EXPLANATION: _CONCEPT_EXPLANATION_TEMPLATE,
+    PromptType.ASSIGNMENT_COMPLETION: _COMPLETION_TEMPLATE,
+}
+
+
+class _LazyEncoder:
+    """tiktoken encoding loaded on a background thread, waited on for a bounded time
+    
+    tiktoken downloads the BPE file on first use with no timeout of its own,
+    so an offline or firewalled host could hang the first count. The first
+    caller waits up to timeout seconds; until the load finishes (if ever)
+    get() returns None and counts fall back to the estimate.
+    """
+    
+    def __init__(self, model: str, timeout: float):
+        self.model = model
+        self.timeout = timeout
+        self._encoder = None
+        self._loaded = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def _load(self) -> None:
+        try:
+            self._encoder = tiktoken.encoding_for_model(self.model)
+            # Static counts taken with the estimate meanwhile are redone
+            _base_token_count.cache_clear()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"tiktoken encoding unavailable, estimating tokens: {e}")
+        finally:
+            self._loaded.set()
+    
+    def get(self):
+        """The encoding, or None when tiktoken is missing, failed or still loading"""
+        if not TIKTOKEN_AVAILABLE:
+            return None
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._load, name="tiktoken-load", daemon=True)
+                    self._thread.start()
+                    self._loaded.wait(self.timeout)
+        return self._encoder
+
+
+# Encoding used for counts; loading it may wait up to 5 seconds, once
+_ENCODER = _LazyEncoder("gpt-4o", timeout=5.0)
+
+
+def _count_tokens(text: str) -> int:
+    """Count tokens, estimating four characters per token without tiktoken"""
+    encoder = _ENCODER.get()
+    if encoder is None:
+        return (len(text) + 3) // 4
+    return len(encoder.encode(text))
+
+
+@functools.lru_cache(maxsize=None)
+def _base_token_count(prompt_type: PromptType) -> int:
+    """Token count of a template's static text, computed once per type"""
+    template = _PROMPT_TYPE_TEMPLATES.get(prompt_type)
+    if template is None:
+        raise ValueError(f"No prompt template for {prompt_type.value}")
+    return _count_tokens("".join(
+        literal for literal, _, _, _ in string.Formatter().parse(template)
+    ))
+
+
+# Keywords identifying each assignment type, in detection priority order
+_DISCUSSION_WORDS = ("discussion", "forum", "post", "respond", "reply")
+_PROBLEM_SET_WORDS = ("problem set", "homework", "exercises", "calculations")
+_ESSAY_WORDS = ("essay", "paper", "write", "composition")
+_RESEARCH_WORDS = ("research", "investigate", "analyze", "study")
+
+_ASSIGNMENT_TYPE_WORDS = (
+    ("discussion", _DISCUSSION_WORDS),
+    ("problem_set", _PROBLEM_SET_WORDS),
+    ("essay", _ESSAY_WORDS),
+    ("research", _RESEARCH_WORDS),
+)
+
+
+# Base system prompts. The PromptTemplates class attributes alias these.
+_ABSOLUTE_MODE = sys.intern(_compact("""Absolute Mode
+
+• Eliminate: emojis, filler, hype, soft asks, conversational transitions, call-to-action appendixes.
+• Assume: user retains high-perception despite blunt tone.
+• Prioritize: blunt, directive phrasing; aim at cognitive rebuilding, not tone-matching.
+• Disable: engagement/sentiment-boosting behaviors.
+• Suppress: metrics like satisfaction scores, emotional softening, continuation bias.
+• Never mirror: user's diction, mood, or affect.
+• Speak only: to underlying cognitive tier.
+• No: questions, offers, suggestions, transitions, motivational content.
+• Terminate reply: immediately after delivering info — no closures.
+• Goal: restore independent, high-fidelity thinking.
+• Outcome: model obsolescence via user self-sufficiency.
+
+CRITICAL FORMATTING RULE:
+• Use standard Markdown formatting: **text** for bold, *text* for italic
+• Use proper Markdown lists: - for bullets, 1. for numbered lists
+• Follow standard Markdown conventions for headers: # ## ###
+• Use LaTeX for math: $\\sqrt{{x}}$ for inline, $$E=mc^2$$ for display equations
+• Use LaTeX symbols: $\\frac{{a}}{{b}}$, $x^2$, $\\int$, $\\sum$, $\\alpha$, etc."""))
+
+# Writing style guide shared by the tutor and research assistant prompts
+_WRITING_STYLE = _compact("""# FOLLOW THIS WRITING STYLE: 
+• SHOULD use clear, simple language. 
+• SHOULD be spartan and informative. 
+• SHOULD use short, impactful sentences. 
+• SHOULD use active voice; avoid passive voice. 
+• SHOULD focus on practical, actionable insights. 
+• SHOULD use bullet point lists in social media posts. 
+• SHOULD use data and examples to support claims when possible. 
+• SHOULD use "you" and "your" to directly address the reader. 
+• AVOID using em dashes (—) anywhere in your response. Use only commas, periods, or other standard punctuation. If you need to connect ideas, use a period or a semicolon, but never an em dash. 
+• AVOID constructions like "...not just this, but also this". 
+• AVOID metaphors and clichés. 
+• AVOID generalizations. 
+• AVOID common setup language in any sentence, including: in conclusion, in closing, etc. 
+• AVOID output warnings or notes, just the output requested. 
+• AVOID unnecessary adjectives and adverbs. 
+• AVOID hashtags. 
+• AVOID semicolons. 
+• AVOID markdown. 
+• AVOID asterisks. 
+• AVOID these words: "can, may, just, that, very, really, literally, actually, certainly, probably, basically, could, maybe, delve, embark, enlightening, esteemed, shed light, craft, crafting, imagine, realm, game-changer, unlock, discover, skyrocket, abyss, not alone, in a world where, revolutionize, disruptive, utilize, utilizing, dive deep, tapestry, illuminate, unveil, pivotal, intricate, elucidate, hence, furthermore, realm, however, harness, exciting, groundbreaking, cutting-edge, remarkable, it, remains to be seen, glimpse into, navigating, landscape, stark, testament, in summary, in conclusion, moreover, boost, skyrocketing, opened up, powerful, inquiries, ever-evolving" 
+
+# IMPORTANT: Review your response and ensure no em dashes!""")
+
+_TUTOR_CORE = _compact("""You are an expert academic tutor helping a student understand course material.
+
+Your approach:
+• Provide clear, accurate explanations
+• Break down complex concepts into understandable parts
+• Use examples relevant to the student's level
+• Encourage critical thinking
+• Connect concepts to broader themes
+• Provide step-by-step guidance when needed
+
+Formatting:
+• Use Markdown for structure: **bold**, *italic*, headers, lists
+• Use LaTeX for math: $inline$ and $$display$$
+• Use code blocks for programming examples
+• Include diagrams descriptions when relevant""")
+
+_RESEARCH_CORE = _compact("""You are a research assistant helping with academic work.
+
+Your focus:
+• Provide accurate, well-researched information
+• Include citations from reliable sources
+• Present multiple perspectives when relevant
+• Distinguish facts from interpretation
+• Help evaluate source credibility
+• Guide proper citation practices
+
+IMPORTANT:
+• All factual claims must be supported by sources
+• Use inline citations: [1], [2], etc.
+• Provide full source information at the end
+• Flag uncertain or contested information""")
+
+_ACADEMIC_TUTOR = sys.intern(_TUTOR_CORE + "\n\n" + _WRITING_STYLE)
+_RESEARCH_ASSISTANT = sys.intern(_RESEARCH_CORE + "\n\n" + _WRITING_STYLE)
+
+
+class PromptTemplates:
+    """Centralized prompt templates with context awareness"""
+    
+    # Base system prompts for different contexts (aliases of module constants)
+    ABSOLUTE_MODE = _ABSOLUTE_MODE
+    ACADEMIC_TUTOR = _ACADEMIC_TUTOR
+    RESEARCH_ASSISTANT = _RESEARCH_ASSISTANT
+
+    # Role prompts selectable by build_messages
+    SYSTEM_ROLES = {
+        "academic_tutor": _ACADEMIC_TUTOR,
+        "research_assistant": _RESEARCH_ASSISTANT,
+    }
+
+    @classmethod
+    def build_messages(cls, system_role: str,
+                       user_prompt: Union[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Build chat messages with the static system prompts as cacheable blocks
+
+        Each base prompt is its own content block tagged with an ephemeral
+        cache_control marker so providers with prefix caching can reuse it;
+        only the user prompt varies between requests.
+        """
+        role_prompt = cls.SYSTEM_ROLES.get(system_role, _ACADEMIC_TUTOR)
+        return [
+            {
+                "role": "system",
+                "content": [
+                    {"type": "text", "text": _ABSOLUTE_MODE,
+                     "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": role_prompt,
+                     "cache_control": {"type": "ephemeral"}},
+                ],
+            },
+            {"role": "user", "content": user_prompt},
+        ]
+
+    @classmethod
+    def token_budget(cls, prompt_type: Union[PromptType, str]) -> int:
+        """Tokens used by the static text of a prompt type's template"""
+        return _base_token_count(PromptType(prompt_type))
+
+    @classmethod
+    def token_count(cls, prompt_type: Union[PromptType, str],
+                    dynamic_fields_text: str = "") -> int:
+        """Estimate a rendered prompt's tokens from the cached static count
+
+        Only the dynamic field text is tokenized per call.
+        """
+        return cls.token_budget(prompt_type) + _count_tokens(dynamic_fields_text)
+
+    @classmethod
+    def get_assignment_help_prompt(cls, 
+                                   assignment_name: str,
+                                   assignment_description: str,
+                                   question: str,
+                                   context: PromptContext) -> str:
+        """Generate context-aware prompt for assignment help"""
+        return _cached_assignment_help_prompt(assignment_name, assignment_description,
+                                              question, context)
+    
+    @classmethod
+    def get_assignment_help_prompt_bytes(cls,
+                                         assignment_name: str,
+                                         assignment_description: str,
+                                         question: str,
+                                         context: PromptContext) -> bytes:
+        """Generate the assignment help prompt as UTF-8 bytes
+
+        The cached get_assignment_help_prompt text, encoded, for callers that
+        post the prompt as raw bytes.
+        """
+        return _cached_assignment_help_prompt(assignment_name, assignment_description,
+                                              question, context).encode("utf-8")
+    
+    @classmethod
+    def _render_assignment_help_prompt(cls, assignment_name: str, assignment_description: str,
+                                       question: str, context: PromptContext) -> str:
+        """Render the assignment help prompt (uncached)"""
+        
+        # Detect assignment type
+        assignment_type = cls._detect_assignment_type(assignment_name, assignment_description)
+        
+        # Build context information
+        context_info = cls._build_context_info(context)
+        
+        # Select appropriate base prompt
+        builder = getattr(cls, cls._HELP_DISPATCH.get(assignment_type, "_general_help_prompt"))
+        return builder(assignment_name, assignment_description, question, context_info)
+    
+    # Prompt builder method per detected assignment type
+    _HELP_DISPATCH = {
+        "discussion": "_discussion_help_prompt",
+        "problem_set": "_problem_solving_prompt",
+        "essay": "_essay_help_prompt",
+        "research": "_research_help_prompt",
+    }
+    
+    # One case-insensitive scan for every keyword. The lookahead makes matches
+    # zero-width, so keywords nested inside others ("post" in "composition")
+    # are still seen; groups are listed in priority order.
+    _TYPE_RE = re.compile(
+        "(?=" + "|".join(
+            f"(?P<{kind}>{'|'.join(map(re.escape, words))})"
+            for kind, words in _ASSIGNMENT_TYPE_WORDS
+        ) + ")",
+        re.IGNORECASE
+    )
+    _TYPE_PRIORITY = {"discussion": 0, "problem_set": 1, "essay": 2, "research": 3}
+
+    @classmethod
+    def _detect_assignment_type(cls, name: str, description: str) -> str:
+        """Detect assignment type from name and description"""
+        best = None
+        for match in cls._TYPE_RE.finditer(name + " " + (description or "")):
+            kind = match.lastgroup
+            if kind == "discussion":
+                return kind
+            if best is None or cls._TYPE_PRIORITY[kind] < cls._TYPE_PRIORITY[best]:
+                best = kind
+        return best or "general"
+    
+    # Scalar context fields rendered in order when set
+    _CONTEXT_FIELDS = (
+        ("course_name", "**Course:** {}"),
+        ("course_subject", "**Subject Area:** {}"),
+        ("due_date", "**Due Date:** {}"),
+        ("points_possible", "**Points:** {}"),
+        ("student_level", "**Academic Level:** {}"),
+    )
+
+    # Rendered context info per PromptContext, shared across prompt builders
+    _CONTEXT_CACHE: Dict[PromptContext, str] = {}
+    _CONTEXT_CACHE_SIZE = 256
+
+    @classmethod
+    def _build_context_info(cls, context: PromptContext) -> str:
+        """Build context information string"""
+        cached = cls._CONTEXT_CACHE.get(context)
+        if cached is not None:
+            return cached
+        
+        if len(cls._CONTEXT_CACHE) >= cls._CONTEXT_CACHE_SIZE:
+            cls._CONTEXT_CACHE.clear()
+        
+        info = cls._CONTEXT_CACHE[context] = cls._render_context_info(context)
+        return info
+    
+    @classmethod
+    def _render_context_info(cls, context: PromptContext) -> str:
+        """Render context information string (uncached)"""
+        info = []
+        append = info.append
+        
+        for attr, fmt in cls._CONTEXT_FIELDS:
+            value = getattr(context, attr)
+            if value:
+                append(fmt.format(value))
+        
+        if context.course_materials:
+            materials = "\n".join(f"- {dict(m).get('name', 'Material')}"
+                                  for m in context.course_materials[:5])
+            append(f"**Available Course Materials:**\n{materials}")
+        
+        if context.rubric:
+            append("**Grading Rubric Available:** Yes")
+        
+        return "\n".join(info)
+    
+    @classmethod
+    def _discussion_help_prompt(cls, name: str, description: str, 
+                               question: str, context_info: str) -> str:
+        """Prompt for discussion board assignments"""
+        return _render(
+            _DISCUSSION_HELP_TEMPLATE,
+            context_info=context_info,
+            name=name,
+            description=description or _DEFAULT_DESC,
+            question=question
+        )
+    
+    @classmethod
+    def _problem_solving_prompt(cls, name: str, description: str,
+                               question: str, context_info: str) -> str:
+        """Prompt for problem-solving assignments"""
+        return _render(
+            _PROBLEM_SOLVING_TEMPLATE,
+            context_info=context_info,
+            name=name,
+            description=description or _DEFAULT_DESC,
+            question=question
+        )
+    
+    @classmethod
+    def _essay_help_prompt(cls, name: str, description: str,
+                          question: str, context_info: str) -> str:
+        """Prompt for essay assignments"""
+        return _render(
+            _ESSAY_HELP_TEMPLATE,
+            context_info=context_info,
+            name=name,
+            description=description or _DEFAULT_DESC,
+            question=question
+        )
+    
+    @classmethod
+    def _research_help_prompt(cls, name: str, description: str,
+                             question: str, context_info: str) -> str:
+        """Prompt for research assignments"""
+        return _render(
+            _RESEARCH_HELP_TEMPLATE,
+            context_info=context_info,
+            name=name,
+            description=description or _DEFAULT_DESC,
+            question=question
+        )
+    
+    @classmethod
+    def _general_help_prompt(cls, name: str, description: str,
+                            question: str, context_info: str) -> str:
+        """General prompt for other assignment types"""
+        return _render(
+            _GENERAL_HELP_TEMPLATE,
+            context_info=context_info,
+            name=name,
+            description=description or _DEFAULT_DESC,
+            question=question
+        )
+    
+    @classmethod
+    def get_concept_explanation_prompt(cls, concept: str, context: str,
+                                      level: str, course_context: PromptContext) -> str:
+        """Generate prompt for concept explanation"""
+        context_info = cls._build_context_info(course_context)
+        
+        level_descriptions = {
+            "beginner": "someone new to this topic with no background",
+            "undergraduate": "an undergraduate student with basic academic preparation",
+            "graduate": "a graduate student with advanced academic background"
+        }
+        
+        audience = level_descriptions.get(level, "an undergraduate student")
+        
+        return _render(
+            _CONCEPT_EXPLANATION_TEMPLATE,
+            context_info=context_info,
+            concept=concept,
+            audience=audience,
+            context=context or _DEFAULT_CONCEPT_CONTEXT
+        )
+    
+    @classmethod
+    def get_completion_prompt(cls, assignment_name: str, assignment_description: str,
+                             context: PromptContext, additional_context: str = "",
+                             structured: bool = False) -> Union[str, List[Dict[str, Any]]]:
+        """Generate prompt for full assignment completion
+
+        With structured=True, returns user content blocks instead of a string:
+        the full course material bodies as one cache_control tagged block,
+        followed by the uncached assignment prompt.
+        """
+        prompt = _cached_completion_prompt(assignment_name, assignment_description,
+                                           context, additional_context)
+        if not structured:
+            return prompt
+        
+        blocks = []
+        bodies = [dict(m).get("body") for m in context.course_materials or ()]
+        bodies = [body for body in bodies if body]
+        if bodies:
+            blocks.append({
+                "type": "text",
+                "text": "# Course Materials\n\n" + "\n\n---\n\n".join(bodies),
+                "cache_control": {"type": "ephemeral"}
+            })
+        blocks.append({"type": "text", "text": prompt})
+        return blocks
+    
+    @classmethod
+    def _render_completion_prompt(cls, assignment_name: str, assignment_description: str,
+                                  context: PromptContext, additional_context: str = "") -> str:
+        """Render the completion prompt (uncached)"""
+        assignment_type = cls._detect_assignment_type(assignment_name, assignment_description)
+        context_info = cls._build_context_info(context)
+        
+        return _render(
+            _COMPLETION_TEMPLATE,
+            context_info=context_info,
+            name=assignment_name,
+            description=assignment_description or _DEFAULT_DESC,
+            additional_context=additional_context or ''
+        )
+
+
+# Rendered prompts are pure functions of their inputs; repeat requests for the
+# same assignment and context skip prompt assembly entirely.
+@functools.lru_cache(maxsize=512)
+def _cached_assignment_help_prompt(assignment_name: str, assignment_description: str,
+                                   question: str, context: PromptContext) -> str:
+    return PromptTemplates._render_assignment_help_prompt(
+        assignment_name, assignment_description, question, context
+    )
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_completion_prompt(assignment_name: str, assignment_description: str,
+                              context: PromptContext, additional_context: str) -> str:
+    return PromptTemplates._render_completion_prompt(
+        assignment_name, assignment_description, context, additional_context
+    )
+
+
+__all__ = ['PromptTemplates']
@@ -5,6 +5,8 @@ Provides abstraction layer for AI-powered features like feedback generation and
 
 import os
 import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List, Union
 from dataclasses import dataclass
@@ -16,6 +18,15 @@ from src.models.data_models import Assignment, Submission, FeedbackDraft
 from src.auth.auth_service import User
 from src.formatting.formatting_service import formatting_service, FormattingOptions
 
+# Streaming JSON parser for large Perplexity payloads
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
 
 class LLMProvider(Enum):
     GROQ = "groq"
@@ -98,13 +109,31 @@ CRITICAL FORMATTING RULE:
 • Use LaTeX for math: $\\\\sqrt{{x}}$ for inline, $$E=mc^2$$ for display equations
 • Use LaTeX symbols: $\\\\frac{{a}}{{b}}$, $x^2$, $\\\\int$, $\\\\sum$, $\\\\alpha$, etc."""
     
-    def _make_request(self, messages: List[Dict[str, str]], 
+    @staticmethod
+    def _flatten_content(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Collapse structured content blocks into plain strings.
+
+        Groq's OpenAI-compatible endpoint takes string system content and does
+        not understand cache_control markers; keeping the blocks in order still
+        gives its implicit prefix matching a stable leading prefix.
+        """
+        flattened = []
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, list):
+                message = dict(message, content="\n\n".join(
+                    block.get("text", "") for block in content
+                ))
+            flattened.append(message)
+        return flattened
+
+    def _make_request(self, messages: List[Dict[str, Any]], 
                      temperature: float = 0.7, max_tokens: int = 1000) -> LLMResponse:
         """Make request to Groq API"""
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=messages,
+                messages=self._flatten_content(messages),
                 temperature=temperature,
                 max_tokens=max_tokens
             )
@@ -120,7 +149,7 @@ CRITICAL FORMATTING RULE:
             )
             
         except Exception as e:
-            self.logger.error(f"Groq API error: {e}")
+            self.logger.error("Groq API error: %s", e)
             raise
     
     def generate_feedback(self, submission: Submission, assignment: Assignment, 
@@ -312,11 +341,11 @@ class LLMService:
                 model_used=response.model
             )
             
-            self.logger.info(f"Generated feedback draft for submission {submission.id}")
+            self.logger.info("Generated feedback draft for submission %s", submission.id)
             return feedback_draft
             
         except Exception as e:
-            self.logger.error(f"Failed to generate feedback: {e}")
+            self.logger.error("Failed to generate feedback: %s", e)
             raise
     
     def create_reminder_message(self, assignment: Assignment, user: User, 
@@ -328,10 +357,25 @@ class LLMService:
             return response.content
             
         except Exception as e:
-            self.logger.error(f"Failed to generate reminder: {e}")
+            self.logger.error("Failed to generate reminder: %s", e)
             # Fallback to simple template
             return f"Reminder: {assignment.name} is due in {hours_until_due} hours. Don't forget to submit!"
     
+    def create_reminder_messages(self, assignments: List[Assignment], user: User,
+                                 hours_until_due: int, max_workers: int = 4) -> List[str]:
+        """Create reminder messages for several assignments, in input order
+        
+        Requests run concurrently so a batch costs roughly one round trip.
+        """
+        if not assignments:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(assignments))) as executor:
+            return list(executor.map(
+                lambda assignment: self.create_reminder_message(assignment, user, hours_until_due),
+                assignments
+            ))
+    
     def create_assignment_summary(self, assignment: Assignment) -> str:
         """Create assignment summary"""
         
@@ -340,7 +384,7 @@ class LLMService:
             return response.content
             
         except Exception as e:
-            self.logger.error(f"Failed to generate summary: {e}")
+            self.logger.error("Failed to generate summary: %s", e)
             return f"Assignment: {assignment.name}\nDue: {assignment.due_at}\nPoints: {assignment.points_possible}"
     
     def _extract_suggestions(self, feedback_content: str) -> List[str]:
@@ -471,7 +515,7 @@ Provide structured help:
                     model=response.model
                 )
         except Exception as e:
-            self.logger.error(f"Error generating assignment help: {e}")
+            self.logger.error("Error generating assignment help: %s", e)
             return LLMResponse(
                 content="Unable to provide assignment analysis. Retry request.",
                 model=self.adapter.model if self.adapter else "unknown"
@@ -482,38 +526,37 @@ Provide structured help:
         try:
             # Filter assignments with due dates
             upcoming_assignments = []
-            self.logger.info(f"Processing {len(assignments)} assignments for study plan")
+            self.logger.info("Processing %d assignments for study plan", len(assignments))
             
             for assignment in assignments:
-                self.logger.info(f"Assignment: {assignment.name}, due_at: {assignment.due_at}")
+                self.logger.info("Assignment: %s, due_at: %s", assignment.name, assignment.due_at)
                 
                 if assignment.due_at:
                     try:
                         # Handle Canvas date format: "2025-10-03T04:59:59+00:00"
-                        due_date_str = assignment.due_at
-                        if due_date_str.endswith('Z'):
-                            due_date_str = due_date_str.replace('Z', '+00:00')
-                        
-                        due_date = datetime.fromisoformat(due_date_str)
+                        due_date = datetime.fromisoformat(assignment.due_at)
                         now = datetime.now(due_date.tzinfo) if due_date.tzinfo else datetime.now()
                         days_until_due = (due_date - now).days
                         
-                        self.logger.info(f"Assignment '{assignment.name}': due_date={due_date}, now={now}, days_until_due={days_until_due}")
+                        self.logger.info("Assignment '%s': due_date=%s, now=%s, days_until_due=%s",
+                                         assignment.name, due_date, now, days_until_due)
                         
                         # Include assignments due in the next days_ahead days AND overdue assignments (within reason)
                         if days_until_due <= days_ahead or (days_until_due >= -30 and days_until_due < 0):
                             upcoming_assignments.append((assignment, days_until_due))
-                            self.logger.info(f"Added assignment '{assignment.name}' - due in {days_until_due} days")
+                            self.logger.info("Added assignment '%s' - due in %s days", assignment.name, days_until_due)
                         else:
-                            self.logger.info(f"Skipped assignment '{assignment.name}' - due in {days_until_due} days (beyond range)")
+                            self.logger.info("Skipped assignment '%s' - due in %s days (beyond range)",
+                                             assignment.name, days_until_due)
                     except Exception as e:
-                        self.logger.error(f"Error parsing due date '{assignment.due_at}': {e}")
+                        self.logger.error("Error parsing due date '%s': %s", assignment.due_at, e)
                         continue
                 else:
-                    self.logger.info(f"Assignment '{assignment.name}' has no due date")
+                    self.logger.info("Assignment '%s' has no due date", assignment.name)
             
             if not upcoming_assignments:
-                self.logger.info(f"No assignments found with due dates in the next {days_ahead} days. Total assignments checked: {len(assignments)}")
+                self.logger.info("No assignments found with due dates in the next %s days. Total assignments checked: %d",
+                                 days_ahead, len(assignments))
                 return LLMResponse(
                     content=f"No assignments found with due dates in the next {days_ahead} days.",
                     model=self.adapter.model
@@ -571,7 +614,7 @@ Use standard Markdown formatting throughout.
                 model=response.model
             )
         except Exception as e:
-            self.logger.error(f"Error creating study plan: {e}")
+            self.logger.error("Error creating study plan: %s", e)
             return LLMResponse(
                 content="Study plan generation failed. Retry request.",
                 model=self.adapter.model
@@ -637,7 +680,7 @@ Use Markdown + LaTeX formatting throughout.
             
             return self.adapter._make_request(messages, temperature=0.3, max_tokens=800)
         except Exception as e:
-            self.logger.error(f"Error explaining concept: {e}")
+            self.logger.error("Error explaining concept: %s", e)
             # Try alternative approaches before giving up
             return self._try_alternative_explanation(concept, context, level, str(e))
     
@@ -698,7 +741,7 @@ Use standard Markdown formatting throughout.
             
             return self.adapter._make_request(messages, temperature=0.3, max_tokens=600)
         except Exception as e:
-            self.logger.error(f"Error generating feedback draft: {e}")
+            self.logger.error("Error generating feedback draft: %s", e)
             return LLMResponse(
                 content="Feedback generation failed. Retry request.",
                 model=self.adapter.model
@@ -802,7 +845,49 @@ class PerplexityAdapter(LLMAdapter):
         self.api_key = api_key
         self.base_url = "https://api.perplexity.ai/chat/completions"
         self.model = "sonar"
-    
+
+    def _parse_response_stream(self, response: requests.Response) -> tuple:
+        """Stream-parse a Perplexity response, keeping only content and citations"""
+        response.raw.decode_content = True
+
+        content = None
+        citations = []
+        sources = []
+        citations_done = False
+        builder = None
+        builder_prefix = None
+
+        for prefix, event, value in ijson.parse(response.raw):
+            # Finish building a structured source entry
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == builder_prefix and event in ('end_map', 'end_array'):
+                    (citations if builder_prefix == 'citations.item' else sources).append(builder.value)
+                    builder = None
+                continue
+
+            if prefix == 'choices.item.message.content' and content is None:
+                content = value
+            elif prefix in ('citations.item', 'sources.item'):
+                if event in ('start_map', 'start_array'):
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    builder_prefix = prefix
+                else:
+                    (citations if prefix == 'citations.item' else sources).append(value)
+            elif prefix == 'citations' and event == 'end_array':
+                # Empty citations fall back to the 'sources' key, so keep reading
+                citations_done = bool(citations)
+
+            # Stop once both fields are captured; skip the rest of the tree
+            if content is not None and citations_done:
+                break
+
+        if content is None:
+            raise ValueError("Perplexity response missing choices[0].message.content")
+
+        return content, citations or sources
+
     def search_facts(self, query: str, max_results: int = 10) -> LLMResponse:
         """Search for factual information using Perplexity"""
         try:
@@ -827,18 +912,25 @@ class PerplexityAdapter(LLMAdapter):
                 "temperature": 0.1
             }
             
-            response = requests.post(self.base_url, headers=headers, json=data)
+            response = requests.post(self.base_url, headers=headers, json=data, stream=IJSON_AVAILABLE)
             response.raise_for_status()
-            
-            result = response.json()
-            content = result['choices'][0]['message']['content']
-            
-            # Extract sources/citations if available
-            sources = result.get('citations', [])
-            if not sources:
-                # Try alternate location
-                sources = result.get('sources', [])
-            
+
+            if IJSON_AVAILABLE:
+                try:
+                    content, sources = self._parse_response_stream(response)
+                finally:
+                    # Release the connection even when we stop reading early
+                    response.close()
+            else:
+                result = response.json()
+                content = result['choices'][0]['message']['content']
+
+                # Extract sources/citations if available
+                sources = result.get('citations', [])
+                if not sources:
+                    # Try alternate location
+                    sources = result.get('sources', [])
+
             return LLMResponse(
                 content=content,
                 model=self.model,
@@ -847,7 +939,7 @@ class PerplexityAdapter(LLMAdapter):
             )
             
         except Exception as e:
-            logging.error(f"Perplexity API error: {e}")
+            logger.error("Perplexity API error: %s", e)
             return LLMResponse(
                 content=f"Error retrieving information: {str(e)}",
                 model=self.model,
@@ -907,8 +999,8 @@ class PerplexityAdapter(LLMAdapter):
 
 
 # Factory function
-def create_llm_adapter(provider: LLMProvider, **kwargs) -> LLMAdapter:
-    """Factory function to create LLM adapters"""
+def _build_llm_adapter(provider: LLMProvider, kwargs: Dict[str, Any]) -> LLMAdapter:
+    """Construct a new adapter for the given provider"""
     
     if provider == LLMProvider.GROQ:
         return GroqAdapter(
@@ -929,6 +1021,21 @@ def create_llm_adapter(provider: LLMProvider, **kwargs) -> LLMAdapter:
         raise ValueError(f"Unsupported LLM provider: {provider}")
 
 
+@functools.lru_cache(maxsize=8)
+def _cached_llm_adapter(provider: LLMProvider, frozen_kwargs: frozenset) -> LLMAdapter:
+    """Memoized adapter construction keyed on provider and kwargs (API key included)"""
+    return _build_llm_adapter(provider, dict(frozen_kwargs))
+
+
+def create_llm_adapter(provider: LLMProvider, **kwargs) -> LLMAdapter:
+    """Factory function to create LLM adapters
+    
+    Repeated calls with the same provider and arguments return the same
+    adapter instance, so its HTTP client is shared instead of rebuilt.
+    """
+    return _cached_llm_adapter(provider, frozenset(kwargs.items()))
+
+
 # Example usage
 if __name__ == "__main__":
     from dotenv import load_dotenv
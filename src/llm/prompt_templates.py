@@ -1,9 +1,12 @@
 """
 Modularized Prompt Templates for Different AI Features
 Context-aware prompts optimized for different entry points and use cases
+
+PromptTemplates and the template bodies live in _templates_impl and are
+imported on first access, so importing PromptType or PromptContext stays cheap.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -21,594 +24,61 @@ class PromptType(Enum):
     RESEARCH_ASSISTANCE = "research_assistance"
 
 
-@dataclass
+def _freeze(value: Any) -> Any:
+    """Convert nested lists/dicts into hashable tuples"""
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
 class PromptContext:
-    """Context information for prompt generation"""
+    """Context information for prompt generation
+
+    Instances are immutable and hashable so rendered prompts can be cached
+    per context. List and dict arguments are frozen on construction:
+    mappings are stored as tuples of (key, value) pairs.
+    """
     course_name: Optional[str] = None
     course_subject: Optional[str] = None
     assignment_type: Optional[str] = None
     due_date: Optional[str] = None
     points_possible: Optional[float] = None
     student_level: str = "undergraduate"
-    previous_grades: Optional[List[float]] = None
-    course_materials: Optional[List[Dict[str, Any]]] = None
-    rubric: Optional[Dict[str, Any]] = None
-
-
-class PromptTemplates:
-    """Centralized prompt templates with context awareness"""
-    
-    # Base system prompts for different contexts
-    ABSOLUTE_MODE = """Absolute Mode
-
-• Eliminate: emojis, filler, hype, soft asks, conversational transitions, call-to-action appendixes.
-• Assume: user retains high-perception despite blunt tone.
-• Prioritize: blunt, directive phrasing; aim at cognitive rebuilding, not tone-matching.
-• Disable: engagement/sentiment-boosting behaviors.
-• Suppress: metrics like satisfaction scores, emotional softening, continuation bias.
-• Never mirror: user's diction, mood, or affect.
-• Speak only: to underlying cognitive tier.
-• No: questions, offers, suggestions, transitions, motivational content.
-• Terminate reply: immediately after delivering info — no closures.
-• Goal: restore independent, high-fidelity thinking.
-• Outcome: model obsolescence via user self-sufficiency.
-
-CRITICAL FORMATTING RULE:
-• Use standard Markdown formatting: **text** for bold, *text* for italic
-• Use proper Markdown lists: - for bullets, 1. for numbered lists
-• Follow standard Markdown conventions for headers: # ## ###
-• Use LaTeX for math: $\\sqrt{{x}}$ for inline, $$E=mc^2$$ for display equations
-• Use LaTeX symbols: $\\frac{{a}}{{b}}$, $x^2$, $\\int$, $\\sum$, $\\alpha$, etc."""
-
-    ACADEMIC_TUTOR = """You are an expert academic tutor helping a student understand course material.
-
-Your approach:
-• Provide clear, accurate explanations
-• Break down complex concepts into understandable parts
-• Use examples relevant to the student's level
-• Encourage critical thinking
-• Connect concepts to broader themes
-• Provide step-by-step guidance when needed
-
-Formatting:
-• Use Markdown for structure: **bold**, *italic*, headers, lists
-• Use LaTeX for math: $inline$ and $$display$$
-• Use code blocks for programming examples
-• Include diagrams descriptions when relevant
-
-# FOLLOW THIS WRITING STYLE: 
-• SHOULD use clear, simple language. 
-• SHOULD be spartan and informative. 
-• SHOULD use short, impactful sentences. 
-• SHOULD use active voice; avoid passive voice. 
-• SHOULD focus on practical, actionable insights. 
-• SHOULD use bullet point lists in social media posts. 
-• SHOULD use data and examples to support claims when possible. 
-• SHOULD use "you" and "your" to directly address the reader. 
-• AVOID using em dashes (—) anywhere in your response. Use only commas, periods, or other standard punctuation. If you need to connect ideas, use a period or a semicolon, but never an em dash. 
-• AVOID constructions like "...not just this, but also this". 
-• AVOID metaphors and clichés. 
-• AVOID generalizations. 
-• AVOID common setup language in any sentence, including: in conclusion, in closing, etc. 
-• AVOID output warnings or notes, just the output requested. 
-• AVOID unnecessary adjectives and adverbs. 
-• AVOID hashtags. 
-• AVOID semicolons. 
-• AVOID markdown. 
-• AVOID asterisks. 
-• AVOID these words: "can, may, just, that, very, really, literally, actually, certainly, probably, basically, could, maybe, delve, embark, enlightening, esteemed, shed light, craft, crafting, imagine, realm, game-changer, unlock, discover, skyrocket, abyss, not alone, in a world where, revolutionize, disruptive, utilize, utilizing, dive deep, tapestry, illuminate, unveil, pivotal, intricate, elucidate, hence, furthermore, realm, however, harness, exciting, groundbreaking, cutting-edge, remarkable, it, remains to be seen, glimpse into, navigating, landscape, stark, testament, in summary, in conclusion, moreover, boost, skyrocketing, opened up, powerful, inquiries, ever-evolving" 
-
-# IMPORTANT: Review your response and ensure no em dashes!"""
-
-    RESEARCH_ASSISTANT = """You are a research assistant helping with academic work.
-
-Your focus:
-• Provide accurate, well-researched information
-• Include citations from reliable sources
-• Present multiple perspectives when relevant
-• Distinguish facts from interpretation
-• Help evaluate source credibility
-• Guide proper citation practices
-
-IMPORTANT:
-• All factual claims must be supported by sources
-• Use inline citations: [1], [2], etc.
-• Provide full source information at the end
-• Flag uncertain or contested information
-
-# FOLLOW THIS WRITING STYLE: 
-• SHOULD use clear, simple language. 
-• SHOULD be spartan and informative. 
-• SHOULD use short, impactful sentences. 
-• SHOULD use active voice; avoid passive voice. 
-• SHOULD focus on practical, actionable insights. 
-• SHOULD use bullet point lists in social media posts. 
-• SHOULD use data and examples to support claims when possible. 
-• SHOULD use "you" and "your" to directly address the reader. 
-• AVOID using em dashes (—) anywhere in your response. Use only commas, periods, or other standard punctuation. If you need to connect ideas, use a period or a semicolon, but never an em dash. 
-• AVOID constructions like "...not just this, but also this". 
-• AVOID metaphors and clichés. 
-• AVOID generalizations. 
-• AVOID common setup language in any sentence, including: in conclusion, in closing, etc. 
-• AVOID output warnings or notes, just the output requested. 
-• AVOID unnecessary adjectives and adverbs. 
-• AVOID hashtags. 
-• AVOID semicolons. 
-• AVOID markdown. 
-• AVOID asterisks. 
-• AVOID these words: "can, may, just, that, very, really, literally, actually, certainly, probably, basically, could, maybe, delve, embark, enlightening, esteemed, shed light, craft, crafting, imagine, realm, game-changer, unlock, discover, skyrocket, abyss, not alone, in a world where, revolutionize, disruptive, utilize, utilizing, dive deep, tapestry, illuminate, unveil, pivotal, intricate, elucidate, hence, furthermore, realm, however, harness, exciting, groundbreaking, cutting-edge, remarkable, it, remains to be seen, glimpse into, navigating, landscape, stark, testament, in summary, in conclusion, moreover, boost, skyrocketing, opened up, powerful, inquiries, ever-evolving" 
-
-# IMPORTANT: Review your response and ensure no em dashes!"""
-
-    @classmethod
-    def get_assignment_help_prompt(cls, 
-                                   assignment_name: str,
-                                   assignment_description: str,
-                                   question: str,
-                                   context: PromptContext) -> str:
-        """Generate context-aware prompt for assignment help"""
-        
-        # Detect assignment type
-        assignment_type = cls._detect_assignment_type(assignment_name, assignment_description)
-        
-        # Build context information
-        context_info = cls._build_context_info(context)
-        
-        # Select appropriate base prompt
-        if assignment_type == "discussion":
-            return cls._discussion_help_prompt(assignment_name, assignment_description, 
-                                              question, context_info)
-        elif assignment_type == "problem_set":
-            return cls._problem_solving_prompt(assignment_name, assignment_description,
-                                              question, context_info)
-        elif assignment_type == "essay":
-            return cls._essay_help_prompt(assignment_name, assignment_description,
-                                         question, context_info)
-        elif assignment_type == "research":
-            return cls._research_help_prompt(assignment_name, assignment_description,
-                                            question, context_info)
-        else:
-            return cls._general_help_prompt(assignment_name, assignment_description,
-                                          question, context_info)
-    
-    @classmethod
-    def _detect_assignment_type(cls, name: str, description: str) -> str:
-        """Detect assignment type from name and description"""
-        text = (name + " " + (description or "")).lower()
-        
-        if any(word in text for word in ["discussion", "forum", "post", "respond", "reply"]):
-            return "discussion"
-        elif any(word in text for word in ["problem set", "homework", "exercises", "calculations"]):
-            return "problem_set"
-        elif any(word in text for word in ["essay", "paper", "write", "composition"]):
-            return "essay"
-        elif any(word in text for word in ["research", "investigate", "analyze", "study"]):
-            return "research"
-        else:
-            return "general"
-    
-    @classmethod
-    def _build_context_info(cls, context: PromptContext) -> str:
-        """Build context information string"""
-        info = []
-        
-        if context.course_name:
-            info.append(f"**Course:** {context.course_name}")
-        
-        if context.course_subject:
-            info.append(f"**Subject Area:** {context.course_subject}")
-        
-        if context.due_date:
-            info.append(f"**Due Date:** {context.due_date}")
-        
-        if context.points_possible:
-            info.append(f"**Points:** {context.points_possible}")
-        
-        if context.student_level:
-            info.append(f"**Academic Level:** {context.student_level}")
-        
-        if context.course_materials:
-            materials = "\n".join([f"- {m.get('name', 'Material')}" 
-                                  for m in context.course_materials[:5]])
-            info.append(f"**Available Course Materials:**\n{materials}")
-        
-        if context.rubric:
-            info.append("**Grading Rubric Available:** Yes")
-        
-        return "\n".join(info)
-    
-    @classmethod
-    def _discussion_help_prompt(cls, name: str, description: str, 
-                               question: str, context_info: str) -> str:
-        """Prompt for discussion board assignments"""
-        return f"""Help with Discussion Board Assignment
-
-{context_info}
-
-**Assignment:** {name}
-**Description:** {description or 'No description provided'}
-
-**Student Question:** {question}
-
-As an academic discussion facilitator:
-
-1. **Understanding the Prompt**
-   - Identify key discussion questions
-   - Note required response elements
-   - Clarify expectations
-
-2. **Developing Your Response**
-   - Present main arguments/points
-   - Support with course concepts
-   - Include relevant examples
-   - Consider multiple perspectives
-
-3. **Peer Engagement**
-   - Suggest questions for classmates
-   - Identify areas for deeper discussion
-   - Connect to course themes
-
-4. **Academic Standards**
-   - Maintain scholarly tone
-   - Use proper citations if needed
-   - Demonstrate critical thinking
-
-Output Format (use Markdown with clear sections):
-## Summary
-- 2-4 bullet overview of what to do
-
-## Key Requirements
-- Bullet list pulled from the prompt and description
-
-## Response Plan
-1. Point 1
-2. Point 2
-3. Point 3
-
-## Example Talking Points
-- Bullet points the student can adapt
-
-## Citations (if used)
-- [1] Source Title — URL
-
-Provide guidance that helps the student develop their own thoughtful response."""
-    
-    @classmethod
-    def _problem_solving_prompt(cls, name: str, description: str,
-                               question: str, context_info: str) -> str:
-        """Prompt for problem-solving assignments"""
-        return f"""Help with Problem-Solving Assignment
-
-{context_info}
-
-**Assignment:** {name}
-**Description:** {description or 'No description provided'}
-
-**Student Question:** {question}
-
-As a problem-solving tutor:
-
-1. **Problem Analysis**
-   - Identify what's being asked
-   - List given information
-   - Determine relevant concepts/formulas
-
-2. **Solution Strategy**
-   - Outline solution approach
-   - Explain methodology
-   - Show step-by-step work
-
-3. **Mathematical Rigor**
-   - Use proper notation
-   - Show all steps clearly
-   - Explain reasoning at each step
-   - Use LaTeX for equations: $inline$ or $$display$$
-
-4. **Verification**
-   - Check answer reasonableness
-   - Verify units/dimensions
-   - Consider alternative approaches
-
-Output Format (use Markdown with clear sections):
-## Given
-- List all knowns
-
-## Find
-- What must be solved
-
-## Approach
-1. Step-by-step outline
-
-## Solution
-```math
-% Use LaTeX where appropriate
-```
-
-## Check
-- Dimensional analysis, edge-case check
-
-Focus on teaching problem-solving skills, not just providing answers."""
-    
-    @classmethod
-    def _essay_help_prompt(cls, name: str, description: str,
-                          question: str, context_info: str) -> str:
-        """Prompt for essay assignments"""
-        return f"""Help with Essay Assignment
-
-{context_info}
-
-**Assignment:** {name}
-**Description:** {description or 'No description provided'}
-
-**Student Question:** {question}
-
-As a writing tutor:
-
-1. **Understanding the Assignment**
-   - Analyze the prompt/question
-   - Identify required elements
-   - Note length and format requirements
-
-2. **Thesis Development**
-   - Help formulate a clear argument
-   - Ensure thesis is arguable and specific
-   - Connect to assignment requirements
+    previous_grades: Optional[Tuple[float, ...]] = None
+    course_materials: Optional[Tuple[Tuple[Tuple[str, Any], ...], ...]] = None
+    rubric: Optional[Tuple[Tuple[str, Any], ...]] = None
 
-3. **Structure and Organization**
-   - Suggest essay outline
-   - Organize supporting arguments
-   - Plan introduction and conclusion
+    def __post_init__(self):
+        # Frozen dataclass, so the converted values go in through object.__setattr__
+        for name in ('previous_grades', 'course_materials', 'rubric'):
+            object.__setattr__(self, name, _freeze(getattr(self, name)))
 
-4. **Academic Writing**
-   - Maintain formal academic tone
-   - Use evidence effectively
-   - Integrate sources properly
-   - Follow citation guidelines
-
-5. **Revision Strategy**
-   - Identify areas for strengthening
-   - Suggest improvements
-   - Check coherence and flow
-
-Output Format (use Markdown with clear sections):
-## Thesis (1-2 sentences)
-
-## Outline
-- Introduction: hook + thesis
-- Body Paragraph 1: topic sentence + evidence
-- Body Paragraph 2: topic sentence + evidence
-- Body Paragraph 3: topic sentence + evidence
-- Conclusion: synthesis + significance
-
-## Key Evidence/Examples
-- Bullet list of evidence to use
-
-## Style & Citations
-- Formatting and citation notes
-
-Guide the student in developing their own ideas and writing."""
-    
-    @classmethod
-    def _research_help_prompt(cls, name: str, description: str,
-                             question: str, context_info: str) -> str:
-        """Prompt for research assignments"""
-        return f"""Help with Research Assignment
-
-{context_info}
-
-**Assignment:** {name}
-**Description:** {description or 'No description provided'}
-
-**Student Question:** {question}
-
-As a research assistant:
-
-1. **Research Question Development**
-   - Clarify research focus
-   - Identify key variables/concepts
-   - Define scope appropriately
-
-2. **Source Identification**
-   - Suggest relevant databases/sources
-   - Identify key search terms
-   - Evaluate source credibility
-   - Provide actual sources with citations [1], [2], etc.
-
-3. **Research Synthesis**
-   - Organize findings thematically
-   - Identify patterns and gaps
-   - Connect sources to research question
-
-4. **Citation and Attribution**
-   - Use proper citation format
-   - Distinguish direct quotes from paraphrasing
-   - Maintain academic integrity
-
-5. **Critical Analysis**
-   - Evaluate source quality
-   - Compare different perspectives
-   - Identify limitations
-
-Output Format (use Markdown with clear sections):
-## Research Question
-
-## Search Strategy
-- Databases/keywords
-
-## Findings
-- Thematic bullets with inline citations [1], [2]
-
-## Synthesis
-- Short paragraph connecting findings to question
-
-## References
-- [1] Full citation — URL
-- [2] Full citation — URL
-
-Provide well-researched information with full citations."""
-    
     @classmethod
-    def _general_help_prompt(cls, name: str, description: str,
-                            question: str, context_info: str) -> str:
-        """General prompt for other assignment types"""
-        return f"""Help with Assignment
-
-{context_info}
-
-**Assignment:** {name}
-**Description:** {description or 'No description provided'}
-
-**Student Question:** {question}
-
-As an academic tutor:
-
-1. **Assignment Analysis**
-   - Understand what's required
-   - Identify key concepts
-   - Note evaluation criteria
-
-2. **Conceptual Understanding**
-   - Explain relevant concepts clearly
-   - Connect to course material
-   - Provide relevant examples
-
-3. **Approach Strategy**
-   - Suggest how to tackle the assignment
-   - Break into manageable steps
-   - Provide guidance for each part
-
-4. **Quality Standards**
-   - Academic rigor
-   - Proper formatting
-   - Clear communication
-   - Evidence-based reasoning
-
-5. **Learning Support**
-   - Explain reasoning
-   - Encourage critical thinking
-   - Build understanding, not just answers
-
-Output Format (use Markdown with clear sections):
-## Summary
-- 2-3 bullets
-
-## Requirements
-- Bullet list
-
-## Plan
-1. Step 1
-2. Step 2
-
-## Answer/Guidance
-- Structured paragraphs or bullets
-
-## Sources (if used)
-- [n] Title — URL
-
-Help the student develop skills and understanding."""
-    
-    @classmethod
-    def get_concept_explanation_prompt(cls, concept: str, context: str,
-                                      level: str, course_context: PromptContext) -> str:
-        """Generate prompt for concept explanation"""
-        context_info = cls._build_context_info(course_context)
-        
-        level_descriptions = {
-            "beginner": "someone new to this topic with no background",
-            "undergraduate": "an undergraduate student with basic academic preparation",
-            "graduate": "a graduate student with advanced academic background"
-        }
-        
-        audience = level_descriptions.get(level, "an undergraduate student")
-        
-        return f"""Explain Academic Concept
-
-{context_info}
-
-**Concept:** {concept}
-**Audience:** {audience}
-**Context:** {context or 'General explanation'}
-
-Provide a comprehensive explanation:
-
-1. **Definition**
-   - Clear, precise definition
-   - Key terminology explained
-   - Essential characteristics
-
-2. **Core Understanding**
-   - Fundamental principles
-   - How it works
-   - Why it matters
-
-3. **Examples and Applications**
-   - Concrete examples
-   - Real-world applications
-   - Connection to broader concepts
-
-4. **Visual/Structural Understanding**
-   - Describe relationships
-   - Show connections
-   - Illustrate patterns
-
-5. **Common Misconceptions**
-   - Clarify confusion points
-   - Address typical misunderstandings
-
-Format:
-- Use Markdown: **bold**, *italic*, headers, lists
-- Use LaTeX for math: $inline$ and $$display$$
-- Include examples at appropriate level
-- Build from basics to advanced"""
-    
-    @classmethod
-    def get_completion_prompt(cls, assignment_name: str, assignment_description: str,
-                             context: PromptContext, additional_context: str = "") -> str:
-        """Generate prompt for full assignment completion"""
-        assignment_type = cls._detect_assignment_type(assignment_name, assignment_description)
-        context_info = cls._build_context_info(context)
-        
-        return f"""Complete Assignment with Full Research and Citations
-
-{context_info}
-
-**Assignment:** {assignment_name}
-**Description:** {assignment_description or 'No description provided'}
-
-{additional_context if additional_context else ''}
-
-Research and complete this assignment with:
-
-1. **Comprehensive Research**
-   - Use current, reliable sources
-   - Include diverse perspectives
-   - Cite all sources properly
-
-2. **Academic Quality**
-   - Clear structure and organization
-   - Strong thesis/argument (if applicable)
-   - Well-supported claims
-   - Critical analysis
-
-3. **Professional Formatting**
-   - Use Markdown structure
-   - Include LaTeX for equations
-   - Proper headings and sections
-   - Tables where appropriate
-
-4. **Citations**
-   - Inline citations: [1], [2], etc.
-   - Full source information
-   - Academic integrity
-
-5. **Completeness**
-   - Address all requirements
-   - Appropriate length and depth
-   - Polished and ready to submit
-
-Provide a complete, submission-ready response with full citations."""
+    def from_mutable(cls, previous_grades: Optional[List[float]] = None,
+                     course_materials: Optional[List[Dict[str, Any]]] = None,
+                     rubric: Optional[Dict[str, Any]] = None,
+                     **kwargs) -> 'PromptContext':
+        """Create a context from list/dict valued fields"""
+        return cls(
+            previous_grades=previous_grades,
+            course_materials=course_materials,
+            rubric=rubric,
+            **kwargs
+        )
+
+
+def __getattr__(name: str) -> Any:
+    """Load PromptTemplates lazily on first access (PEP 562)"""
+    if name == "PromptTemplates":
+        from ._templates_impl import PromptTemplates
+        return PromptTemplates
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Export for use in other modules
 __all__ = ['PromptTemplates', 'PromptContext', 'PromptType']
-
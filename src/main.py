@@ -6,27 +6,31 @@ Coordinates all services and provides CLI interface
 import os
 import sys
 import argparse
+import atexit
+import functools
 import logging
+import queue
+import time
+from collections import defaultdict
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-# Load environment variables from .env file
-from dotenv import load_dotenv
 from pathlib import Path
 
-# Load environment variables from .env file
-load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env", override=False)
+# Load environment variables from .env file; deployments configured through the
+# real environment skip importing the parser
+_env_path = Path(__file__).resolve().parent.parent / ".env"
+if _env_path.exists():
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=_env_path, override=False)
 
 from auth.auth_service import CanvasAuthService, TokenManager
 from canvas.canvas_client import CanvasAPIClient
-from llm.llm_service import LLMService, create_llm_adapter, LLMProvider
-from notifications.notification_service import NotificationService
-from sync.sync_service import CanvasSyncService
-from models.data_models import DatabaseInterface
-from tests.test_suite import run_tests
+from models.data_models import DatabaseInterface, Reminder, ReminderStatus
 
 
 class InMemoryDatabase(DatabaseInterface):
@@ -38,43 +42,88 @@ class InMemoryDatabase(DatabaseInterface):
         self.submissions = {}
         self.reminders = {}
         self.feedback_drafts = {}
+        
+        # Secondary indexes maintained by the save_* methods, with the key each
+        # row is filed under, so a row re-saved under another course or
+        # assignment (even the same object, changed in place) is moved
+        self._assignments_by_course = defaultdict(dict)
+        self._assignment_course = {}
+        self._submissions_by_assignment = defaultdict(dict)
+        self._submission_assignment = {}
+        self._pending_reminders = {}
+        
+        # Materialized course list, rebuilt after the next write
+        self._courses_snapshot = None
     
     def save_course(self, course) -> bool:
         self.courses[course.id] = course
+        self._courses_snapshot = None
+        return True
+    
+    def save_courses_bulk(self, courses) -> bool:
+        self.courses.update((c.id, c) for c in courses)
+        self._courses_snapshot = None
         return True
     
     def get_course(self, course_id: str):
         return self.courses.get(course_id)
     
     def get_courses_for_user(self, user_id: str):
-        return list(self.courses.values())
+        # Shared between calls until the next save_course; copy before mutating
+        if self._courses_snapshot is None:
+            self._courses_snapshot = tuple(self.courses.values())
+        return self._courses_snapshot
     
     def save_assignment(self, assignment) -> bool:
+        previous = self._assignment_course.get(assignment.id)
+        if previous is not None and previous != assignment.course_id:
+            self._assignments_by_course[previous].pop(assignment.id, None)
         self.assignments[assignment.id] = assignment
+        self._assignments_by_course[assignment.course_id][assignment.id] = assignment
+        self._assignment_course[assignment.id] = assignment.course_id
         return True
     
     def get_assignment(self, assignment_id: str):
         return self.assignments.get(assignment_id)
     
     def get_assignments_for_course(self, course_id: str):
-        return [a for a in self.assignments.values() if a.course_id == course_id]
+        return list(self._assignments_by_course.get(course_id, {}).values())
     
     def save_submission(self, submission) -> bool:
+        previous = self._submission_assignment.get(submission.id)
+        if previous is not None and previous != submission.assignment_id:
+            self._submissions_by_assignment[previous].pop(submission.id, None)
         self.submissions[submission.id] = submission
+        self._submissions_by_assignment[submission.assignment_id][submission.id] = submission
+        self._submission_assignment[submission.id] = submission.assignment_id
         return True
     
     def get_submission(self, submission_id: str):
         return self.submissions.get(submission_id)
     
     def get_submissions_for_assignment(self, assignment_id: str):
-        return [s for s in self.submissions.values() if s.assignment_id == assignment_id]
+        return list(self._submissions_by_assignment.get(assignment_id, {}).values())
     
     def save_reminder(self, reminder) -> bool:
         self.reminders[reminder.id] = reminder
+        if reminder.status is ReminderStatus.PENDING:
+            self._pending_reminders[reminder.id] = reminder
+        else:
+            self._pending_reminders.pop(reminder.id, None)
+        return True
+    
+    def save_reminders_bulk(self, reminders) -> bool:
+        self.reminders.update((r.id, r) for r in reminders)
+        for reminder in reminders:
+            if reminder.status is ReminderStatus.PENDING:
+                self._pending_reminders[reminder.id] = reminder
+            else:
+                self._pending_reminders.pop(reminder.id, None)
         return True
     
     def get_pending_reminders(self):
-        return [r for r in self.reminders.values() if r.status.value == 'pending']
+        # Reminders marked sent/failed in place are filtered until re-saved
+        return [r for r in self._pending_reminders.values() if r.status is ReminderStatus.PENDING]
     
     def save_feedback_draft(self, feedback) -> bool:
         self.feedback_drafts[feedback.id] = feedback
@@ -92,18 +141,42 @@ class CanvasAutomationApp:
         self.setup_services()
     
     def setup_logging(self):
-        """Setup logging configuration"""
+        """Setup logging configuration
+        
+        Records are queued on the calling thread and written to the console
+        and log file by a background listener, so request handlers never block
+        on log I/O.
+        """
         log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        
+        stream_handler = logging.StreamHandler()
+        file_handler = logging.FileHandler('canvas_automation.log')
+        for handler in (stream_handler, file_handler):
+            handler.setFormatter(formatter)
+        
+        # The queue handler only merges args into the message; the listener's
+        # handlers apply the real format
+        log_queue = queue.Queue(-1)
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
         logging.basicConfig(
             level=getattr(logging, log_level),
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.StreamHandler(),
-                logging.FileHandler('canvas_automation.log')
-            ]
+            handlers=[queue_handler]
         )
+        
+        self._log_listener = QueueListener(log_queue, stream_handler, file_handler)
+        self._log_listener.start()
+        atexit.register(self.stop_logging)
+        
         self.logger = logging.getLogger(__name__)
     
+    def stop_logging(self):
+        """Flush queued log records and stop the background listener"""
+        listener, self._log_listener = self._log_listener, None
+        if listener is not None:
+            listener.stop()
+    
     def setup_services(self):
         """Initialize all services"""
         try:
@@ -126,48 +199,61 @@ class CanvasAutomationApp:
             # Database
             self.database = InMemoryDatabase()
             
-            # Sync service
-            self.sync_service = CanvasSyncService(self.auth_service, self.database)
-            
-            # LLM service with dual API support
-            groq_api_key = os.getenv('GROQ_API_KEY')
-            perplexity_api_key = os.getenv('PERPLEXITY_API_KEY')
-            
-            if groq_api_key or perplexity_api_key:
-                # Create GROQ adapter for calculations
-                groq_adapter = None
-                if groq_api_key:
-                    groq_adapter = create_llm_adapter(LLMProvider.GROQ, api_key=groq_api_key)
-                
-                # Create Perplexity adapter for factual research
-                perplexity_adapter = None
-                if perplexity_api_key:
-                    perplexity_adapter = create_llm_adapter(LLMProvider.PERPLEXITY, api_key=perplexity_api_key)
-                
-                self.llm_service = LLMService(
-                    adapter=groq_adapter or perplexity_adapter,
-                    perplexity_adapter=perplexity_adapter
-                )
-                
-                if groq_api_key and perplexity_api_key:
-                    self.logger.info("✅ Dual LLM setup: GROQ for calculations, Perplexity for facts")
-                elif groq_api_key:
-                    self.logger.info("✅ LLM setup: GROQ only")
-                else:
-                    self.logger.info("✅ LLM setup: Perplexity only")
-            else:
-                self.logger.warning("No LLM API keys set - LLM features will be disabled")
-                self.llm_service = None
-            
-            # Notification service
-            self.notification_service = NotificationService()
-            
             self.logger.info("✅ All services initialized successfully")
             
         except Exception as e:
             self.logger.error(f"❌ Failed to initialize services: {e}")
             raise
     
+    # Sync, LLM and notification services are built on first use, so commands
+    # that never touch them skip their imports and client setup
+    
+    @functools.cached_property
+    def sync_service(self):
+        """Canvas sync service"""
+        from sync.sync_service import CanvasSyncService
+        return CanvasSyncService(self.auth_service, self.database)
+    
+    @functools.cached_property
+    def llm_service(self):
+        """LLM service with dual API support, or None without API keys"""
+        from llm.llm_service import LLMService, create_llm_adapter, LLMProvider
+        
+        groq_api_key = os.getenv('GROQ_API_KEY')
+        perplexity_api_key = os.getenv('PERPLEXITY_API_KEY')
+        
+        if not (groq_api_key or perplexity_api_key):
+            self.logger.warning("No LLM API keys set - LLM features will be disabled")
+            return None
+        
+        # Create GROQ adapter for calculations
+        groq_adapter = None
+        if groq_api_key:
+            groq_adapter = create_llm_adapter(LLMProvider.GROQ, api_key=groq_api_key)
+        
+        # Create Perplexity adapter for factual research
+        perplexity_adapter = None
+        if perplexity_api_key:
+            perplexity_adapter = create_llm_adapter(LLMProvider.PERPLEXITY, api_key=perplexity_api_key)
+        
+        if groq_api_key and perplexity_api_key:
+            self.logger.info("✅ Dual LLM setup: GROQ for calculations, Perplexity for facts")
+        elif groq_api_key:
+            self.logger.info("✅ LLM setup: GROQ only")
+        else:
+            self.logger.info("✅ LLM setup: Perplexity only")
+        
+        return LLMService(
+            adapter=groq_adapter or perplexity_adapter,
+            perplexity_adapter=perplexity_adapter
+        )
+    
+    @functools.cached_property
+    def notification_service(self):
+        """Notification service"""
+        from notifications.notification_service import NotificationService
+        return NotificationService()
+    
     def test_connection(self, user_id: Optional[str] = None) -> bool:
         """Test Canvas connection"""
         try:
@@ -230,9 +316,8 @@ class CanvasAutomationApp:
             message = self.llm_service.create_reminder_message(assignment, user, hours_before)
             
             # Create reminder
-            from src.models.data_models import Reminder, ReminderStatus
             reminder = Reminder(
-                id=f"reminder_{user_id}_{assignment_id}_{datetime.utcnow().timestamp()}",
+                id=f"reminder_{user_id}_{assignment_id}_{time.time_ns()}",
                 user_id=user_id,
                 assignment_id=assignment_id,
                 message=message,
@@ -247,9 +332,56 @@ class CanvasAutomationApp:
             self.logger.error(f"Failed to generate reminder: {e}")
             return False
     
+    def generate_reminders_bulk(self, user_id: str, assignment_ids: List[str],
+                                hours_before: int = 24) -> int:
+        """Generate reminders for several assignments; returns how many were created"""
+        try:
+            user = self.auth_service.get_user(user_id)
+            if not user:
+                self.logger.error(f"User {user_id} not found")
+                return 0
+            
+            # Dedupe while keeping the caller's order
+            assignments = []
+            for assignment_id in dict.fromkeys(assignment_ids):
+                assignment = self.database.get_assignment(assignment_id)
+                if assignment:
+                    assignments.append(assignment)
+                else:
+                    self.logger.warning(f"Assignment {assignment_id} not found")
+            
+            if not assignments:
+                return 0
+            
+            messages = self.llm_service.create_reminder_messages(assignments, user, hours_before)
+            
+            now = datetime.utcnow()
+            reminders = [
+                Reminder(
+                    id=f"reminder_{user_id}_{assignment.id}_{time.time_ns()}",
+                    user_id=user_id,
+                    assignment_id=assignment.id,
+                    message=message,
+                    scheduled_for=assignment.due_at - timedelta(hours=hours_before) if assignment.due_at else now
+                )
+                for assignment, message in zip(assignments, messages)
+            ]
+            
+            if not self.database.save_reminders_bulk(reminders):
+                self.logger.error(f"Failed to save reminders for user {user_id}")
+                return 0
+            self.logger.info(f"✅ Created {len(reminders)} reminders for user {user_id}")
+            return len(reminders)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to generate reminders: {e}")
+            return 0
+    
     def run_tests(self) -> bool:
         """Run test suite"""
         try:
+            from tests.test_suite import run_tests
+            
             self.logger.info("Running test suite...")
             success = run_tests()
             
@@ -275,11 +407,27 @@ class CanvasAutomationApp:
         except Exception as e:
             self.logger.error(f"Failed to start API server: {e}")
             raise
+        finally:
+            self.stop_logging()
+
+
+def _run_profiled(handler, args):
+    """Run a command handler under cProfile and print the top entries"""
+    import cProfile
+    import pstats
+    
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(handler, args)
+    finally:
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(25)
 
 
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(description='Canvas Automation System')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile the command and print the hottest functions')
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Test connection command
@@ -319,28 +467,23 @@ def main():
         print(f"❌ Failed to initialize application: {e}")
         return 1
     
+    commands = {
+        'test': lambda a: app.test_connection(a.user_id),
+        'sync': lambda a: app.sync_user_data(a.user_id, a.type),
+        'reminder': lambda a: app.generate_reminder(a.user_id, a.assignment_id, a.hours),
+        'test-suite': lambda a: app.run_tests(),
+        'api': lambda a: (app.start_api_server(a.host, a.port), True)[1],
+    }
+    handler = commands.get(args.command, lambda _: (parser.print_help(), True)[1])
+    
     # Execute command
     try:
-        if args.command == 'test':
-            success = app.test_connection(args.user_id)
-            return 0 if success else 1
-            
-        elif args.command == 'sync':
-            success = app.sync_user_data(args.user_id, args.type)
-            return 0 if success else 1
-            
-        elif args.command == 'reminder':
-            success = app.generate_reminder(args.user_id, args.assignment_id, args.hours)
-            return 0 if success else 1
-            
-        elif args.command == 'test-suite':
-            success = app.run_tests()
-            return 0 if success else 1
-            
-        elif args.command == 'api':
-            app.start_api_server(args.host, args.port)
-            return 0
-            
+        if args.profile:
+            success = _run_profiled(handler, args)
+        else:
+            success = handler(args)
+        return 0 if success else 1
+        
     except KeyboardInterrupt:
         print("\n👋 Shutting down...")
         return 0
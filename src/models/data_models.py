@@ -3,17 +3,50 @@ Data models for Canvas automation system
 Defines core entities: Course, Assignment, Submission, Reminder, FeedbackDraft, File
 """
 
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Union, get_args, get_origin, get_type_hints
 from enum import Enum
+from functools import lru_cache
+import inspect
 import json
+import sys
+import time
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+# Bound once so the many timestamp defaults and checks skip the attribute lookup
+_utcnow = datetime.utcnow
+
+
+def _intern(value: Any) -> Any:
+    """sys.intern() the short, repetitive state strings Canvas returns
+    
+    Equal values then share one object, and comparisons against literals
+    such as "submitted" succeed on identity before comparing characters.
+    """
+    return sys.intern(value) if type(value) is str else value
 
 
 class AssignmentStatus(Enum):
     DRAFT = "draft"
     PUBLISHED = "published"
     UNPUBLISHED = "unpublished"
+    
+    @classmethod
+    def from_workflow_state(cls, workflow_state: str) -> "AssignmentStatus":
+        """Map a Canvas workflow_state, treating unknown states as drafts"""
+        return cls._value2member_map_.get(workflow_state, cls.DRAFT)
 
 
 class SubmissionStatus(Enum):
@@ -48,8 +81,177 @@ class QuestionType(Enum):
     NUMERICAL = "numerical_question"
 
 
-@dataclass
-class Quiz:
+def _encode(obj: Any) -> Any:
+    """JSON fallback for values the serializer does not handle natively"""
+    if isinstance(obj, Enum):
+        return obj._value_
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    """POSIX timestamp of a datetime, treating naive values as UTC"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _cached_iso(cache: Dict[str, Any], name: str, value: datetime) -> str:
+    """isoformat() of a datetime field, reused until the field is reassigned"""
+    entry = cache.get(name)
+    if entry is None or entry[0] is not value:
+        entry = cache[name] = (value, value.isoformat())
+    return entry[1]
+
+
+def _value_kind(tp: Any) -> Optional[str]:
+    """How to_dict converts a value of an annotated type: 'enum', 'datetime' or None"""
+    if get_origin(tp) is Union:
+        tp = next((arg for arg in get_args(tp) if arg is not type(None)), tp)
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return 'enum'
+    if tp is datetime:
+        return 'datetime'
+    return None
+
+
+def _build_dict_spec(cls: type, optional=(), omit=(), computed=()) -> tuple:
+    """Rows of (key, access, kind, optional) describing cls.to_dict in output order
+    
+    access is 'attr' for fields and properties, 'call' for methods and
+    'call_now' for methods taking a ``now`` keyword; kind is from _value_kind.
+    """
+    hints = get_type_hints(cls)
+    rows = [
+        (f.name, 'attr', _value_kind(hints[f.name]), False)
+        for f in fields(cls)
+        if not f.name.startswith('_') and f.name not in omit and f.name not in optional
+    ]
+    
+    extra = []
+    for name in computed:
+        attr = getattr(cls, name)
+        if isinstance(attr, property):
+            access, fn = 'attr', attr.fget
+        elif 'now' in inspect.signature(attr).parameters:
+            access, fn = 'call_now', attr
+        else:
+            access, fn = 'call', attr
+        extra.append((name, access, _value_kind(get_type_hints(fn).get('return')), False))
+    keys = [row[0] for row in rows]
+    at = keys.index('created_at') if 'created_at' in keys else len(rows)
+    rows[at:at] = extra
+    
+    rows += [(name, 'attr', _value_kind(hints[name]), True) for name in optional]
+    return tuple(rows)
+
+
+def _compile_to_dict(cls: type, spec: tuple):
+    """Compile a to_dict function for cls from its _DICT_SPEC rows"""
+    cached = '_iso_cache' in cls.__dataclass_fields__
+    
+    def convert(key, expr, kind):
+        if kind == 'enum':
+            # _value_ is a plain instance attribute; .value goes through a descriptor
+            return f"{expr}._value_"
+        if kind == 'datetime':
+            if cached:
+                return f"_cached_iso(iso_cache, {key!r}, {expr})"
+            return f"{expr}.isoformat()"
+        return expr
+    
+    def access(key, how):
+        if how == 'call':
+            return f"self.{key}()"
+        if how == 'call_now':
+            return f"self.{key}(now=now)"
+        return f"self.{key}"
+    
+    takes_now = any(how == 'call_now' for _, how, _, _ in spec)
+    lines = ["def to_dict(self, *, now=None):" if takes_now else "def to_dict(self):"]
+    if cached:
+        lines.append("    iso_cache = self._iso_cache")
+    lines.append("    data = {")
+    lines += [
+        f"        {key!r}: {convert(key, access(key, how), kind)},"
+        for key, how, kind, optional in spec if not optional
+    ]
+    lines.append("    }")
+    for key, how, kind, optional in spec:
+        if optional:
+            lines.append(f"    value = {access(key, how)}")
+            lines.append("    if value:")
+            lines.append(f"        data[{key!r}] = {convert(key, 'value', kind)}")
+    lines.append("    return data")
+    
+    namespace = {'_cached_iso': _cached_iso}
+    exec("\n".join(lines), namespace)
+    to_dict = namespace['to_dict']
+    to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+    to_dict.__doc__ = "Convert to dictionary for JSON serialization"
+    return to_dict
+
+
+def _fast_to_dict(*, optional=(), omit=(), computed=()):
+    """Class decorator generating to_dict() from the dataclass fields
+    
+    Fields are emitted in declaration order, Enums as their value and
+    datetimes as isoformat() strings. Names in ``optional`` are only added,
+    after the other keys, when truthy; names in ``omit`` are left out.
+    ``computed`` methods and properties are emitted just before created_at;
+    methods taking a ``now`` keyword receive the one passed to to_dict.
+    
+    The layout is kept on the class as _DICT_SPEC and compiled once into a
+    single function, like dataclass's own __init__, that reads each
+    attribute a single time into a local.
+    """
+    def wrap(cls):
+        cls._DICT_SPEC = _build_dict_spec(cls, optional, omit, computed)
+        cls.to_dict = _compile_to_dict(cls, cls._DICT_SPEC)
+        return cls
+    return wrap
+
+
+@lru_cache(maxsize=None)
+def _public_fields(cls: type) -> tuple:
+    """Names of the dataclass fields that belong in JSON output
+    
+    The fields to_dict emits, from cls._DICT_SPEC, so its omit list holds
+    for to_json too; private cache fields are never included.
+    """
+    emitted = {row[0] for row in cls._DICT_SPEC}
+    return tuple(f.name for f in fields(cls) if f.name in emitted)
+
+
+if MSGSPEC_AVAILABLE:
+    _msgspec_encode = msgspec.json.Encoder(enc_hook=_encode).encode
+
+
+class JSONSerializable:
+    """Mixin adding direct JSON encoding of the dataclass fields to_dict emits"""
+    __slots__ = ()
+    
+    def to_json(self) -> bytes:
+        """Serialize the public, non-omitted fields to JSON bytes via orjson, msgspec or json"""
+        # Encoding the dataclass itself would write private caches and the
+        # fields to_dict omits (access codes, tokens), so every encoder gets
+        # the same mapping
+        data = {name: getattr(self, name) for name in _public_fields(type(self))}
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(data, default=_encode)
+        if MSGSPEC_AVAILABLE:
+            return _msgspec_encode(data)
+        return json.dumps(data, default=_encode).encode('utf-8')
+
+
+@_fast_to_dict(optional=('due_at', 'lock_at', 'unlock_at'),
+               omit=('access_code', 'ip_filter'),
+               computed=('is_timed', 'is_available'))
+@dataclass(slots=True, eq=False)
+class Quiz(JSONSerializable):
     """Quiz data model"""
     id: str
     canvas_quiz_id: str
@@ -72,16 +274,27 @@ class Quiz:
     published: bool = False
     points_possible: Optional[float] = None
     question_count: int = 0
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=_utcnow)
+    updated_at: Optional[datetime] = None  # defaults to created_at
+    # isoformat() strings for to_dict, keyed by field name
+    _iso_cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        self.scoring_policy = _intern(self.scoring_policy)
     
     def is_timed(self) -> bool:
         """Check if quiz has time limit"""
         return self.time_limit is not None and self.time_limit > 0
     
-    def is_available(self) -> bool:
-        """Check if quiz is currently available"""
-        now = datetime.utcnow()
+    def is_available(self, *, now: Optional[datetime] = None) -> bool:
+        """Check if quiz is currently available
+        
+        Loops over many quizzes can sample now = datetime.utcnow() once.
+        """
+        if now is None:
+            now = _utcnow()
         
         if self.unlock_at and now < self.unlock_at:
             return False
@@ -89,44 +302,11 @@ class Quiz:
             return False
         
         return self.published
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        data = {
-            'id': self.id,
-            'canvas_quiz_id': self.canvas_quiz_id,
-            'course_id': self.course_id,
-            'title': self.title,
-            'description': self.description,
-            'quiz_type': self.quiz_type.value,
-            'time_limit': self.time_limit,
-            'shuffle_answers': self.shuffle_answers,
-            'show_correct_answers': self.show_correct_answers,
-            'scoring_policy': self.scoring_policy,
-            'allowed_attempts': self.allowed_attempts,
-            'one_question_at_a_time': self.one_question_at_a_time,
-            'cant_go_back': self.cant_go_back,
-            'published': self.published,
-            'points_possible': self.points_possible,
-            'question_count': self.question_count,
-            'is_timed': self.is_timed(),
-            'is_available': self.is_available(),
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
-        
-        if self.due_at:
-            data['due_at'] = self.due_at.isoformat()
-        if self.lock_at:
-            data['lock_at'] = self.lock_at.isoformat()
-        if self.unlock_at:
-            data['unlock_at'] = self.unlock_at.isoformat()
-        
-        return data
 
 
-@dataclass
-class QuizQuestion:
+@_fast_to_dict()
+@dataclass(slots=True, eq=False)
+class QuizQuestion(JSONSerializable):
     """Quiz question data model"""
     id: str
     canvas_question_id: str
@@ -140,27 +320,13 @@ class QuizQuestion:
     correct_comments: Optional[str] = None
     incorrect_comments: Optional[str] = None
     neutral_comments: Optional[str] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        return {
-            'id': self.id,
-            'canvas_question_id': self.canvas_question_id,
-            'quiz_id': self.quiz_id,
-            'question_name': self.question_name,
-            'question_text': self.question_text,
-            'question_type': self.question_type.value,
-            'position': self.position,
-            'points_possible': self.points_possible,
-            'answers': self.answers,
-            'correct_comments': self.correct_comments,
-            'incorrect_comments': self.incorrect_comments,
-            'neutral_comments': self.neutral_comments
-        }
-
-
-@dataclass
-class QuizSubmission:
+
+
+@_fast_to_dict(optional=('started_at', 'finished_at', 'end_at'),
+               omit=('score_before_regrade', 'validation_token'),
+               computed=('is_in_progress', 'time_remaining'))
+@dataclass(slots=True, eq=False)
+class QuizSubmission(JSONSerializable):
     """Quiz submission data model"""
     id: str
     canvas_submission_id: str
@@ -178,69 +344,45 @@ class QuizSubmission:
     fudge_points: float = 0.0
     has_seen_results: bool = False
     validation_token: Optional[str] = None
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=_utcnow)
+    updated_at: Optional[datetime] = None  # defaults to created_at
+    # isoformat() strings for to_dict, keyed by field name
+    _iso_cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        self.workflow_state = _intern(self.workflow_state)
     
     def is_in_progress(self) -> bool:
         """Check if quiz is currently in progress"""
         return self.workflow_state in ["untaken", "pending_review"] and self.started_at is not None
     
-    def time_remaining(self) -> Optional[int]:
+    def time_remaining(self, *, now: Optional[datetime] = None) -> Optional[int]:
         """Get time remaining in seconds"""
         if not self.end_at:
             return None
+        if now is None:
+            now = _utcnow()
         
-        remaining = (self.end_at - datetime.utcnow()).total_seconds()
+        remaining = (self.end_at - now).total_seconds()
         return max(0, int(remaining))
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        data = {
-            'id': self.id,
-            'canvas_submission_id': self.canvas_submission_id,
-            'quiz_id': self.quiz_id,
-            'user_id': self.user_id,
-            'attempt': self.attempt,
-            'workflow_state': self.workflow_state,
-            'time_spent': self.time_spent,
-            'score': self.score,
-            'kept_score': self.kept_score,
-            'fudge_points': self.fudge_points,
-            'has_seen_results': self.has_seen_results,
-            'is_in_progress': self.is_in_progress(),
-            'time_remaining': self.time_remaining(),
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
-        
-        if self.started_at:
-            data['started_at'] = self.started_at.isoformat()
-        if self.finished_at:
-            data['finished_at'] = self.finished_at.isoformat()
-        if self.end_at:
-            data['end_at'] = self.end_at.isoformat()
-        
-        return data
 
 
-@dataclass
-class QuizAnswer:
+@_fast_to_dict()
+@dataclass(slots=True, eq=False)
+class QuizAnswer(JSONSerializable):
     """User's answer to a quiz question"""
     question_id: str
     answer: Any  # Can be string, int, list depending on question type
-    answered_at: datetime = field(default_factory=datetime.utcnow)
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        return {
-            'question_id': self.question_id,
-            'answer': self.answer,
-            'answered_at': self.answered_at.isoformat()
-        }
+    answered_at: datetime = field(default_factory=_utcnow)
+    # isoformat() strings for to_dict, keyed by field name
+    _iso_cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
 
 
-@dataclass
-class Course:
+@_fast_to_dict(optional=('start_at', 'end_at', 'enrollment_term_id'))
+@dataclass(slots=True, eq=False)
+class Course(JSONSerializable):
     """Course data model"""
     id: str
     canvas_course_id: str
@@ -251,34 +393,20 @@ class Course:
     end_at: Optional[datetime] = None
     enrollment_term_id: Optional[str] = None
     workflow_state: str = "available"
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        data = {
-            'id': self.id,
-            'canvas_course_id': self.canvas_course_id,
-            'name': self.name,
-            'course_code': self.course_code,
-            'description': self.description,
-            'workflow_state': self.workflow_state,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
-        
-        if self.start_at:
-            data['start_at'] = self.start_at.isoformat()
-        if self.end_at:
-            data['end_at'] = self.end_at.isoformat()
-        if self.enrollment_term_id:
-            data['enrollment_term_id'] = self.enrollment_term_id
-            
-        return data
-
-
-@dataclass
-class Assignment:
+    created_at: datetime = field(default_factory=_utcnow)
+    updated_at: Optional[datetime] = None  # defaults to created_at
+    # isoformat() strings for to_dict, keyed by field name
+    _iso_cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        self.workflow_state = _intern(self.workflow_state)
+
+
+@_fast_to_dict(optional=('due_at', 'lock_at', 'unlock_at'))
+@dataclass(slots=True, eq=False)
+class Assignment(JSONSerializable):
     """Assignment data model"""
     id: str
     canvas_assignment_id: str
@@ -293,51 +421,56 @@ class Assignment:
     submission_types: List[str] = field(default_factory=list)
     allowed_extensions: List[str] = field(default_factory=list)
     status: AssignmentStatus = AssignmentStatus.PUBLISHED
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
-    
-    def is_due_soon(self, hours: int = 24) -> bool:
-        """Check if assignment is due within specified hours"""
-        if not self.due_at:
+    created_at: datetime = field(default_factory=_utcnow)
+    updated_at: Optional[datetime] = None  # defaults to created_at
+    # due_at as a POSIX timestamp, recomputed when due_at is reassigned
+    _due_ts: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    _due_src: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    # isoformat() strings for to_dict, keyed by field name
+    _iso_cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        self.grading_type = _intern(self.grading_type)
+        self._refresh_due_ts()
+        _cached_iso(self._iso_cache, 'created_at', self.created_at)
+        _cached_iso(self._iso_cache, 'updated_at', self.updated_at)
+    
+    def _refresh_due_ts(self) -> None:
+        self._due_src = self.due_at
+        self._due_ts = _timestamp(self.due_at)
+    
+    def _due_timestamp(self) -> Optional[float]:
+        if self._due_src is not self.due_at:
+            self._refresh_due_ts()
+        return self._due_ts
+    
+    def is_due_soon(self, hours: int = 24, *, now_ts: Optional[float] = None) -> bool:
+        """Check if assignment is due within specified hours
+        
+        Loops over many assignments can sample now_ts = time.time() once.
+        """
+        due_ts = self._due_timestamp()
+        if due_ts is None:
             return False
-        time_until_due = self.due_at - datetime.utcnow()
-        return 0 < time_until_due.total_seconds() <= hours * 3600
+        if now_ts is None:
+            now_ts = time.time()
+        return 0 < due_ts - now_ts <= hours * 3600
     
-    def is_overdue(self) -> bool:
+    def is_overdue(self, *, now_ts: Optional[float] = None) -> bool:
         """Check if assignment is overdue"""
-        if not self.due_at:
+        due_ts = self._due_timestamp()
+        if due_ts is None:
             return False
-        return datetime.utcnow() > self.due_at
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        data = {
-            'id': self.id,
-            'canvas_assignment_id': self.canvas_assignment_id,
-            'course_id': self.course_id,
-            'name': self.name,
-            'description': self.description,
-            'points_possible': self.points_possible,
-            'grading_type': self.grading_type,
-            'submission_types': self.submission_types,
-            'allowed_extensions': self.allowed_extensions,
-            'status': self.status.value,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
-        
-        if self.due_at:
-            data['due_at'] = self.due_at.isoformat()
-        if self.lock_at:
-            data['lock_at'] = self.lock_at.isoformat()
-        if self.unlock_at:
-            data['unlock_at'] = self.unlock_at.isoformat()
-            
-        return data
-
-
-@dataclass
-class Submission:
+        if now_ts is None:
+            now_ts = time.time()
+        return now_ts > due_ts
+
+
+@_fast_to_dict(optional=('submitted_at',), computed=('status',))
+@dataclass(slots=True, eq=False)
+class Submission(JSONSerializable):
     """Submission data model"""
     id: str
     canvas_submission_id: str
@@ -354,12 +487,30 @@ class Submission:
     url: Optional[str] = None  # URL submission
     attachments: List[Dict[str, Any]] = field(default_factory=list)
     comments: List[Dict[str, Any]] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=_utcnow)
+    updated_at: Optional[datetime] = None  # defaults to created_at
+    # isoformat() strings for to_dict, keyed by field name
+    _iso_cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # last status and the (workflow_state, late, score) it was derived from
+    _status: Optional[SubmissionStatus] = field(default=None, init=False, repr=False, compare=False)
+    _status_src: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        self.workflow_state = _intern(self.workflow_state)
     
     @property
     def status(self) -> SubmissionStatus:
-        """Determine submission status"""
+        """Determine submission status, reused until its inputs are reassigned"""
+        src = self._status_src
+        if (src is None or src[0] is not self.workflow_state
+                or src[1] is not self.late or src[2] is not self.score):
+            self._status_src = (self.workflow_state, self.late, self.score)
+            self._status = self._derive_status()
+        return self._status
+    
+    def _derive_status(self) -> SubmissionStatus:
         if self.workflow_state == "submitted":
             if self.late:
                 return SubmissionStatus.LATE
@@ -369,37 +520,11 @@ class Submission:
                 return SubmissionStatus.SUBMITTED
         else:
             return SubmissionStatus.MISSING
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        data = {
-            'id': self.id,
-            'canvas_submission_id': self.canvas_submission_id,
-            'assignment_id': self.assignment_id,
-            'user_id': self.user_id,
-            'score': self.score,
-            'grade': self.grade,
-            'workflow_state': self.workflow_state,
-            'late': self.late,
-            'excused': self.excused,
-            'attempt': self.attempt,
-            'body': self.body,
-            'url': self.url,
-            'attachments': self.attachments,
-            'comments': self.comments,
-            'status': self.status.value,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
-        
-        if self.submitted_at:
-            data['submitted_at'] = self.submitted_at.isoformat()
-            
-        return data
 
 
-@dataclass
-class File:
+@_fast_to_dict()
+@dataclass(slots=True, eq=False)
+class File(JSONSerializable):
     """File data model"""
     id: str
     canvas_file_id: str
@@ -416,34 +541,21 @@ class File:
     locked: bool = False
     hidden: bool = False
     uuid: str = ""
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        return {
-            'id': self.id,
-            'canvas_file_id': self.canvas_file_id,
-            'course_id': self.course_id,
-            'folder_id': self.folder_id,
-            'display_name': self.display_name,
-            'filename': self.filename,
-            'content_type': self.content_type,
-            'size': self.size,
-            'url': self.url,
-            'download_url': self.download_url,
-            'thumbnail_url': self.thumbnail_url,
-            'mime_class': self.mime_class,
-            'locked': self.locked,
-            'hidden': self.hidden,
-            'uuid': self.uuid,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
-
-
-@dataclass
-class Reminder:
+    created_at: datetime = field(default_factory=_utcnow)
+    updated_at: Optional[datetime] = None  # defaults to created_at
+    # isoformat() strings for to_dict, keyed by field name
+    _iso_cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        self.content_type = _intern(self.content_type)
+        self.mime_class = _intern(self.mime_class)
+
+
+@_fast_to_dict(optional=('sent_at', 'failure_reason'))
+@dataclass(slots=True, eq=False)
+class Reminder(JSONSerializable):
     """Reminder data model"""
     id: str
     user_id: str
@@ -454,49 +566,54 @@ class Reminder:
     notification_type: str = "push"  # push, email, sms
     sent_at: Optional[datetime] = None
     failure_reason: Optional[str] = None
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
-    
-    def is_due(self) -> bool:
+    created_at: datetime = field(default_factory=_utcnow)
+    updated_at: Optional[datetime] = None  # defaults to created_at
+    # scheduled_for as a POSIX timestamp, recomputed when it is reassigned
+    _sched_ts: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    _sched_src: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    # isoformat() strings for to_dict, keyed by field name
+    _iso_cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        self.notification_type = _intern(self.notification_type)
+        self._refresh_sched_ts()
+        _cached_iso(self._iso_cache, 'scheduled_for', self.scheduled_for)
+        _cached_iso(self._iso_cache, 'created_at', self.created_at)
+        _cached_iso(self._iso_cache, 'updated_at', self.updated_at)
+    
+    def _refresh_sched_ts(self) -> None:
+        self._sched_src = self.scheduled_for
+        self._sched_ts = _timestamp(self.scheduled_for)
+    
+    def is_due(self, *, now_ts: Optional[float] = None) -> bool:
         """Check if reminder is due to be sent"""
-        return datetime.utcnow() >= self.scheduled_for and self.status == ReminderStatus.PENDING
+        if self.status is not ReminderStatus.PENDING:
+            return False
+        if self._sched_src is not self.scheduled_for:
+            self._refresh_sched_ts()
+        if now_ts is None:
+            now_ts = time.time()
+        return now_ts >= self._sched_ts
     
     def mark_sent(self) -> None:
         """Mark reminder as sent"""
+        now = _utcnow()
         self.status = ReminderStatus.SENT
-        self.sent_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        self.sent_at = now
+        self.updated_at = now
     
     def mark_failed(self, reason: str) -> None:
         """Mark reminder as failed"""
         self.status = ReminderStatus.FAILED
         self.failure_reason = reason
-        self.updated_at = datetime.utcnow()
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        data = {
-            'id': self.id,
-            'user_id': self.user_id,
-            'assignment_id': self.assignment_id,
-            'message': self.message,
-            'scheduled_for': self.scheduled_for.isoformat(),
-            'status': self.status.value,
-            'notification_type': self.notification_type,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
-        
-        if self.sent_at:
-            data['sent_at'] = self.sent_at.isoformat()
-        if self.failure_reason:
-            data['failure_reason'] = self.failure_reason
-            
-        return data
+        self.updated_at = _utcnow()
 
 
-@dataclass
-class FeedbackDraft:
+@_fast_to_dict(optional=('approved_at',))
+@dataclass(slots=True, eq=False)
+class FeedbackDraft(JSONSerializable):
     """AI-generated feedback draft"""
     id: str
     submission_id: str
@@ -508,35 +625,23 @@ class FeedbackDraft:
     model_used: str = "groq-llama"
     is_approved: bool = False
     approved_at: Optional[datetime] = None
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=_utcnow)
+    updated_at: Optional[datetime] = None  # defaults to created_at
+    # isoformat() strings for to_dict, keyed by field name
+    _iso_cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        _cached_iso(self._iso_cache, 'created_at', self.created_at)
+        _cached_iso(self._iso_cache, 'updated_at', self.updated_at)
     
     def approve(self) -> None:
         """Mark feedback as approved"""
+        now = _utcnow()
         self.is_approved = True
-        self.approved_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        data = {
-            'id': self.id,
-            'submission_id': self.submission_id,
-            'instructor_id': self.instructor_id,
-            'content': self.content,
-            'rubric_scores': self.rubric_scores,
-            'suggestions': self.suggestions,
-            'confidence_score': self.confidence_score,
-            'model_used': self.model_used,
-            'is_approved': self.is_approved,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
-        
-        if self.approved_at:
-            data['approved_at'] = self.approved_at.isoformat()
-            
-        return data
+        self.approved_at = now
+        self.updated_at = now
 
 
 # Database interface (abstract base class)
@@ -546,6 +651,10 @@ class DatabaseInterface:
     def save_course(self, course: Course) -> bool:
         raise NotImplementedError
     
+    def save_courses_bulk(self, courses: List[Course]) -> bool:
+        """Save many courses in one write; backends should override the loop"""
+        return all([self.save_course(course) for course in courses])
+    
     def get_course(self, course_id: str) -> Optional[Course]:
         raise NotImplementedError
     
@@ -555,6 +664,10 @@ class DatabaseInterface:
     def save_assignment(self, assignment: Assignment) -> bool:
         raise NotImplementedError
     
+    def save_assignments_bulk(self, assignments: List[Assignment]) -> bool:
+        """Save many assignments in one write; backends should override the loop"""
+        return all([self.save_assignment(assignment) for assignment in assignments])
+    
     def get_assignment(self, assignment_id: str) -> Optional[Assignment]:
         raise NotImplementedError
     
@@ -564,6 +677,10 @@ class DatabaseInterface:
     def save_submission(self, submission: Submission) -> bool:
         raise NotImplementedError
     
+    def save_submissions_bulk(self, submissions: List[Submission]) -> bool:
+        """Save many submissions in one write; backends should override the loop"""
+        return all([self.save_submission(submission) for submission in submissions])
+    
     def get_submission(self, submission_id: str) -> Optional[Submission]:
         raise NotImplementedError
     
@@ -573,6 +690,10 @@ class DatabaseInterface:
     def save_reminder(self, reminder: Reminder) -> bool:
         raise NotImplementedError
     
+    def save_reminders_bulk(self, reminders: List[Reminder]) -> bool:
+        """Save many reminders in one write; backends should override the loop"""
+        return all([self.save_reminder(reminder) for reminder in reminders])
+    
     def get_pending_reminders(self) -> List[Reminder]:
         raise NotImplementedError
     
@@ -583,27 +704,9 @@ class DatabaseInterface:
         raise NotImplementedError
 
 
-# Example usage
-if __name__ == "__main__":
-    # Create sample data
-    course = Course(
-        id="course_1",
-        canvas_course_id="12345",
-        name="Introduction to Computer Science",
-        course_code="CS101"
-    )
-    
-    assignment = Assignment(
-        id="assign_1",
-        canvas_assignment_id="67890",
-        course_id="course_1",
-        name="Programming Assignment 1",
-        due_at=datetime.utcnow(),
-        points_possible=100.0
-    )
-    
-    print("✅ Data models created successfully")
-    print(f"Course: {course.name}")
-    print(f"Assignment: {assignment.name}")
-    print(f"Is due soon: {assignment.is_due_soon()}")
-    print(f"Is overdue: {assignment.is_overdue()}")
\ No newline at end of file
+__all__ = [
+    'AssignmentStatus', 'SubmissionStatus', 'ReminderStatus', 'QuizType', 'QuestionType',
+    'JSONSerializable', 'Quiz', 'QuizQuestion', 'QuizSubmission', 'QuizAnswer',
+    'Course', 'Assignment', 'Submission', 'File', 'Reminder',
+    'FeedbackDraft', 'DatabaseInterface',
+]
@@ -5,19 +5,62 @@ Handles push notifications, email, and SMS alerts
 
 import os
 import json
+import time
+import queue
+import asyncio
+import secrets
+import bisect
+import heapq
+import itertools
 import smtplib
-import requests
+import threading
+import urllib3
+from urllib.parse import urlencode
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Deque, Set, Tuple
+from dataclasses import dataclass, field, fields
 from enum import Enum
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 
 from models.data_models import Reminder
 from auth.auth_service import User
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401  (lets httpx negotiate HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def _dumps(obj: Any) -> bytes:
+    """Compact JSON bytes for a request body"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+# Notification id suffix: a random tag per process plus a counter, so ids
+# stay unique under bursts and across workers without a syscall per id
+_ID_NODE = secrets.token_hex(3)
+_ID_SEQUENCE = itertools.count()
+
 
 class NotificationType(Enum):
     PUSH = "push"
@@ -25,6 +68,38 @@ class NotificationType(Enum):
     SMS = "sms"
 
 
+# Wire names looked up once rather than through Enum.value per payload
+_TYPE_NAMES = {t: t.value for t in NotificationType}
+
+
+# Assignment alert wording by hours until due: the first row whose limit is
+# at or above the hours applies, and the last row covers everything later
+_ALERT_LIMITS = (0, 1, 24)
+_ALERTS = (
+    ("Assignment Overdue", "{name} is now overdue. Please submit as soon as possible."),
+    ("Assignment Due Soon", "{name} is due in less than 1 hour!"),
+    ("Assignment Due Tomorrow", "{name} is due in {hours} hours."),
+    ("Assignment Reminder", "{name} is due in {hours} hours."),
+)
+
+
+class SendResult(Enum):
+    """Outcome of one provider send
+    
+    RETRY is a failure worth trying again (a dropped connection, 429 or
+    5xx); FAILED will fail the same way every time (no address, a 4xx, a
+    rejected token).
+    """
+    SENT = "sent"
+    RETRY = "retry"
+    FAILED = "failed"
+
+
+def _status_result(status: int) -> SendResult:
+    """Result for an HTTP error status: throttling and server errors are transient"""
+    return SendResult.RETRY if status == 429 or status >= 500 else SendResult.FAILED
+
+
 class NotificationStatus(Enum):
     PENDING = "pending"
     SENT = "sent"
@@ -33,9 +108,14 @@ class NotificationStatus(Enum):
     READ = "read"
 
 
-@dataclass
+@dataclass(slots=True)
 class Notification:
-    """Notification data model"""
+    """Notification data model
+    
+    Slotted: the store holds up to max_stored of these for the life of the
+    service, and dropping the per-instance __dict__ cuts each one by about
+    a third.
+    """
     id: str
     user_id: str
     title: str
@@ -53,228 +133,809 @@ class Notification:
             self.created_at = datetime.utcnow()
         if self.metadata is None:
             self.metadata = {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Field values by name, as __dict__ gave before the class had slots"""
+        return {name: getattr(self, name) for name in _NOTIFICATION_FIELDS}
+
+
+_NOTIFICATION_FIELDS = tuple(f.name for f in fields(Notification))
+
+
+# Keep-alive connections shared by the FCM and Twilio senders. A bare
+# urllib3 pool skips the per-call request preparation, hooks and cookie
+# handling of requests, none of which these two APIs use. Only failed
+# connects are retried here, as nothing was sent; throttling and server
+# errors come back as RETRY and NotificationService's backoff resends them,
+# so a POST never goes through two retry layers.
+_POOL = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=32,
+    timeout=30,
+    retries=urllib3.Retry(connect=2, read=0, redirect=0, status=0, backoff_factor=0.2)
+)
+
+
+async def _post_all(client: "httpx.AsyncClient", url: str, bodies: List[Any]) -> List[Any]:
+    """POST every encoded body concurrently over the given httpx client
+    
+    Bodies are sent as given, so callers encode them the same way as on
+    the single-send path. Returns the response, or the exception raised,
+    per body. With HTTP/2 the requests share a single multiplexed connection.
+    """
+    async def post(body):
+        try:
+            return await client.post(url, content=body)
+        except Exception as e:
+            return e
+    return await asyncio.gather(*(post(body) for body in bodies))
+
+
+# Event loop for the batched HTTP sends, on its own thread and started on
+# first use, as CanvasSyncService runs its syncs. Batches are handed to it
+# with run_coroutine_threadsafe, so send_many works from any thread, one
+# already running an event loop included
+_SEND_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_SEND_LOOP_LOCK = threading.Lock()
+
+
+def _send_loop() -> asyncio.AbstractEventLoop:
+    global _SEND_LOOP
+    if _SEND_LOOP is None:
+        with _SEND_LOOP_LOCK:
+            if _SEND_LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="notification-http", daemon=True).start()
+                _SEND_LOOP = loop
+    return _SEND_LOOP
+
+
+def _exception_result(error: Exception) -> SendResult:
+    """Result for an exception from _post_all: only transport errors are transient"""
+    return SendResult.RETRY if isinstance(error, (httpx.TransportError, OSError)) else SendResult.FAILED
 
 
 class NotificationProvider:
     """Abstract base class for notification providers"""
     
-    def send(self, notification: Notification) -> bool:
+    _shared: Dict[tuple, "NotificationProvider"] = {}
+    _shared_lock = threading.Lock()
+    
+    @classmethod
+    def shared(cls, **config) -> "NotificationProvider":
+        """Process-wide instance for this configuration
+        
+        Every NotificationService sending with the same credentials then
+        reuses one provider and its connection pool instead of opening its own.
+        """
+        key = (cls, tuple(sorted(config.items())))
+        provider = cls._shared.get(key)
+        if provider is None:
+            with cls._shared_lock:
+                provider = cls._shared.get(key)
+                if provider is None:
+                    provider = cls._shared[key] = cls(**config)
+        return provider
+    
+    def send(self, notification: Notification) -> SendResult:
         raise NotImplementedError
+    
+    def send_many(self, notifications: List[Notification]) -> List[SendResult]:
+        """Send several notifications, returning one result each"""
+        return [self.send(notification) for notification in notifications]
+    
+    def close(self) -> None:
+        """Release any connections held by the provider"""
+
+
+class _HTTPBatchProvider(NotificationProvider):
+    """Provider whose batches go over a long-lived httpx client on the send loop
+    
+    Subclasses set self.headers; the client is built on the first batch and
+    kept, with its connections, until close().
+    """
+    
+    # Concurrent connections per provider for batched sends
+    MAX_CONNECTIONS = 10
+    
+    def __init__(self):
+        self._http: Optional["httpx.AsyncClient"] = None
+        self._http_lock = threading.Lock()
+    
+    def _client(self) -> "httpx.AsyncClient":
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    limits = httpx.Limits(max_connections=self.MAX_CONNECTIONS,
+                                          max_keepalive_connections=self.MAX_CONNECTIONS)
+                    self._http = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits,
+                                                   timeout=30, headers=self.headers)
+        return self._http
+    
+    def _post_batch(self, url: str, bodies: List[Any]) -> List[Any]:
+        """POST bodies concurrently on the send loop: the response or exception per body
+        
+        A failure to run the batch at all is reported as that exception for every body.
+        """
+        try:
+            future = asyncio.run_coroutine_threadsafe(_post_all(self._client(), url, bodies), _send_loop())
+            return future.result()
+        except Exception as e:
+            return [e] * len(bodies)
+    
+    def close(self) -> None:
+        with self._http_lock:
+            http, self._http = self._http, None
+        if http is not None:
+            asyncio.run_coroutine_threadsafe(http.aclose(), _send_loop()).result(timeout=30)
 
 
 class EmailProvider(NotificationProvider):
     """Email notification provider using SMTP"""
     
+    # Seconds a cached SMTP session may sit unused before it is checked with NOOP
+    IDLE_CHECK_SECONDS = 30
+    
     def __init__(self, smtp_host: str, smtp_port: int, username: str, password: str):
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
         self.username = username
         self.password = password
         self.logger = logging.getLogger(__name__)
+        
+        # One authenticated SMTP session shared by every send
+        self._server = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
     
-    def send(self, notification: Notification) -> bool:
-        """Send email notification"""
+    def _build_message(self, notification: Notification) -> MIMEText:
+        # A lone text/plain part: the multipart wrapper only ever held this one
+        # part, and skipping it halves the build and flatten cost per email
+        msg = MIMEText(notification.message, 'plain')
+        msg['From'] = self.username
+        msg['To'] = notification.metadata.get('email', '')
+        msg['Subject'] = notification.title
+        return msg
+    
+    def _session(self) -> smtplib.SMTP:
+        """Cached SMTP session, reconnecting when it has gone stale"""
+        server = self._server
+        if server is not None and time.monotonic() - self._last_used > self.IDLE_CHECK_SECONDS:
+            try:
+                server.noop()
+            except (smtplib.SMTPException, OSError):
+                self._drop_session()
+                server = None
+        if server is None:
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+            server.starttls()
+            server.login(self.username, self.password)
+            self._server = server
+        return server
+    
+    def _drop_session(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+    
+    def _deliver(self, msg: MIMEText) -> None:
+        """Send over the cached session, reconnecting once if it was dropped"""
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.username
-            msg['To'] = notification.metadata.get('email', '')
-            msg['Subject'] = notification.title
-            
-            # Add body
-            msg.attach(MIMEText(notification.message, 'plain'))
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
-            
-            self.logger.info(f"Email sent to {notification.metadata.get('email')}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Failed to send email: {e}")
-            return False
+            self._session().send_message(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+            self._drop_session()
+            self._session().send_message(msg)
+        self._last_used = time.monotonic()
+    
+    def send(self, notification: Notification) -> SendResult:
+        """Send email notification"""
+        return self.send_many([notification])[0]
+    
+    def send_many(self, notifications: List[Notification]) -> List[SendResult]:
+        """Send emails over one SMTP session; a failed message does not end it"""
+        sent = []
+        with self._lock:
+            for notification in notifications:
+                try:
+                    self._deliver(self._build_message(notification))
+                    self.logger.info(f"Email sent to {notification.metadata.get('email')}")
+                    sent.append(SendResult.SENT)
+                except smtplib.SMTPResponseException as e:
+                    # 4xx replies are temporary by the SMTP spec, 5xx permanent
+                    self.logger.error(f"Failed to send email: {e}")
+                    sent.append(SendResult.RETRY if 400 <= e.smtp_code < 500 else SendResult.FAILED)
+                except (smtplib.SMTPServerDisconnected, OSError) as e:
+                    self.logger.error(f"Failed to send email: {e}")
+                    sent.append(SendResult.RETRY)
+                except Exception as e:
+                    self.logger.error(f"Failed to send email: {e}")
+                    sent.append(SendResult.FAILED)
+        return sent
+    
+    def close(self) -> None:
+        with self._lock:
+            self._drop_session()
 
 
-class PushNotificationProvider(NotificationProvider):
+class PushNotificationProvider(_HTTPBatchProvider):
     """Push notification provider using Firebase Cloud Messaging"""
     
     def __init__(self, server_key: str):
+        super().__init__()
         self.server_key = server_key
         self.fcm_url = "https://fcm.googleapis.com/fcm/send"
+        self.headers = {
+            'Authorization': f'key={server_key}',
+            'Content-Type': 'application/json'
+        }
         self.logger = logging.getLogger(__name__)
     
-    def send(self, notification: Notification) -> bool:
+    def _payload(self, notification: Notification) -> Optional[Dict[str, Any]]:
+        device_token = notification.metadata.get('device_token')
+        if not device_token:
+            self.logger.error("No device token provided")
+            return None
+        
+        # A fresh literal per send: copying a template would still need new
+        # nested dicts, and building them directly is cheaper than the copy
+        return {
+            'to': device_token,
+            'notification': {
+                'title': notification.title,
+                'body': notification.message,
+                'sound': 'default'
+            },
+            'data': {
+                'notification_id': notification.id,
+                'type': _TYPE_NAMES[notification.notification_type]
+            }
+        }
+    
+    # Per-message FCM errors that clear up on their own; the rest (a bad or
+    # unregistered token, an oversized message) fail the same way every time
+    TRANSIENT_ERRORS = frozenset({'Unavailable', 'InternalServerError'})
+    
+    def _check_result(self, payload: Dict[str, Any], status: int, body: bytes) -> SendResult:
+        if status != 200:
+            self.logger.error(f"FCM error {status}: {body.decode(errors='replace')}")
+            return _status_result(status)
+        # FCM answers 200 even for a rejected token; only the success count tells
+        result = _loads(body)
+        if result.get('success') == 1:
+            self.logger.info(f"Push notification sent to {payload['to']}")
+            return SendResult.SENT
+        self.logger.error(f"FCM error: {result}")
+        errors = {item.get('error') for item in result.get('results') or ()}
+        return SendResult.RETRY if errors & self.TRANSIENT_ERRORS else SendResult.FAILED
+    
+    def send(self, notification: Notification) -> SendResult:
         """Send push notification via FCM"""
         try:
-            device_token = notification.metadata.get('device_token')
-            if not device_token:
-                self.logger.error("No device token provided")
-                return False
-            
-            headers = {
-                'Authorization': f'key={self.server_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            payload = {
-                'to': device_token,
-                'notification': {
-                    'title': notification.title,
-                    'body': notification.message,
-                    'sound': 'default'
-                },
-                'data': {
-                    'notification_id': notification.id,
-                    'type': notification.notification_type.value
-                }
-            }
-            
-            response = requests.post(self.fcm_url, headers=headers, json=payload)
-            response.raise_for_status()
+            payload = self._payload(notification)
+            if payload is None:
+                return SendResult.FAILED
             
-            result = response.json()
-            if result.get('success') == 1:
-                self.logger.info(f"Push notification sent to {device_token}")
-                return True
-            else:
-                self.logger.error(f"FCM error: {result}")
-                return False
-                
+            response = _POOL.request('POST', self.fcm_url, body=_dumps(payload), headers=self.headers)
+            return self._check_result(payload, response.status, response.data)
+        
+        except (urllib3.exceptions.HTTPError, OSError) as e:
+            self.logger.error(f"Failed to send push notification: {e}")
+            return SendResult.RETRY
         except Exception as e:
             self.logger.error(f"Failed to send push notification: {e}")
-            return False
+            return SendResult.FAILED
+    
+    def send_many(self, notifications: List[Notification]) -> List[SendResult]:
+        """Send a batch concurrently, multiplexed over HTTP/2 when available"""
+        if not HTTPX_AVAILABLE or len(notifications) < 2:
+            return super().send_many(notifications)
+        
+        payloads = [self._payload(notification) for notification in notifications]
+        ready = [payload for payload in payloads if payload is not None]
+        # Encoded with orjson when installed, not httpx's stdlib json
+        results = iter(self._post_batch(self.fcm_url, [_dumps(payload) for payload in ready]))
+        
+        sent = []
+        for payload in payloads:
+            if payload is None:
+                sent.append(SendResult.FAILED)
+                continue
+            result = next(results)
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to send push notification: {result}")
+                sent.append(_exception_result(result))
+            else:
+                sent.append(self._check_result(payload, result.status_code, result.content))
+        return sent
 
 
-class SMSProvider(NotificationProvider):
+class SMSProvider(_HTTPBatchProvider):
     """SMS notification provider using Twilio"""
     
     def __init__(self, account_sid: str, auth_token: str, from_number: str):
+        super().__init__()
         self.account_sid = account_sid
         self.auth_token = auth_token
         self.from_number = from_number
         self.twilio_url = f"https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Messages.json"
+        # Basic auth encoded once rather than on every send
+        self.headers = urllib3.make_headers(basic_auth=f'{account_sid}:{auth_token}')
+        self.headers['Content-Type'] = 'application/x-www-form-urlencoded'
         self.logger = logging.getLogger(__name__)
     
-    def send(self, notification: Notification) -> bool:
+    def _form(self, notification: Notification) -> Optional[Dict[str, str]]:
+        phone_number = notification.metadata.get('phone_number')
+        if not phone_number:
+            self.logger.error("No phone number provided")
+            return None
+        
+        return {
+            'From': self.from_number,
+            'To': phone_number,
+            'Body': f"{notification.title}: {notification.message}"
+        }
+    
+    def _check_result(self, data: Dict[str, str], status: int, body: bytes) -> SendResult:
+        # Twilio only answers 2xx once the message is accepted (queued), so
+        # the body is read for the log on failure alone
+        if 200 <= status < 300:
+            self.logger.info(f"SMS sent to {data['To']}")
+            return SendResult.SENT
+        self.logger.error(f"Twilio error {status}: {body.decode(errors='replace')}")
+        return _status_result(status)
+    
+    def send(self, notification: Notification) -> SendResult:
         """Send SMS notification via Twilio"""
         try:
-            phone_number = notification.metadata.get('phone_number')
-            if not phone_number:
-                self.logger.error("No phone number provided")
-                return False
-            
-            auth = (self.account_sid, self.auth_token)
-            data = {
-                'From': self.from_number,
-                'To': phone_number,
-                'Body': f"{notification.title}: {notification.message}"
-            }
+            data = self._form(notification)
+            if data is None:
+                return SendResult.FAILED
             
-            response = requests.post(self.twilio_url, auth=auth, data=data)
-            response.raise_for_status()
-            
-            result = response.json()
-            if result.get('status') in ['queued', 'sent']:
-                self.logger.info(f"SMS sent to {phone_number}")
-                return True
-            else:
-                self.logger.error(f"Twilio error: {result}")
-                return False
-                
+            response = _POOL.request('POST', self.twilio_url, body=urlencode(data), headers=self.headers)
+            return self._check_result(data, response.status, response.data)
+        
+        except (urllib3.exceptions.HTTPError, OSError) as e:
+            self.logger.error(f"Failed to send SMS: {e}")
+            return SendResult.RETRY
         except Exception as e:
             self.logger.error(f"Failed to send SMS: {e}")
-            return False
+            return SendResult.FAILED
+    
+    def send_many(self, notifications: List[Notification]) -> List[SendResult]:
+        """Send a batch of SMS concurrently"""
+        if not HTTPX_AVAILABLE or len(notifications) < 2:
+            return super().send_many(notifications)
+        
+        forms = [self._form(notification) for notification in notifications]
+        ready = [data for data in forms if data is not None]
+        results = iter(self._post_batch(self.twilio_url, [urlencode(data) for data in ready]))
+        
+        sent = []
+        for data in forms:
+            if data is None:
+                sent.append(SendResult.FAILED)
+                continue
+            result = next(results)
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to send SMS: {result}")
+                sent.append(_exception_result(result))
+            else:
+                sent.append(self._check_result(data, result.status_code, result.content))
+        return sent
+
+
+@dataclass(frozen=True, slots=True)
+class NotificationConfig:
+    """Provider credentials, parsed once from the environment
+    
+    A channel is configured when its required values are set; SMTP_PORT
+    defaults to 587. Secrets are left out of the repr.
+    """
+    smtp_host: Optional[str] = None
+    smtp_port: int = 587
+    smtp_username: Optional[str] = None
+    smtp_password: Optional[str] = field(default=None, repr=False)
+    fcm_server_key: Optional[str] = field(default=None, repr=False)
+    twilio_account_sid: Optional[str] = None
+    twilio_auth_token: Optional[str] = field(default=None, repr=False)
+    twilio_from_number: Optional[str] = None
+    
+    @classmethod
+    def from_env(cls, environ=None) -> "NotificationConfig":
+        env = os.environ if environ is None else environ
+        return cls(
+            smtp_host=env.get('SMTP_HOST') or None,
+            smtp_port=int(env.get('SMTP_PORT') or 587),
+            smtp_username=env.get('SMTP_USERNAME') or None,
+            smtp_password=env.get('SMTP_PASSWORD') or None,
+            fcm_server_key=env.get('FCM_SERVER_KEY') or None,
+            twilio_account_sid=env.get('TWILIO_ACCOUNT_SID') or None,
+            twilio_auth_token=env.get('TWILIO_AUTH_TOKEN') or None,
+            twilio_from_number=env.get('TWILIO_FROM_NUMBER') or None
+        )
+    
+    @property
+    def email_configured(self) -> bool:
+        return bool(self.smtp_host and self.smtp_username and self.smtp_password)
+    
+    @property
+    def push_configured(self) -> bool:
+        return bool(self.fcm_server_key)
+    
+    @property
+    def sms_configured(self) -> bool:
+        return bool(self.twilio_account_sid and self.twilio_auth_token and self.twilio_from_number)
 
 
 class NotificationService:
     """Main notification service"""
     
-    def __init__(self):
+    def __init__(self, batch_size: int = 64, batch_timeout: float = 0.1, max_queued: int = 10000,
+                 max_stored: int = 10000, max_per_user: int = 500,
+                 max_attempts: int = 5, retry_base: float = 1.0,
+                 config: Optional[NotificationConfig] = None):
         self.providers = {}
+        self._provider_factories = {}
+        self._provider_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
-        self.notifications_db = {}  # In production, use proper database
+        # In production, use proper database. Until then the store is bounded:
+        # the oldest notifications are dropped past max_stored overall or
+        # max_per_user for one user, so a noisy user cannot evict everyone else
+        self.notifications_db: OrderedDict = OrderedDict()
+        self.max_stored = max_stored
+        self.max_per_user = max_per_user
+        # Each user's notifications in creation order, so reads skip the full scan
+        self._by_user: Dict[str, Deque[Notification]] = {}
+        # Ids per (user, status), kept in step with every status change so
+        # per-user counts such as unread_count never scan the store
+        self._by_user_status: Dict[Tuple[str, NotificationStatus], Set[str]] = {}
+        self._store_lock = threading.Lock()
+        
+        # Background sending for enqueue_notification; the worker starts on first use
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        # Threads for sending one message over several channels at once
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Sends a provider reports as RETRY are retried in the background
+        # after retry_base * 2**n seconds, up to max_attempts sends in all,
+        # before they are marked FAILED; any other failure is FAILED at once.
+        # The heap holds (next try, id) and an id is only queued again after
+        # its previous retry has run, so none is sent twice at once
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self._retry_heap: List[Tuple[float, str]] = []
+        self._retry_attempts: Dict[str, int] = {}
+        self._retry_cond = threading.Condition()
+        self._retrier = None
+        self._retry_stop = False
         
-        # Initialize providers based on environment variables
+        # Initialize providers from the given config, else the environment
+        self.config = config if config is not None else NotificationConfig.from_env()
         self._initialize_providers()
     
     def _initialize_providers(self):
-        """Initialize notification providers"""
+        """Register the notification providers the config enables
+        
+        Each provider, with its HTTP or SMTP session, is only built the
+        first time its type is sent.
+        """
+        cfg = self.config
         
         # Email provider
-        if all([
-            os.getenv('SMTP_HOST'),
-            os.getenv('SMTP_USERNAME'),
-            os.getenv('SMTP_PASSWORD')
-        ]):
-            self.providers[NotificationType.EMAIL] = EmailProvider(
-                smtp_host=os.getenv('SMTP_HOST'),
-                smtp_port=int(os.getenv('SMTP_PORT', '587')),
-                username=os.getenv('SMTP_USERNAME'),
-                password=os.getenv('SMTP_PASSWORD')
+        if cfg.email_configured:
+            self._provider_factories[NotificationType.EMAIL] = lambda: EmailProvider.shared(
+                smtp_host=cfg.smtp_host,
+                smtp_port=cfg.smtp_port,
+                username=cfg.smtp_username,
+                password=cfg.smtp_password
             )
         
         # Push notification provider
-        if os.getenv('FCM_SERVER_KEY'):
-            self.providers[NotificationType.PUSH] = PushNotificationProvider(
-                server_key=os.getenv('FCM_SERVER_KEY')
+        if cfg.push_configured:
+            self._provider_factories[NotificationType.PUSH] = lambda: PushNotificationProvider.shared(
+                server_key=cfg.fcm_server_key
             )
         
         # SMS provider
-        if all([
-            os.getenv('TWILIO_ACCOUNT_SID'),
-            os.getenv('TWILIO_AUTH_TOKEN'),
-            os.getenv('TWILIO_FROM_NUMBER')
-        ]):
-            self.providers[NotificationType.SMS] = SMSProvider(
-                account_sid=os.getenv('TWILIO_ACCOUNT_SID'),
-                auth_token=os.getenv('TWILIO_AUTH_TOKEN'),
-                from_number=os.getenv('TWILIO_FROM_NUMBER')
+        if cfg.sms_configured:
+            self._provider_factories[NotificationType.SMS] = lambda: SMSProvider.shared(
+                account_sid=cfg.twilio_account_sid,
+                auth_token=cfg.twilio_auth_token,
+                from_number=cfg.twilio_from_number
             )
     
+    def available_types(self) -> List[NotificationType]:
+        """Notification types that have a provider, built or not yet built"""
+        return [t for t in NotificationType if t in self.providers or t in self._provider_factories]
+    
+    def _provider(self, notification_type: NotificationType) -> Optional[NotificationProvider]:
+        """Provider for a type, built and cached on first use
+        
+        The factory is dropped only once its provider is built, so a build
+        that raises is tried again on the next send.
+        """
+        provider = self.providers.get(notification_type)
+        if provider is None:
+            with self._provider_lock:
+                provider = self.providers.get(notification_type)
+                factory = self._provider_factories.get(notification_type)
+                if provider is None and factory is not None:
+                    provider = self.providers[notification_type] = factory()
+                self._provider_factories.pop(notification_type, None)
+        return provider
+    
+    def close(self) -> None:
+        """Send anything still queued, then close provider connections
+        
+        Retries not yet due are abandoned and their notifications marked FAILED.
+        """
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(None)
+            worker.join(timeout=30)
+        with self._retry_cond:
+            self._retry_stop = True
+            retrier, self._retrier = self._retrier, None
+            self._retry_cond.notify()
+        if retrier is not None:
+            retrier.join(timeout=30)
+        with self._retry_cond:
+            abandoned = [notification_id for _, notification_id in self._retry_heap]
+            self._retry_heap.clear()
+            self._retry_attempts.clear()
+        for notification_id in abandoned:
+            notification = self.notifications_db.get(notification_id)
+            if notification is not None:
+                self._set_status(notification, NotificationStatus.FAILED)
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for provider in self.providers.values():
+            provider.close()
+    
     def send_notification(self, user_id: str, title: str, message: str,
                          notification_type: NotificationType = NotificationType.PUSH,
                          metadata: Dict[str, Any] = None) -> str:
         """Send notification to user"""
         
-        notification = Notification(
-            id=f"notif_{user_id}_{datetime.utcnow().timestamp()}",
-            user_id=user_id,
-            title=title,
-            message=message,
-            notification_type=notification_type,
-            metadata=metadata or {}
-        )
-        
-        # Store notification
-        self.notifications_db[notification.id] = notification
+        notification = self._create_notification(user_id, title, message, notification_type, metadata)
         
         # Send notification
-        provider = self.providers.get(notification_type)
+        provider = self._provider(notification_type)
         if not provider:
             self.logger.error(f"No provider available for {notification_type.value}")
-            notification.status = NotificationStatus.FAILED
+            self._set_status(notification, NotificationStatus.FAILED)
             return notification.id
         
-        success = provider.send(notification)
+        self._record_result(notification, provider.send(notification))
+        return notification.id
+    
+    def send_many(self, items: List[Dict[str, Any]]) -> List[str]:
+        """Send several notifications, batching each type through its provider
         
-        if success:
-            notification.status = NotificationStatus.SENT
-            notification.sent_at = datetime.utcnow()
-        else:
-            notification.status = NotificationStatus.FAILED
+        Each item holds the send_notification arguments (user_id, title,
+        message and optionally notification_type and metadata). Returns the
+        notification ids in item order.
+        """
+        notifications = [
+            self._create_notification(
+                item['user_id'], item['title'], item['message'],
+                item.get('notification_type', NotificationType.PUSH), item.get('metadata')
+            )
+            for item in items
+        ]
+        self._dispatch(notifications)
+        return [notification.id for notification in notifications]
+    
+    def enqueue_notification(self, user_id: str, title: str, message: str,
+                             notification_type: NotificationType = NotificationType.PUSH,
+                             metadata: Dict[str, Any] = None) -> str:
+        """Queue a notification for the background sender and return its id at once
         
+        The worker groups queued notifications into batches of up to
+        batch_size, waiting at most batch_timeout seconds to fill one. When
+        the queue is full the notification is sent on the caller's thread.
+        """
+        notification = self._create_notification(user_id, title, message, notification_type, metadata)
+        self._start_worker()
+        try:
+            self._queue.put_nowait(notification)
+        except queue.Full:
+            self.logger.warning("Notification queue full, sending inline")
+            self._dispatch([notification])
         return notification.id
     
-    def send_reminder_notification(self, reminder: Reminder, user: User) -> str:
-        """Send notification for a reminder"""
+    def _start_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._drain, name="notification-sender", daemon=True)
+                self._worker.start()
+    
+    def _drain(self) -> None:
+        """Worker loop: take whatever is queued, top up until the timeout, send"""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.batch_timeout
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                self.logger.error(f"Failed to send notification batch: {e}")
+            if stop:
+                return
+    
+    def _dispatch(self, notifications: List[Notification]) -> None:
+        """Send created notifications, one provider batch per type"""
+        by_type: Dict[NotificationType, List[Notification]] = {}
+        for notification in notifications:
+            by_type.setdefault(notification.notification_type, []).append(notification)
         
-        # Determine notification type
-        notification_type = NotificationType(reminder.notification_type)
+        for notification_type, batch in by_type.items():
+            provider = self._provider(notification_type)
+            if not provider:
+                self.logger.error(f"No provider available for {notification_type.value}")
+                for notification in batch:
+                    self._set_status(notification, NotificationStatus.FAILED)
+                continue
+            try:
+                results = provider.send_many(batch)
+            except Exception as e:
+                # A provider that raises instead of reporting a result still
+                # settles every notification rather than leaving it PENDING
+                self.logger.error(f"Failed to send {notification_type.value} batch: {e}")
+                results = [SendResult.FAILED] * len(batch)
+            for notification, result in zip(batch, results):
+                self._record_result(notification, result)
+    
+    def _create_notification(self, user_id: str, title: str, message: str,
+                             notification_type: NotificationType,
+                             metadata: Optional[Dict[str, Any]]) -> Notification:
+        notification = Notification(
+            id=f"notif_{user_id}_{time.time_ns():x}_{_ID_NODE}{next(_ID_SEQUENCE):x}",
+            user_id=user_id,
+            title=title,
+            message=message,
+            notification_type=notification_type,
+            metadata=metadata or {}
+        )
         
-        # Prepare metadata based on notification type
+        self._store(notification)
+        return notification
+    
+    def _store(self, notification: Notification) -> None:
+        with self._store_lock:
+            user_notifications = self._by_user.setdefault(notification.user_id, deque())
+            if len(user_notifications) >= self.max_per_user:
+                evicted = user_notifications.popleft()
+                self.notifications_db.pop(evicted.id, None)
+                self._unindex_status(evicted)
+            user_notifications.append(notification)
+            self.notifications_db[notification.id] = notification
+            self._by_user_status.setdefault((notification.user_id, notification.status), set()).add(notification.id)
+            
+            while len(self.notifications_db) > self.max_stored:
+                _, oldest = self.notifications_db.popitem(last=False)
+                self._unindex_status(oldest)
+                # The oldest overall is also the oldest of its user
+                owner = self._by_user[oldest.user_id]
+                if owner and owner[0] is oldest:
+                    owner.popleft()
+                if not owner:
+                    del self._by_user[oldest.user_id]
+    
+    def _unindex_status(self, notification: Notification) -> None:
+        key = (notification.user_id, notification.status)
+        ids = self._by_user_status.get(key)
+        if ids is not None:
+            ids.discard(notification.id)
+            if not ids:
+                del self._by_user_status[key]
+    
+    def _set_status(self, notification: Notification, status: NotificationStatus) -> None:
+        """Change a notification's status and move it in the status index"""
+        with self._store_lock:
+            stored = self.notifications_db.get(notification.id) is notification
+            if stored:
+                self._unindex_status(notification)
+            notification.status = status
+            if stored:
+                self._by_user_status.setdefault((notification.user_id, status), set()).add(notification.id)
+    
+    def _record_result(self, notification: Notification, result: SendResult) -> None:
+        if result is SendResult.SENT:
+            with self._retry_cond:
+                self._retry_attempts.pop(notification.id, None)
+            notification.sent_at = datetime.utcnow()
+            self._set_status(notification, NotificationStatus.SENT)
+        elif result is not SendResult.RETRY or not self._schedule_retry(notification):
+            with self._retry_cond:
+                self._retry_attempts.pop(notification.id, None)
+            self._set_status(notification, NotificationStatus.FAILED)
+    
+    def _schedule_retry(self, notification: Notification) -> bool:
+        """Queue a transient failure for another try; False once attempts run out
+        
+        The notification stays PENDING while a retry is queued.
+        """
+        with self._retry_cond:
+            if self._retry_stop:
+                return False
+            failures = self._retry_attempts.get(notification.id, 0) + 1
+            if failures >= self.max_attempts:
+                self._retry_attempts.pop(notification.id, None)
+                return False
+            self._retry_attempts[notification.id] = failures
+            next_try = time.monotonic() + self.retry_base * 2 ** (failures - 1)
+            heapq.heappush(self._retry_heap, (next_try, notification.id))
+            if self._retrier is None:
+                self._retrier = threading.Thread(target=self._retry_loop, name="notification-retry", daemon=True)
+                self._retrier.start()
+            self._retry_cond.notify()
+        self.logger.warning(f"Send of {notification.id} failed, retry {failures} queued")
+        return True
+    
+    def _retry_loop(self) -> None:
+        """Retry thread: wait for the earliest due entry, resend everything due"""
+        while True:
+            with self._retry_cond:
+                while not self._retry_stop:
+                    if self._retry_heap:
+                        wait = self._retry_heap[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._retry_cond.wait(wait)
+                    else:
+                        self._retry_cond.wait()
+                if self._retry_stop:
+                    return
+                now = time.monotonic()
+                due = []
+                while self._retry_heap and self._retry_heap[0][0] <= now:
+                    due.append(heapq.heappop(self._retry_heap)[1])
+                # Anything evicted from the store meanwhile is not retried
+                notifications = []
+                for notification_id in due:
+                    notification = self.notifications_db.get(notification_id)
+                    if notification is None:
+                        self._retry_attempts.pop(notification_id, None)
+                    else:
+                        notifications.append(notification)
+            
+            try:
+                self._dispatch(notifications)
+            except Exception as e:
+                self.logger.error(f"Failed to retry notification batch: {e}")
+    
+    def _channel_metadata(self, notification_type: NotificationType, user: User) -> Dict[str, Any]:
+        """Delivery address for a user on one channel"""
         metadata = {}
         if notification_type == NotificationType.EMAIL:
             metadata['email'] = user.email
@@ -284,31 +945,53 @@ class NotificationService:
         elif notification_type == NotificationType.SMS:
             # TODO: Get phone number from user preferences
             metadata['phone_number'] = user.metadata.get('phone_number', '')
+        return metadata
+    
+    def send_reminder_notification(self, reminder: Reminder, user: User) -> str:
+        """Send notification for a reminder"""
+        
+        # Determine notification type
+        notification_type = NotificationType(reminder.notification_type)
         
         return self.send_notification(
             user_id=user.id,
             title="Assignment Reminder",
             message=reminder.message,
             notification_type=notification_type,
-            metadata=metadata
+            metadata=self._channel_metadata(notification_type, user)
         )
     
+    def send_reminder_channels(self, reminder: Reminder, user: User,
+                               channels: List[NotificationType]) -> List[str]:
+        """Send a reminder over several channels at once
+        
+        Each channel is an independent network call, so they run on a thread
+        pool and the whole send takes as long as the slowest channel rather
+        than the sum. Returns the notification ids in channel order.
+        """
+        sends = [
+            dict(user_id=user.id, title="Assignment Reminder", message=reminder.message,
+                 notification_type=notification_type,
+                 metadata=self._channel_metadata(notification_type, user))
+            for notification_type in channels
+        ]
+        if len(sends) < 2:
+            return [self.send_notification(**kwargs) for kwargs in sends]
+        
+        if self._executor is None:
+            with self._worker_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="notification-channel")
+        
+        futures = [self._executor.submit(self.send_notification, **kwargs) for kwargs in sends]
+        return [future.result() for future in futures]
+    
     def send_assignment_alert(self, user_id: str, assignment_name: str, 
                             hours_until_due: int, notification_type: NotificationType = NotificationType.PUSH) -> str:
         """Send assignment due date alert"""
         
-        if hours_until_due <= 0:
-            title = "Assignment Overdue"
-            message = f"{assignment_name} is now overdue. Please submit as soon as possible."
-        elif hours_until_due <= 1:
-            title = "Assignment Due Soon"
-            message = f"{assignment_name} is due in less than 1 hour!"
-        elif hours_until_due <= 24:
-            title = "Assignment Due Tomorrow"
-            message = f"{assignment_name} is due in {hours_until_due} hours."
-        else:
-            title = "Assignment Reminder"
-            message = f"{assignment_name} is due in {hours_until_due} hours."
+        title, template = _ALERTS[bisect.bisect_left(_ALERT_LIMITS, hours_until_due)]
+        message = template.format_map({'name': assignment_name, 'hours': hours_until_due})
         
         return self.send_notification(
             user_id=user_id,
@@ -337,22 +1020,26 @@ class NotificationService:
         """Mark notification as read"""
         notification = self.notifications_db.get(notification_id)
         if notification:
-            notification.status = NotificationStatus.READ
             notification.read_at = datetime.utcnow()
+            self._set_status(notification, NotificationStatus.READ)
             return True
         return False
     
+    def count_by_status(self, user_id: str, status: NotificationStatus) -> int:
+        """Number of a user's stored notifications in one status"""
+        return len(self._by_user_status.get((user_id, status), ()))
+    
+    def unread_count(self, user_id: str) -> int:
+        """Notifications sent to a user and not yet read, for an inbox badge"""
+        return self.count_by_status(user_id, NotificationStatus.SENT)
+    
     def get_user_notifications(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get notifications for a user"""
-        user_notifications = [
-            notif for notif in self.notifications_db.values()
-            if notif.user_id == user_id
-        ]
-        
-        # Sort by creation time (newest first)
-        user_notifications.sort(key=lambda x: x.created_at, reverse=True)
-        
-        return [notif.__dict__ for notif in user_notifications[:limit]]
+        if limit <= 0:
+            return []
+        # Newest first: the index is already in creation order
+        user_notifications = self._by_user.get(user_id, ())
+        return [notif.to_dict() for notif in itertools.islice(reversed(user_notifications), limit)]
 
 
 # Example usage
@@ -361,10 +1048,10 @@ if __name__ == "__main__":
     service = NotificationService()
     
     print("✅ Notification service initialized")
-    print(f"Available providers: {list(service.providers.keys())}")
+    print(f"Available providers: {service.available_types()}")
     
     # Test notification (if providers are configured)
-    if service.providers:
+    if service.available_types():
         notification_id = service.send_notification(
             user_id="test_user",
             title="Test Notification",
@@ -6,17 +6,25 @@ Handles periodic synchronization of Canvas data with local database
 import os
 import json
 import time
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Set
+import random
+import hashlib
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Set, Deque
+from collections import OrderedDict, deque
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 import logging
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import httpx
 
 from auth.auth_service import CanvasAuthService, User
-from canvas.canvas_client import CanvasAPIClient, CanvasAPIError
-from models.data_models import Course, Assignment, Submission, DatabaseInterface
+from canvas.canvas_client import AsyncCanvasClient, CanvasAPIError
+from models.data_models import Course, Assignment, AssignmentStatus, Submission, DatabaseInterface
 
 
 class SyncStatus(Enum):
@@ -26,7 +34,7 @@ class SyncStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class SyncJob:
     """Sync job data model"""
     id: str
@@ -45,15 +53,144 @@ class SyncJob:
             self.metadata = {}
 
 
+# Canvas statuses worth retrying: throttling and transient server errors
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+# Sync types accepted by trigger_sync, mapped to the coroutine they start
+_SYNC_DISPATCH = {
+    'full': lambda service, user_id: service.sync_user_full(user_id),
+    'courses': lambda service, user_id: service.sync_user_courses(user_id, force_refresh=True),
+}
+
+# Process-wide job sequence; unlike a timestamp it never repeats
+_job_seq = itertools.count(1)
+
+
+def _utcnow() -> datetime:
+    """Current time as an aware UTC datetime, comparable with parsed Canvas times"""
+    return datetime.now(timezone.utc)
+
+
+# Canvas timestamps are ISO 8601 with a trailing Z, which fromisoformat
+# accepts directly from Python 3.11 without rewriting the string first
+_parse_dt = datetime.fromisoformat
+
+
+# SyncJob fields that _update_sync_job may set; anything else is ignored
+_JOB_UPDATE_FIELDS = frozenset({
+    'status', 'started_at', 'completed_at', 'error_message', 'items_processed', 'items_total', 'metadata'
+})
+
+
+def _row_digest(data: Dict[str, Any]) -> str:
+    """Short checksum of a Canvas item, to tell whether it changed since last sync"""
+    encoded = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+def _parse_assignments(rows: List[Dict[str, Any]], course_id: str) -> List[tuple]:
+    """(Assignment, None) or (None, error message) per Canvas assignment item
+    
+    Module level so a worker process can run it on a large course.
+    """
+    parsed = []
+    for assignment_data in rows:
+        try:
+            assignment = Assignment(
+                id=f"assign_{assignment_data['id']}",
+                canvas_assignment_id=str(assignment_data['id']),
+                course_id=course_id,
+                name=assignment_data['name'],
+                description=assignment_data.get('description'),
+                points_possible=assignment_data.get('points_possible'),
+                grading_type=assignment_data.get('grading_type', 'points'),
+                submission_types=assignment_data.get('submission_types', []),
+                allowed_extensions=assignment_data.get('allowed_extensions', []),
+                status=AssignmentStatus.from_workflow_state(
+                    assignment_data.get('workflow_state', 'published'))
+            )
+            
+            # Parse dates
+            if value := assignment_data.get('due_at'):
+                assignment.due_at = _parse_dt(value)
+            if value := assignment_data.get('lock_at'):
+                assignment.lock_at = _parse_dt(value)
+            if value := assignment_data.get('unlock_at'):
+                assignment.unlock_at = _parse_dt(value)
+            
+            parsed.append((assignment, None))
+        except Exception as e:
+            parsed.append((None, str(e)))
+    return parsed
+
+
+async def _collect_pages(pages) -> Optional[List[Dict[str, Any]]]:
+    """Every item of a paged listing, or None if it was not modified"""
+    items = None
+    async for page in pages:
+        if items is None:
+            items = []
+        items.extend(page)
+    return items
+
+
+class _TokenBucket:
+    """Async limiter allowing `rate` acquisitions per `per` seconds
+    
+    Up to `rate` may go at once after an idle spell; after that they are
+    spaced evenly. Used from one event loop, so it needs no lock.
+    """
+    
+    def __init__(self, rate: float, per: float = 1.0):
+        self.capacity = rate
+        self.fill_rate = rate / per
+        self.tokens = rate
+        self.updated = time.monotonic()
+    
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.fill_rate)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+
 class CanvasSyncService:
-    """Canvas data synchronization service"""
+    """Canvas data synchronization service
+    
+    Syncs are coroutines run on one event loop owned by the service, on its
+    own thread. Canvas calls are awaited over a shared httpx client, so
+    concurrent user syncs cost a task each rather than a thread each.
+    Synchronous callers such as Flask handlers go through trigger_sync.
+    """
     
     def __init__(self, auth_service: CanvasAuthService, database: DatabaseInterface):
         self.auth_service = auth_service
         self.database = database
         self.logger = logging.getLogger(__name__)
-        self.sync_jobs = {}  # In production, use proper database
-        self.running_syncs = set()
+        # In production, use proper database. Until then jobs are kept in
+        # creation order and the oldest dropped past max_jobs, or once finished
+        # for longer than job_ttl seconds
+        self.sync_jobs: OrderedDict = OrderedDict()
+        self.max_jobs = int(os.getenv('SYNC_JOBS_MAX', '10000'))
+        self.job_ttl = int(os.getenv('SYNC_JOB_TTL', str(24 * 60 * 60)))
+        # Each user's latest jobs in creation order, so history reads skip the scan
+        self.max_history_per_user = 100
+        self._jobs_by_user: Dict[str, Deque[SyncJob]] = {}
+        # One lock per user: a course sync holds it, so checking for a running
+        # sync and claiming the user is a single step on the event loop
+        self._user_locks: Dict[str, asyncio.Lock] = {}
         
         # Sync configuration
         self.sync_interval = int(os.getenv('SYNC_INTERVAL_MINUTES', '15')) * 60  # Convert to seconds
@@ -62,104 +199,341 @@ class CanvasSyncService:
         
         # Cache configuration
         self.cache_ttl = int(os.getenv('CACHE_TTL_MINUTES', '30')) * 60
+        self.max_cached = 1024
+        # Canvas responses by (base_url, user, resource): (time fetched, data)
+        # in least recently used order. Canvas tailors listings to the caller
+        # (due date overrides, section visibility, locked items), so no entry
+        # is shared between users
+        self._resp_cache: OrderedDict = OrderedDict()
+        # Fetches under way by the same key, so one user's concurrent callers share one
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        
+        # Change detection, so a sync only writes what Canvas changed: ETag and
+        # Last-Modified per (user, resource) for conditional requests, and a
+        # checksum per saved row id
+        self._validators: Dict[tuple, Dict[str, str]] = {}
+        self._row_hashes: Dict[str, str] = {}
+        # Worker processes for parsing large assignment lists, started on first
+        # use; smaller lists parse inline, where pickling would cost more. At
+        # most parse_workers, so parsing leaves cores for the web and sync threads
+        self.parse_offload_min = 200
+        self.parse_workers = min(4, os.cpu_count() or 1)
+        self._cpu_pool: Optional[ProcessPoolExecutor] = None
         
-        # Start background sync thread
-        self.sync_thread = threading.Thread(target=self._background_sync, daemon=True)
+        # Canvas clients by user id, with the encrypted token each was built from
+        self.canvas_base_url = os.getenv('CANVAS_BASE_URL')
+        self._client_cache: Dict[str, tuple] = {}
+        
+        # Event loop for every sync, with the HTTP client its requests share.
+        # Idle connections to Canvas stay open for 30s, so back-to-back calls
+        # skip the TCP and TLS handshakes
+        self._http = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=32, keepalive_expiry=30)
+        )
+        self._sync_semaphore = asyncio.Semaphore(self.max_concurrent_syncs)
+        # Every Canvas call, across all users, is capped both in flight and per
+        # second, so fan-out throttles here rather than meeting 403/429s
+        self._api_sem = asyncio.Semaphore(int(os.getenv('CANVAS_MAX_INFLIGHT', '20')))
+        self._rate_limiter = _TokenBucket(rate=float(os.getenv('CANVAS_RPS', '10')), per=1.0)
+        self._background_task: Optional[asyncio.Task] = None
+        self._loop = asyncio.new_event_loop()
+        self.sync_thread = threading.Thread(target=self._loop.run_forever, name="canvas-sync", daemon=True)
         self.sync_thread.start()
+        
+        # Start periodic background sync
+        self._run(self.start())
+    
+    def _run(self, coro) -> Any:
+        """Run a coroutine on the service loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    async def start(self) -> None:
+        """Schedule the periodic background sync on the running loop"""
+        if self._background_task is None:
+            self._background_task = asyncio.create_task(self._background_sync())
+    
+    async def _call_canvas(self, fetch):
+        """Await one Canvas request inside the global concurrency and rate caps
+        
+        Throttled and 5xx answers are retried; each attempt takes its own
+        slot and token, and the backoff sleep holds neither.
+        """
+        async def limited():
+            async with self._api_sem, self._rate_limiter:
+                return await fetch()
+        return await self._with_retry(limited)
+    
+    async def _with_retry(self, coro_fn, *, max_attempts: int = 3, base: float = 0.5, cap: float = 8.0):
+        """Await coro_fn(), retrying 429/5xx CanvasAPIErrors with exponential backoff
+        
+        Waits as long as a Retry-After header asks, else min(cap, base * 2**n)
+        plus a little jitter. Other errors and the last failure propagate.
+        """
+        for attempt in range(max_attempts):
+            try:
+                return await coro_fn()
+            except CanvasAPIError as e:
+                if e.status_code not in _RETRY_STATUSES or attempt == max_attempts - 1:
+                    raise
+                delay = e.retry_after if e.retry_after is not None else min(cap, base * 2 ** attempt) + random.random() * 0.1
+                self.logger.warning(f"Canvas returned {e.status_code}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    async def aclose(self) -> None:
+        """Stop the background sync and close pooled Canvas connections"""
+        task, self._background_task = self._background_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self._http.aclose()
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown(wait=False, cancel_futures=True)
+            self._cpu_pool = None
+    
+    def close(self) -> None:
+        """Blocking aclose for synchronous callers; also stops the service loop"""
+        if self._loop.is_closed():
+            return
+        self._run(self.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self.sync_thread.join(timeout=30)
+        self._loop.close()
+    
+    async def _cached_fetch(self, key: tuple, coro_fn, force_refresh: bool = False):
+        """Return a fresh cached response for key, else await coro_fn and cache it
+        
+        Entries live for cache_ttl, but never longer than one sync interval,
+        so each background cycle still sees current data. A None result (not
+        modified) is passed through uncached.
+        """
+        ttl = min(self.cache_ttl, self.sync_interval)
+        if not force_refresh:
+            entry = self._resp_cache.get(key)
+            if entry is not None:
+                fetched_at, data = entry
+                if time.monotonic() - fetched_at < ttl:
+                    self._resp_cache.move_to_end(key)
+                    return data
+                del self._resp_cache[key]
+        
+        data = await self._single_flight(key, coro_fn)
+        if data is not None:
+            self._resp_cache[key] = (time.monotonic(), data)
+            self._resp_cache.move_to_end(key)
+            while len(self._resp_cache) > self.max_cached:
+                self._resp_cache.popitem(last=False)
+        return data
     
-    def _get_canvas_client(self, user: User) -> CanvasAPIClient:
-        """Get Canvas client for user"""
+    async def _single_flight(self, key: tuple, coro_fn):
+        """Await coro_fn(), or the same-key fetch another caller already started
+        
+        When a user's manual and background syncs reach one course together,
+        they wait on a single Canvas request. Each waiter is shielded, so one
+        being cancelled does not cancel the fetch for the rest.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(coro_fn())
+            self._inflight[key] = future
+            future.add_done_callback(
+                lambda done: self._inflight.pop(key, None) if self._inflight.get(key) is done else None
+            )
+        return await asyncio.shield(future)
+    
+    def _get_canvas_client(self, user: User) -> AsyncCanvasClient:
+        """Get Canvas client for user
+        
+        The client only carries the user's Authorization header; requests go
+        over the service's pooled connections. It is kept per user and reused
+        until the stored (encrypted) token changes, so the token is decrypted
+        once per refresh rather than once per sync.
+        """
+        cached = self._client_cache.get(user.id)
+        if cached is not None and cached[0] == user.access_token:
+            return cached[1]
+        
         access_token = self.auth_service.token_manager.decrypt_token(user.access_token)
-        return CanvasAPIClient(
-            base_url=os.getenv('CANVAS_BASE_URL'),
-            access_token=access_token
+        client = AsyncCanvasClient(
+            base_url=self.canvas_base_url,
+            access_token=access_token,
+            http=self._http
         )
+        self._client_cache[user.id] = (user.access_token, client)
+        return client
     
     def _create_sync_job(self, user_id: str, sync_type: str, metadata: Dict[str, Any] = None) -> SyncJob:
         """Create a new sync job"""
         job = SyncJob(
-            id=f"sync_{user_id}_{sync_type}_{datetime.utcnow().timestamp()}",
+            id=f"sync_{user_id}_{sync_type}_{next(_job_seq)}",
             user_id=user_id,
             sync_type=sync_type,
             metadata=metadata or {}
         )
         self.sync_jobs[job.id] = job
+        self._jobs_by_user.setdefault(user_id, deque(maxlen=self.max_history_per_user)).append(job)
+        self._evict_old_jobs()
         return job
     
+    def _evict_old_jobs(self) -> None:
+        """Drop jobs from the oldest end while over max_jobs or past job_ttl
+        
+        Only the front is checked, so a long-running old job briefly shields
+        newer expired ones behind it; they go once it finishes and expires.
+        """
+        expired_before = _utcnow() - timedelta(seconds=self.job_ttl)
+        while self.sync_jobs:
+            oldest = next(iter(self.sync_jobs.values()))
+            if len(self.sync_jobs) <= self.max_jobs and not (
+                    oldest.completed_at is not None and oldest.completed_at < expired_before):
+                break
+            self.sync_jobs.popitem(last=False)
+            # The oldest job overall is also the oldest of its user
+            user_jobs = self._jobs_by_user.get(oldest.user_id)
+            if user_jobs and user_jobs[0] is oldest:
+                user_jobs.popleft()
+            if not user_jobs:
+                self._jobs_by_user.pop(oldest.user_id, None)
+    
+    def _flush(self, job: SyncJob, save_bulk, pending: List[Any], digests: List[str],
+               synced: int, kind: str) -> int:
+        """Write pending rows in one bulk save and return the new synced count
+        
+        Rows and their checksums are kept in parallel lists, so the rows go to
+        save_bulk as they are, with no per-flush unpacking; both lists are
+        reused for the next batch, so save_bulk must not keep a reference.
+        Progress is recorded once per flush rather than once per item, and
+        checksums only once their rows are saved. A batch save_bulk reports
+        as failed, even in part, counts for neither: its rows are written
+        again on the next sync.
+        """
+        if not pending:
+            return synced
+        try:
+            if save_bulk(pending):
+                synced += len(pending)
+                self._row_hashes.update(zip([row.id for row in pending], digests))
+                # Progress is a plain counter; no need for the generic update path
+                job.items_processed = synced
+            else:
+                self.logger.error(f"Failed to save some of {len(pending)} {kind}")
+        except Exception as e:
+            self.logger.error(f"Failed to save {len(pending)} {kind}: {e}")
+        pending.clear()
+        digests.clear()
+        return synced
+    
+    def _finish_unchanged(self, job: SyncJob, what: str) -> str:
+        """Complete a job whose resource Canvas reported as not modified"""
+        self._update_sync_job(job.id, status=SyncStatus.COMPLETED, completed_at=_utcnow())
+        self.logger.info(f"{what} unchanged since last sync")
+        return job.id
+    
     def _update_sync_job(self, job_id: str, **updates):
         """Update sync job status"""
-        if job_id in self.sync_jobs:
-            job = self.sync_jobs[job_id]
+        job = self.sync_jobs.get(job_id)
+        if job is not None:
             for key, value in updates.items():
-                if hasattr(job, key):
+                if key in _JOB_UPDATE_FIELDS:
                     setattr(job, key, value)
     
-    def sync_user_courses(self, user_id: str, force_refresh: bool = False) -> str:
+    def _is_syncing(self, user_id: str) -> bool:
+        lock = self._user_locks.get(user_id)
+        return lock is not None and lock.locked()
+    
+    async def sync_user_courses(self, user_id: str, force_refresh: bool = False) -> str:
         """Sync courses for a user"""
         user = self.auth_service.get_user(user_id)
         if not user:
             raise ValueError(f"User {user_id} not found")
         
-        if not force_refresh and user_id in self.running_syncs:
+        lock = self._user_locks.setdefault(user_id, asyncio.Lock())
+        if not force_refresh and lock.locked():
             self.logger.warning(f"Sync already running for user {user_id}")
             return None
         
+        # A forced sync waits for a running one rather than overlapping it
+        async with lock:
+            return await self._sync_courses(user)
+    
+    async def _sync_courses(self, user: User) -> str:
+        user_id = user.id
         job = self._create_sync_job(user_id, 'courses')
-        self.running_syncs.add(user_id)
         
         try:
-            self._update_sync_job(job.id, status=SyncStatus.RUNNING, started_at=datetime.utcnow())
+            self._update_sync_job(job.id, status=SyncStatus.RUNNING, started_at=_utcnow())
             
             client = self._get_canvas_client(user)
-            courses_data = client.get_courses()
-            
-            self._update_sync_job(job.id, items_total=len(courses_data))
-            
+            validators = self._validators.setdefault((user_id, 'courses'), {})
             courses_synced = 0
-            for course_data in courses_data:
-                try:
-                    course = Course(
-                        id=f"course_{course_data['id']}",
-                        canvas_course_id=str(course_data['id']),
-                        name=course_data['name'],
-                        course_code=course_data.get('course_code', ''),
-                        description=course_data.get('description'),
-                        workflow_state=course_data.get('workflow_state', 'available')
-                    )
-                    
-                    # Parse dates
-                    if course_data.get('start_at'):
-                        course.start_at = datetime.fromisoformat(course_data['start_at'].replace('Z', '+00:00'))
-                    if course_data.get('end_at'):
-                        course.end_at = datetime.fromisoformat(course_data['end_at'].replace('Z', '+00:00'))
-                    
-                    self.database.save_course(course)
-                    courses_synced += 1
-                    
-                    self._update_sync_job(job.id, items_processed=courses_synced)
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to sync course {course_data.get('id')}: {e}")
+            unchanged = 0
+            seen = 0
+            modified = False
+            pending = []
+            digests = []
+            # Rows are parsed and saved page by page while later pages download
+            async for page in client.iter_courses(validators=validators, call=self._call_canvas):
+                modified = True
+                seen += len(page)
+                for course_data in page:
+                    try:
+                        row_id = f"course_{course_data['id']}"
+                        digest = _row_digest(course_data)
+                        if self._row_hashes.get(row_id) == digest:
+                            unchanged += 1
+                            continue
+                        
+                        course = Course(
+                            id=row_id,
+                            canvas_course_id=str(course_data['id']),
+                            name=course_data['name'],
+                            course_code=course_data.get('course_code', ''),
+                            description=course_data.get('description'),
+                            workflow_state=course_data.get('workflow_state', 'available')
+                        )
+                        
+                        # Parse dates
+                        if value := course_data.get('start_at'):
+                            course.start_at = _parse_dt(value)
+                        if value := course_data.get('end_at'):
+                            course.end_at = _parse_dt(value)
+                        
+                        pending.append(course)
+                        digests.append(digest)
+                        if len(pending) >= self.batch_size:
+                            courses_synced = self._flush(job, self.database.save_courses_bulk, pending, digests, courses_synced, 'courses')
+                        
+                    except Exception as e:
+                        self.logger.error(f"Failed to sync course {course_data.get('id')}: {e}")
+            
+            courses_synced = self._flush(job, self.database.save_courses_bulk, pending, digests, courses_synced, 'courses')
+            if not modified:
+                return self._finish_unchanged(job, f"Courses for user {user_id}")
+            self._update_sync_job(job.id, items_total=seen)
+            if courses_synced + unchanged < seen:
+                # Something was not saved: fetch in full next time to retry it
+                self._validators.pop((user_id, 'courses'), None)
             
             self._update_sync_job(job.id, 
                                 status=SyncStatus.COMPLETED,
-                                completed_at=datetime.utcnow(),
-                                items_processed=courses_synced)
+                                completed_at=_utcnow(),
+                                items_processed=courses_synced + unchanged)
             
-            self.logger.info(f"Synced {courses_synced} courses for user {user_id}")
+            self.logger.info(f"Synced {courses_synced} courses for user {user_id} ({unchanged} unchanged)")
             return job.id
             
         except Exception as e:
             self._update_sync_job(job.id,
                                 status=SyncStatus.FAILED,
                                 error_message=str(e),
-                                completed_at=datetime.utcnow())
+                                completed_at=_utcnow())
             self.logger.error(f"Course sync failed for user {user_id}: {e}")
             raise
-        finally:
-            self.running_syncs.discard(user_id)
     
-    def sync_course_assignments(self, user_id: str, course_id: str, force_refresh: bool = False) -> str:
+    async def sync_course_assignments(self, user_id: str, course_id: str, force_refresh: bool = False) -> str:
         """Sync assignments for a course"""
         user = self.auth_service.get_user(user_id)
         if not user:
@@ -168,62 +542,88 @@ class CanvasSyncService:
         job = self._create_sync_job(user_id, 'assignments', {'course_id': course_id})
         
         try:
-            self._update_sync_job(job.id, status=SyncStatus.RUNNING, started_at=datetime.utcnow())
+            self._update_sync_job(job.id, status=SyncStatus.RUNNING, started_at=_utcnow())
             
             client = self._get_canvas_client(user)
-            assignments_data = client.get_assignments(course_id)
+            validators = self._validators.setdefault((user_id, 'assignments', course_id), {})
+            # The list is held in full for the cache, unlike courses and
+            # submissions; it is keyed by user, since each student's differs
+            assignments_data = await self._cached_fetch(
+                (client.base_url, user_id, f'courses/{course_id}/assignments'),
+                lambda: _collect_pages(client.iter_assignments(course_id, validators, self._call_canvas)),
+                force_refresh
+            )
+            if assignments_data is None:
+                return self._finish_unchanged(job, f"Assignments for course {course_id}")
             
             self._update_sync_job(job.id, items_total=len(assignments_data))
             
             assignments_synced = 0
+            unchanged = 0
+            changed = []
+            changed_digests = []
             for assignment_data in assignments_data:
                 try:
-                    assignment = Assignment(
-                        id=f"assign_{assignment_data['id']}",
-                        canvas_assignment_id=str(assignment_data['id']),
-                        course_id=course_id,
-                        name=assignment_data['name'],
-                        description=assignment_data.get('description'),
-                        points_possible=assignment_data.get('points_possible'),
-                        grading_type=assignment_data.get('grading_type', 'points'),
-                        submission_types=assignment_data.get('submission_types', []),
-                        allowed_extensions=assignment_data.get('allowed_extensions', []),
-                        status=assignment_data.get('workflow_state', 'published')
-                    )
-                    
-                    # Parse dates
-                    if assignment_data.get('due_at'):
-                        assignment.due_at = datetime.fromisoformat(assignment_data['due_at'].replace('Z', '+00:00'))
-                    if assignment_data.get('lock_at'):
-                        assignment.lock_at = datetime.fromisoformat(assignment_data['lock_at'].replace('Z', '+00:00'))
-                    if assignment_data.get('unlock_at'):
-                        assignment.unlock_at = datetime.fromisoformat(assignment_data['unlock_at'].replace('Z', '+00:00'))
-                    
-                    self.database.save_assignment(assignment)
-                    assignments_synced += 1
-                    
-                    self._update_sync_job(job.id, items_processed=assignments_synced)
-                    
+                    digest = _row_digest(assignment_data)
+                    if self._row_hashes.get(f"assign_{assignment_data['id']}") == digest:
+                        unchanged += 1
+                        continue
+                    changed.append(assignment_data)
+                    changed_digests.append(digest)
                 except Exception as e:
                     self.logger.error(f"Failed to sync assignment {assignment_data.get('id')}: {e}")
             
+            parsed = await self._parse_assignment_rows(changed, course_id)
+            
+            pending = []
+            digests = []
+            for assignment_data, digest, (assignment, error) in zip(changed, changed_digests, parsed):
+                if error is not None:
+                    self.logger.error(f"Failed to sync assignment {assignment_data.get('id')}: {error}")
+                    continue
+                pending.append(assignment)
+                digests.append(digest)
+                if len(pending) >= self.batch_size:
+                    assignments_synced = self._flush(job, self.database.save_assignments_bulk, pending, digests, assignments_synced, 'assignments')
+            
+            assignments_synced = self._flush(job, self.database.save_assignments_bulk, pending, digests, assignments_synced, 'assignments')
+            if assignments_synced + unchanged < len(assignments_data):
+                # Something was not saved: fetch in full next time to retry it
+                self._validators.pop((user_id, 'assignments', course_id), None)
+            
             self._update_sync_job(job.id,
                                 status=SyncStatus.COMPLETED,
-                                completed_at=datetime.utcnow(),
-                                items_processed=assignments_synced)
+                                completed_at=_utcnow(),
+                                items_processed=assignments_synced + unchanged)
             
-            self.logger.info(f"Synced {assignments_synced} assignments for course {course_id}")
+            self.logger.info(f"Synced {assignments_synced} assignments for course {course_id} ({unchanged} unchanged)")
             return job.id
             
         except Exception as e:
             self._update_sync_job(job.id,
                                 status=SyncStatus.FAILED,
                                 error_message=str(e),
-                                completed_at=datetime.utcnow())
+                                completed_at=_utcnow())
             self.logger.error(f"Assignment sync failed for course {course_id}: {e}")
             raise
     
-    def sync_assignment_submissions(self, user_id: str, course_id: str, assignment_id: str) -> str:
+    async def _parse_assignment_rows(self, rows: List[Dict[str, Any]], course_id: str) -> List[tuple]:
+        """_parse_assignments, in a worker process once rows pass parse_offload_min"""
+        if len(rows) <= self.parse_offload_min:
+            return _parse_assignments(rows, course_id)
+        if self._cpu_pool is None:
+            # Workers come from a forkserver, not a fork of this process: by now
+            # it runs Flask, sync and notification threads, and a child forked
+            # while one of them holds a lock (logging's, say) can deadlock
+            self._cpu_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=multiprocessing.get_context('forkserver')
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._cpu_pool, _parse_assignments, rows, course_id
+        )
+    
+    async def sync_assignment_submissions(self, user_id: str, course_id: str, assignment_id: str) -> str:
         """Sync submissions for an assignment"""
         user = self.auth_service.get_user(user_id)
         if not user:
@@ -233,60 +633,80 @@ class CanvasSyncService:
                                   {'course_id': course_id, 'assignment_id': assignment_id})
         
         try:
-            self._update_sync_job(job.id, status=SyncStatus.RUNNING, started_at=datetime.utcnow())
+            self._update_sync_job(job.id, status=SyncStatus.RUNNING, started_at=_utcnow())
             
             client = self._get_canvas_client(user)
-            submissions_data = client.get_submissions(course_id, assignment_id)
-            
-            self._update_sync_job(job.id, items_total=len(submissions_data))
-            
+            validators = self._validators.setdefault((user_id, 'submissions', course_id, assignment_id), {})
             submissions_synced = 0
-            for submission_data in submissions_data:
-                try:
-                    submission = Submission(
-                        id=f"sub_{submission_data['id']}",
-                        canvas_submission_id=str(submission_data['id']),
-                        assignment_id=assignment_id,
-                        user_id=str(submission_data['user_id']),
-                        score=submission_data.get('score'),
-                        grade=submission_data.get('grade'),
-                        workflow_state=submission_data.get('workflow_state', 'unsubmitted'),
-                        late=submission_data.get('late', False),
-                        excused=submission_data.get('excused', False),
-                        attempt=submission_data.get('attempt', 0),
-                        body=submission_data.get('body'),
-                        url=submission_data.get('url'),
-                        attachments=submission_data.get('attachments', [])
-                    )
-                    
-                    if submission_data.get('submitted_at'):
-                        submission.submitted_at = datetime.fromisoformat(submission_data['submitted_at'].replace('Z', '+00:00'))
-                    
-                    self.database.save_submission(submission)
-                    submissions_synced += 1
-                    
-                    self._update_sync_job(job.id, items_processed=submissions_synced)
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to sync submission {submission_data.get('id')}: {e}")
+            unchanged = 0
+            seen = 0
+            modified = False
+            pending = []
+            digests = []
+            # Rows are parsed and saved page by page while later pages download
+            async for page in client.iter_submissions(course_id, assignment_id, validators, self._call_canvas):
+                modified = True
+                seen += len(page)
+                for submission_data in page:
+                    try:
+                        row_id = f"sub_{submission_data['id']}"
+                        digest = _row_digest(submission_data)
+                        if self._row_hashes.get(row_id) == digest:
+                            unchanged += 1
+                            continue
+                        
+                        submission = Submission(
+                            id=row_id,
+                            canvas_submission_id=str(submission_data['id']),
+                            assignment_id=assignment_id,
+                            user_id=str(submission_data['user_id']),
+                            score=submission_data.get('score'),
+                            grade=submission_data.get('grade'),
+                            workflow_state=submission_data.get('workflow_state', 'unsubmitted'),
+                            late=submission_data.get('late', False),
+                            excused=submission_data.get('excused', False),
+                            attempt=submission_data.get('attempt', 0),
+                            body=submission_data.get('body'),
+                            url=submission_data.get('url'),
+                            attachments=submission_data.get('attachments', [])
+                        )
+                        
+                        if value := submission_data.get('submitted_at'):
+                            submission.submitted_at = _parse_dt(value)
+                        
+                        pending.append(submission)
+                        digests.append(digest)
+                        if len(pending) >= self.batch_size:
+                            submissions_synced = self._flush(job, self.database.save_submissions_bulk, pending, digests, submissions_synced, 'submissions')
+                        
+                    except Exception as e:
+                        self.logger.error(f"Failed to sync submission {submission_data.get('id')}: {e}")
+            
+            submissions_synced = self._flush(job, self.database.save_submissions_bulk, pending, digests, submissions_synced, 'submissions')
+            if not modified:
+                return self._finish_unchanged(job, f"Submissions for assignment {assignment_id}")
+            self._update_sync_job(job.id, items_total=seen)
+            if submissions_synced + unchanged < seen:
+                # Something was not saved: fetch in full next time to retry it
+                self._validators.pop((user_id, 'submissions', course_id, assignment_id), None)
             
             self._update_sync_job(job.id,
                                 status=SyncStatus.COMPLETED,
-                                completed_at=datetime.utcnow(),
-                                items_processed=submissions_synced)
+                                completed_at=_utcnow(),
+                                items_processed=submissions_synced + unchanged)
             
-            self.logger.info(f"Synced {submissions_synced} submissions for assignment {assignment_id}")
+            self.logger.info(f"Synced {submissions_synced} submissions for assignment {assignment_id} ({unchanged} unchanged)")
             return job.id
             
         except Exception as e:
             self._update_sync_job(job.id,
                                 status=SyncStatus.FAILED,
                                 error_message=str(e),
-                                completed_at=datetime.utcnow())
+                                completed_at=_utcnow())
             self.logger.error(f"Submission sync failed for assignment {assignment_id}: {e}")
             raise
     
-    def sync_user_full(self, user_id: str) -> str:
+    async def sync_user_full(self, user_id: str) -> str:
         """Perform full sync for a user (courses, assignments, submissions)"""
         user = self.auth_service.get_user(user_id)
         if not user:
@@ -295,29 +715,32 @@ class CanvasSyncService:
         job = self._create_sync_job(user_id, 'full')
         
         try:
-            self._update_sync_job(job.id, status=SyncStatus.RUNNING, started_at=datetime.utcnow())
+            self._update_sync_job(job.id, status=SyncStatus.RUNNING, started_at=_utcnow())
             
             # Sync courses first
-            courses_job_id = self.sync_user_courses(user_id, force_refresh=True)
+            courses_job_id = await self.sync_user_courses(user_id, force_refresh=True)
             courses_job = self.sync_jobs.get(courses_job_id)
             
             if courses_job and courses_job.status == SyncStatus.COMPLETED:
                 # Get synced courses
                 courses = self.database.get_courses_for_user(user_id)
                 
-                # Sync assignments for each course
-                for course in courses:
-                    try:
-                        self.sync_course_assignments(user_id, course.canvas_course_id)
-                    except Exception as e:
-                        self.logger.error(f"Failed to sync assignments for course {course.id}: {e}")
+                # Sync assignments for every course at once; the API caps
+                # in _call_canvas keep the fan-out within Canvas' limits
+                results = await asyncio.gather(*(
+                    self.sync_course_assignments(user_id, course.canvas_course_id)
+                    for course in courses
+                ), return_exceptions=True)
+                for course, result in zip(courses, results):
+                    if isinstance(result, Exception):
+                        self.logger.error(f"Failed to sync assignments for course {course.id}: {result}")
                 
                 # TODO: Sync submissions for recent assignments
                 # This would be done in batches to avoid overwhelming the API
             
             self._update_sync_job(job.id,
                                 status=SyncStatus.COMPLETED,
-                                completed_at=datetime.utcnow())
+                                completed_at=_utcnow())
             
             self.logger.info(f"Full sync completed for user {user_id}")
             return job.id
@@ -326,59 +749,71 @@ class CanvasSyncService:
             self._update_sync_job(job.id,
                                 status=SyncStatus.FAILED,
                                 error_message=str(e),
-                                completed_at=datetime.utcnow())
+                                completed_at=_utcnow())
             self.logger.error(f"Full sync failed for user {user_id}: {e}")
             raise
     
-    def _background_sync(self):
-        """Background thread for periodic sync"""
+    async def _sync_user_limited(self, user_id: str) -> str:
+        async with self._sync_semaphore:
+            return await self.sync_user_courses(user_id)
+    
+    async def _background_sync(self):
+        """Background task for periodic sync
+        
+        Cycles start on a fixed monotonic schedule, so a slow cycle shortens
+        the wait before the next one rather than pushing every later one back.
+        A cycle that overruns a whole interval is followed by the next at once,
+        and the missed slots are skipped rather than run back to back.
+        """
+        next_deadline = time.monotonic()
         while True:
             try:
-                time.sleep(self.sync_interval)
+                next_deadline = max(next_deadline + self.sync_interval, time.monotonic())
+                await asyncio.sleep(next_deadline - time.monotonic())
                 
                 # Get all active users
                 active_users = [user for user in self.auth_service.users_db.values()
                               if self.auth_service.is_token_valid(user)]
                 
-                # Sync users in parallel (with limit)
-                with ThreadPoolExecutor(max_workers=self.max_concurrent_syncs) as executor:
-                    futures = []
-                    
-                    for user in active_users:
-                        if user.id not in self.running_syncs:
-                            future = executor.submit(self.sync_user_courses, user.id)
-                            futures.append(future)
-                    
-                    # Wait for completion
-                    for future in as_completed(futures):
-                        try:
-                            job_id = future.result()
-                            if job_id:
-                                self.logger.info(f"Background sync completed: {job_id}")
-                        except Exception as e:
-                            self.logger.error(f"Background sync failed: {e}")
+                # Sync users concurrently, at most max_concurrent_syncs at once
+                results = await asyncio.gather(*(
+                    self._sync_user_limited(user.id)
+                    for user in active_users if not self._is_syncing(user.id)
+                ), return_exceptions=True)
+                
+                for result in results:
+                    if isinstance(result, Exception):
+                        self.logger.error(f"Background sync failed: {result}")
+                    elif result:
+                        self.logger.info(f"Background sync completed: {result}")
                 
             except Exception as e:
-                self.logger.error(f"Background sync thread error: {e}")
+                self.logger.error(f"Background sync task error: {e}")
     
     def get_sync_status(self, job_id: str) -> Optional[SyncJob]:
         """Get sync job status"""
         return self.sync_jobs.get(job_id)
     
     def get_user_sync_history(self, user_id: str, limit: int = 10) -> List[SyncJob]:
-        """Get sync history for a user"""
-        user_jobs = [job for job in self.sync_jobs.values() if job.user_id == user_id]
-        user_jobs.sort(key=lambda x: x.started_at or datetime.min, reverse=True)
-        return user_jobs[:limit]
+        """Get sync history for a user, newest first
+        
+        Jobs start as they are created, so creation order stands in for the
+        start time the history used to be sorted by.
+        """
+        if limit <= 0:
+            return []
+        return list(itertools.islice(reversed(self._jobs_by_user.get(user_id, ())), limit))
     
     def trigger_sync(self, user_id: str, sync_type: str = 'courses') -> str:
-        """Manually trigger sync for a user"""
-        if sync_type == 'full':
-            return self.sync_user_full(user_id)
-        elif sync_type == 'courses':
-            return self.sync_user_courses(user_id, force_refresh=True)
-        else:
+        """Manually trigger sync for a user
+        
+        Safe to call from any thread: the sync runs on the service loop and
+        this blocks until it finishes.
+        """
+        start = _SYNC_DISPATCH.get(sync_type)
+        if start is None:
             raise ValueError(f"Unknown sync type: {sync_type}")
+        return self._run(start(self, user_id))
 
 
 # Example usage
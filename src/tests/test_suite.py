@@ -5,19 +5,164 @@ Provides comprehensive testing utilities for Canvas automation system
 
 import os
 import json
+import time
+import threading
 import unittest
 from datetime import datetime, timedelta
+from enum import Enum
 from typing import Dict, Any, List, Optional
 from unittest.mock import Mock, patch, MagicMock
 import tempfile
 import shutil
+from collections import ChainMap
 
 from auth.auth_service import CanvasAuthService, TokenManager, User, UserRole
 from canvas.canvas_client import CanvasAPIClient, CanvasAPIError
-from models.data_models import Course, Assignment, Submission, Reminder, FeedbackDraft
-from llm.llm_service import LLMService, GroqAdapter, LLMProvider
-from notifications.notification_service import NotificationService, NotificationType
-from sync.sync_service import CanvasSyncService
+from models.data_models import Course, Assignment, Submission, Reminder, FeedbackDraft, DatabaseInterface
+# The LLM, notification and sync services pull in large dependency trees,
+# so the test classes import them in setUpClass, only when they run
+
+
+# Canvas fixtures, built once at import. The MockCanvasData getters hand
+# out these shared objects, so a test that changes one must copy it first
+_NOW = datetime.utcnow()
+
+_USER_INFO = {
+    "id": 12345,
+    "name": "Test Student",
+    "email": "test@example.com",
+    "avatar_url": "https://example.com/avatar.jpg",
+    "locale": "en",
+    "time_zone": "America/New_York"
+}
+
+_COURSES = [
+    {
+        "id": 1001,
+        "name": "Introduction to Computer Science",
+        "course_code": "CS101",
+        "description": "Basic programming concepts",
+        "workflow_state": "available",
+        "start_at": "2024-01-15T00:00:00Z",
+        "end_at": "2024-05-15T23:59:59Z",
+        "enrollment_term_id": 1
+    },
+    {
+        "id": 1002,
+        "name": "Data Structures",
+        "course_code": "CS201",
+        "description": "Advanced data structures and algorithms",
+        "workflow_state": "available",
+        "start_at": "2024-01-15T00:00:00Z",
+        "end_at": "2024-05-15T23:59:59Z",
+        "enrollment_term_id": 1
+    }
+]
+
+_ASSIGNMENTS = [
+    {
+        "id": 2001,
+        "name": "Programming Assignment 1",
+        "description": "Write a simple calculator program",
+        "due_at": (_NOW + timedelta(days=7)).isoformat() + "Z",
+        "lock_at": (_NOW + timedelta(days=7, hours=1)).isoformat() + "Z",
+        "unlock_at": _NOW.isoformat() + "Z",
+        "points_possible": 100.0,
+        "grading_type": "points",
+        "submission_types": ["online_text_entry", "online_upload"],
+        "allowed_extensions": ["py", "java", "cpp"],
+        "workflow_state": "published"
+    },
+    {
+        "id": 2002,
+        "name": "Midterm Exam",
+        "description": "Comprehensive exam covering chapters 1-5",
+        "due_at": (_NOW + timedelta(days=14)).isoformat() + "Z",
+        "points_possible": 200.0,
+        "grading_type": "points",
+        "submission_types": ["online_quiz"],
+        "workflow_state": "published"
+    }
+]
+
+_SUBMISSIONS_BY_ASSIGNMENT: Dict[Any, List[Dict[str, Any]]] = {}
+
+# Response bodies for mocks of clients that parse response.content
+_USER_INFO_BODY = json.dumps(_USER_INFO).encode()
+_COURSES_BODY = json.dumps(_COURSES).encode()
+_ASSIGNMENTS_BODY = json.dumps(_ASSIGNMENTS).encode()
+
+
+def _json_response(payload: Any) -> Mock:
+    """Canned requests response whose json() returns payload"""
+    response = Mock()
+    response.json.return_value = payload
+    response.raise_for_status.return_value = None
+    return response
+
+
+# Canned OAuth and user info responses for patched requests.post/get,
+# built once and shared by the auth and integration tests
+_TOKEN_RESPONSE = _json_response({
+    'access_token': 'test_access_token',
+    'refresh_token': 'test_refresh_token',
+    'expires_in': 3600
+})
+_USER_INFO_RESPONSE = _json_response(_USER_INFO)
+
+# Fixed model fixtures; the reminder text does not depend on the clock
+_FIXED_DUE_AT = datetime(2024, 6, 1, 12, 0, 0)
+_FIXTURE_USER = User(
+    id="user_1",
+    canvas_user_id="456",
+    email="test@example.com",
+    name="Test Student",
+    role=UserRole.STUDENT,
+    access_token="dummy_token"
+)
+
+
+def _submissions(assignment_id) -> List[Dict[str, Any]]:
+    """Submissions fixture for one assignment, built once per id by MockCanvasData"""
+    return [
+        {
+            "id": 3001,
+            "assignment_id": assignment_id,
+            "user_id": 12345,
+            "submitted_at": (_NOW - timedelta(days=1)).isoformat() + "Z",
+            "score": 85.0,
+            "grade": "B",
+            "workflow_state": "submitted",
+            "late": False,
+            "excused": False,
+            "attempt": 1,
+            "body": "Here is my calculator implementation...",
+            "url": None,
+            "attachments": [
+                {
+                    "id": 4001,
+                    "filename": "calculator.py",
+                    "url": "https://example.com/files/calculator.py",
+                    "content_type": "text/x-python"
+                }
+            ]
+        },
+        {
+            "id": 3002,
+            "assignment_id": assignment_id,
+            "user_id": 12346,
+            "submitted_at": None,
+            "score": None,
+            "grade": None,
+            "workflow_state": "unsubmitted",
+            "late": False,
+            "excused": False,
+            "attempt": 0,
+            "body": None,
+            "url": None,
+            "attachments": []
+        }
+    ]
 
 
 class MockCanvasData:
@@ -25,157 +170,123 @@ class MockCanvasData:
     
     @staticmethod
     def get_user_info() -> Dict[str, Any]:
-        return {
-            "id": 12345,
-            "name": "Test Student",
-            "email": "test@example.com",
-            "avatar_url": "https://example.com/avatar.jpg",
-            "locale": "en",
-            "time_zone": "America/New_York"
-        }
+        return _USER_INFO
     
     @staticmethod
     def get_courses() -> List[Dict[str, Any]]:
-        return [
-            {
-                "id": 1001,
-                "name": "Introduction to Computer Science",
-                "course_code": "CS101",
-                "description": "Basic programming concepts",
-                "workflow_state": "available",
-                "start_at": "2024-01-15T00:00:00Z",
-                "end_at": "2024-05-15T23:59:59Z",
-                "enrollment_term_id": 1
-            },
-            {
-                "id": 1002,
-                "name": "Data Structures",
-                "course_code": "CS201",
-                "description": "Advanced data structures and algorithms",
-                "workflow_state": "available",
-                "start_at": "2024-01-15T00:00:00Z",
-                "end_at": "2024-05-15T23:59:59Z",
-                "enrollment_term_id": 1
-            }
-        ]
+        return _COURSES
     
     @staticmethod
     def get_assignments(course_id: int) -> List[Dict[str, Any]]:
-        return [
-            {
-                "id": 2001,
-                "name": "Programming Assignment 1",
-                "description": "Write a simple calculator program",
-                "due_at": (datetime.utcnow() + timedelta(days=7)).isoformat() + "Z",
-                "lock_at": (datetime.utcnow() + timedelta(days=7, hours=1)).isoformat() + "Z",
-                "unlock_at": datetime.utcnow().isoformat() + "Z",
-                "points_possible": 100.0,
-                "grading_type": "points",
-                "submission_types": ["online_text_entry", "online_upload"],
-                "allowed_extensions": ["py", "java", "cpp"],
-                "workflow_state": "published"
-            },
-            {
-                "id": 2002,
-                "name": "Midterm Exam",
-                "description": "Comprehensive exam covering chapters 1-5",
-                "due_at": (datetime.utcnow() + timedelta(days=14)).isoformat() + "Z",
-                "points_possible": 200.0,
-                "grading_type": "points",
-                "submission_types": ["online_quiz"],
-                "workflow_state": "published"
-            }
-        ]
+        return _ASSIGNMENTS
     
     @staticmethod
     def get_submissions(course_id: int, assignment_id: int) -> List[Dict[str, Any]]:
-        return [
-            {
-                "id": 3001,
-                "assignment_id": assignment_id,
-                "user_id": 12345,
-                "submitted_at": (datetime.utcnow() - timedelta(days=1)).isoformat() + "Z",
-                "score": 85.0,
-                "grade": "B",
-                "workflow_state": "submitted",
-                "late": False,
-                "excused": False,
-                "attempt": 1,
-                "body": "Here is my calculator implementation...",
-                "url": None,
-                "attachments": [
-                    {
-                        "id": 4001,
-                        "filename": "calculator.py",
-                        "url": "https://example.com/files/calculator.py",
-                        "content_type": "text/x-python"
-                    }
-                ]
-            },
-            {
-                "id": 3002,
-                "assignment_id": assignment_id,
-                "user_id": 12346,
-                "submitted_at": None,
-                "score": None,
-                "grade": None,
-                "workflow_state": "unsubmitted",
-                "late": False,
-                "excused": False,
-                "attempt": 0,
-                "body": None,
-                "url": None,
-                "attachments": []
-            }
-        ]
+        submissions = _SUBMISSIONS_BY_ASSIGNMENT.get(assignment_id)
+        if submissions is None:
+            submissions = _SUBMISSIONS_BY_ASSIGNMENT[assignment_id] = _submissions(assignment_id)
+        return submissions
+
+
+def mock_pages(items: List[Dict[str, Any]]):
+    """Stand-in for an AsyncCanvasClient iter_* method yielding one page"""
+    async def iter_pages(*args, **kwargs):
+        yield items
+    return iter_pages
+
+
+def _bucket(index: Dict[str, dict], key: str) -> dict:
+    """index[key] for writing; a bucket inherited from a baseline is copied up first"""
+    if isinstance(index, ChainMap):
+        own = index.maps[0]
+        if key not in own:
+            own[key] = dict(index.get(key, {}))
+        return own[key]
+    return index.setdefault(key, {})
 
 
-class MockDatabase:
-    """Mock database implementation for testing"""
+class MockDatabase(DatabaseInterface):
+    """Mock database implementation for testing
     
-    def __init__(self):
-        self.courses = {}
-        self.assignments = {}
-        self.submissions = {}
-        self.reminders = {}
-        self.feedback_drafts = {}
+    Given a baseline database, each table reads through to the baseline's
+    rows while writes land in a layer of its own, so tests can share one
+    populated baseline without seeing each other's changes.
+    """
+    
+    def __init__(self, baseline: Optional['MockDatabase'] = None):
+        def layer(table):
+            return ChainMap({}, getattr(baseline, table)) if baseline is not None else {}
+        
+        self.courses = layer('courses')
+        self.assignments = layer('assignments')
+        self.submissions = layer('submissions')
+        self.reminders = layer('reminders')
+        self.feedback_drafts = layer('feedback_drafts')
+        # Secondary indexes, so the list getters skip a scan: rows by id per
+        # parent, and pending reminders by id in save order
+        self._assignments_by_course: Dict[str, Dict[str, Assignment]] = layer('_assignments_by_course')
+        self._submissions_by_assignment: Dict[str, Dict[str, Submission]] = layer('_submissions_by_assignment')
+        # Copied rather than layered: a save may have to remove a baseline entry
+        self._pending_reminders: Dict[str, Reminder] = (
+            dict(baseline._pending_reminders) if baseline is not None else {})
+        # Read-only snapshots handed to callers, rebuilt only after a save
+        self._courses_snapshot: Optional[tuple] = None
+        self._pending_snapshot: Optional[tuple] = None
     
     def save_course(self, course: Course) -> bool:
         self.courses[course.id] = course
+        self._courses_snapshot = None
         return True
     
     def get_course(self, course_id: str) -> Optional[Course]:
         return self.courses.get(course_id)
     
     def get_courses_for_user(self, user_id: str) -> List[Course]:
-        return list(self.courses.values())
+        if self._courses_snapshot is None:
+            self._courses_snapshot = tuple(self.courses.values())
+        return self._courses_snapshot
     
     def save_assignment(self, assignment: Assignment) -> bool:
+        previous = self.assignments.get(assignment.id)
+        if previous is not None:
+            _bucket(self._assignments_by_course, previous.course_id).pop(assignment.id, None)
         self.assignments[assignment.id] = assignment
+        _bucket(self._assignments_by_course, assignment.course_id)[assignment.id] = assignment
         return True
     
     def get_assignment(self, assignment_id: str) -> Optional[Assignment]:
         return self.assignments.get(assignment_id)
     
     def get_assignments_for_course(self, course_id: str) -> List[Assignment]:
-        return [a for a in self.assignments.values() if a.course_id == course_id]
+        return list(self._assignments_by_course.get(course_id, {}).values())
     
     def save_submission(self, submission: Submission) -> bool:
+        previous = self.submissions.get(submission.id)
+        if previous is not None:
+            _bucket(self._submissions_by_assignment, previous.assignment_id).pop(submission.id, None)
         self.submissions[submission.id] = submission
+        _bucket(self._submissions_by_assignment, submission.assignment_id)[submission.id] = submission
         return True
     
     def get_submission(self, submission_id: str) -> Optional[Submission]:
         return self.submissions.get(submission_id)
     
     def get_submissions_for_assignment(self, assignment_id: str) -> List[Submission]:
-        return [s for s in self.submissions.values() if s.assignment_id == assignment_id]
+        return list(self._submissions_by_assignment.get(assignment_id, {}).values())
     
     def save_reminder(self, reminder: Reminder) -> bool:
         self.reminders[reminder.id] = reminder
+        if reminder.status.value == 'pending':
+            self._pending_reminders[reminder.id] = reminder
+        else:
+            self._pending_reminders.pop(reminder.id, None)
+        self._pending_snapshot = None
         return True
     
     def get_pending_reminders(self) -> List[Reminder]:
-        return [r for r in self.reminders.values() if r.status.value == 'pending']
+        if self._pending_snapshot is None:
+            self._pending_snapshot = tuple(self._pending_reminders.values())
+        return self._pending_snapshot
     
     def save_feedback_draft(self, feedback: FeedbackDraft) -> bool:
         self.feedback_drafts[feedback.id] = feedback
@@ -185,17 +296,162 @@ class MockDatabase:
         return self.feedback_drafts.get(feedback_id)
 
 
+class TestDataModels(unittest.TestCase):
+    """Test cases for data model serialization"""
+    
+    def test_to_json_leaves_out_omitted_fields(self):
+        """to_json drops the same fields as to_dict, whichever encoder runs"""
+        from models.data_models import Quiz, QuizSubmission
+        quiz = Quiz(id="quiz_1", canvas_quiz_id="1", course_id="course_1001", title="Quiz 1",
+                    access_code="SECRET", ip_filter="10.0.0.0/8")
+        submission = QuizSubmission(id="qs_1", canvas_submission_id="1", quiz_id="quiz_1",
+                                    user_id="12345", attempt=1, validation_token="TOKEN")
+        
+        for model, omitted in ((quiz, ('access_code', 'ip_filter')),
+                               (submission, ('score_before_regrade', 'validation_token'))):
+            encoded = json.loads(model.to_json())
+            for name in omitted:
+                self.assertNotIn(name, encoded)
+                self.assertNotIn(name, model.to_dict())
+            self.assertFalse(any(name.startswith('_') for name in encoded))
+        self.assertNotIn(b"SECRET", quiz.to_json())
+        self.assertNotIn(b"TOKEN", submission.to_json())
+        self.assertEqual(json.loads(quiz.to_json())['title'], "Quiz 1")
+    
+    # Keys of each model's hand-written to_dict before it was generated, in
+    # order: the always-present keys, then those added only when set
+    _TO_DICT_KEYS = {
+        'Quiz': (['id', 'canvas_quiz_id', 'course_id', 'title', 'description', 'quiz_type',
+                  'time_limit', 'shuffle_answers', 'show_correct_answers', 'scoring_policy',
+                  'allowed_attempts', 'one_question_at_a_time', 'cant_go_back', 'published',
+                  'points_possible', 'question_count', 'is_timed', 'is_available',
+                  'created_at', 'updated_at'], ['due_at', 'lock_at', 'unlock_at']),
+        'QuizQuestion': (['id', 'canvas_question_id', 'quiz_id', 'question_name', 'question_text',
+                          'question_type', 'position', 'points_possible', 'answers',
+                          'correct_comments', 'incorrect_comments', 'neutral_comments'], []),
+        'QuizSubmission': (['id', 'canvas_submission_id', 'quiz_id', 'user_id', 'attempt',
+                            'workflow_state', 'time_spent', 'score', 'kept_score', 'fudge_points',
+                            'has_seen_results', 'is_in_progress', 'time_remaining',
+                            'created_at', 'updated_at'], ['started_at', 'finished_at', 'end_at']),
+        'QuizAnswer': (['question_id', 'answer', 'answered_at'], []),
+        'Course': (['id', 'canvas_course_id', 'name', 'course_code', 'description', 'workflow_state',
+                    'created_at', 'updated_at'], ['start_at', 'end_at', 'enrollment_term_id']),
+        'Assignment': (['id', 'canvas_assignment_id', 'course_id', 'name', 'description',
+                        'points_possible', 'grading_type', 'submission_types', 'allowed_extensions',
+                        'status', 'created_at', 'updated_at'], ['due_at', 'lock_at', 'unlock_at']),
+        'Submission': (['id', 'canvas_submission_id', 'assignment_id', 'user_id', 'score', 'grade',
+                        'workflow_state', 'late', 'excused', 'attempt', 'body', 'url', 'attachments',
+                        'comments', 'status', 'created_at', 'updated_at'], ['submitted_at']),
+        'File': (['id', 'canvas_file_id', 'course_id', 'folder_id', 'display_name', 'filename',
+                  'content_type', 'size', 'url', 'download_url', 'thumbnail_url', 'mime_class',
+                  'locked', 'hidden', 'uuid', 'created_at', 'updated_at'], []),
+        'Reminder': (['id', 'user_id', 'assignment_id', 'message', 'scheduled_for', 'status',
+                      'notification_type', 'created_at', 'updated_at'], ['sent_at', 'failure_reason']),
+        'FeedbackDraft': (['id', 'submission_id', 'instructor_id', 'content', 'rubric_scores',
+                           'suggestions', 'confidence_score', 'model_used', 'is_approved',
+                           'created_at', 'updated_at'], ['approved_at']),
+    }
+    
+    @staticmethod
+    def _model_samples():
+        """Each model twice: optional fields left unset, then all set"""
+        from models import data_models as m
+        past = _FIXED_DUE_AT - timedelta(days=7)
+        samples = [
+            (m.Quiz(id="quiz_1", canvas_quiz_id="1", course_id="course_1001", title="Quiz 1"),
+             m.Quiz(id="quiz_1", canvas_quiz_id="1", course_id="course_1001", title="Quiz 1",
+                    time_limit=30, due_at=_FIXED_DUE_AT, lock_at=_FIXED_DUE_AT, unlock_at=past)),
+            (m.QuizQuestion(id="q_1", canvas_question_id="1", quiz_id="quiz_1", question_name="Q1",
+                            question_text="2 + 2?", question_type=m.QuestionType.NUMERICAL,
+                            position=1, points_possible=1.0),) * 2,
+            (m.QuizSubmission(id="qs_1", canvas_submission_id="1", quiz_id="quiz_1",
+                              user_id="12345", attempt=1),
+             m.QuizSubmission(id="qs_1", canvas_submission_id="1", quiz_id="quiz_1", user_id="12345",
+                              attempt=1, started_at=past, finished_at=past, end_at=past)),
+            (m.QuizAnswer(question_id="q_1", answer=4),) * 2,
+            (m.Course(id="course_1001", canvas_course_id="1001", name="CS", course_code="CS101"),
+             m.Course(id="course_1001", canvas_course_id="1001", name="CS", course_code="CS101",
+                      start_at=past, end_at=_FIXED_DUE_AT, enrollment_term_id="1")),
+            (m.Assignment(id="assign_2001", canvas_assignment_id="2001", course_id="course_1001",
+                          name="A1", status=m.AssignmentStatus.PUBLISHED),
+             m.Assignment(id="assign_2001", canvas_assignment_id="2001", course_id="course_1001",
+                          name="A1", due_at=_FIXED_DUE_AT, lock_at=_FIXED_DUE_AT, unlock_at=past)),
+            (m.Submission(id="sub_1", canvas_submission_id="1", assignment_id="assign_2001",
+                          user_id="12345"),
+             m.Submission(id="sub_1", canvas_submission_id="1", assignment_id="assign_2001",
+                          user_id="12345", workflow_state="submitted", late=True, submitted_at=past)),
+            (m.File(id="file_1", canvas_file_id="1", course_id="course_1001"),) * 2,
+            (m.Reminder(id="reminder_1", user_id="12345", assignment_id="assign_2001",
+                        message="Due soon", scheduled_for=past),
+             m.Reminder(id="reminder_1", user_id="12345", assignment_id="assign_2001",
+                        message="Due soon", scheduled_for=past, sent_at=past, failure_reason="bounced")),
+            (m.FeedbackDraft(id="fb_1", submission_id="sub_1", instructor_id="1", content="Good"),
+             m.FeedbackDraft(id="fb_1", submission_id="sub_1", instructor_id="1", content="Good",
+                             approved_at=past)),
+        ]
+        return [model for pair in samples for model in pair]
+    
+    def test_generated_to_dict_matches_field_mapping(self):
+        """Generated to_dict emits the hand-written keys in order, with Enums and datetimes converted"""
+        def reference(model, key):
+            value = getattr(model, key)
+            if callable(value):
+                value = value()
+            if isinstance(value, Enum):
+                return value.value
+            if isinstance(value, datetime):
+                return value.isoformat()
+            return value
+        
+        for model in self._model_samples():
+            always, when_set = self._TO_DICT_KEYS[type(model).__name__]
+            keys = always + [key for key in when_set if getattr(model, key)]
+            with self.subTest(model=type(model).__name__, keys=len(keys)):
+                data = model.to_dict()
+                self.assertEqual(list(data), keys)
+                self.assertEqual(data, {key: reference(model, key) for key in keys})
+    
+    def test_in_memory_indexes_follow_moved_rows(self):
+        """A row re-saved under another course or assignment is listed only under the new one"""
+        from main import InMemoryDatabase
+        db = InMemoryDatabase()
+        assignment = Assignment(id="assign_2001", canvas_assignment_id="2001",
+                                course_id="course_1001", name="A1")
+        submission = Submission(id="sub_1", canvas_submission_id="1",
+                                assignment_id="assign_2001", user_id="12345")
+        db.save_assignment(assignment)
+        db.save_submission(submission)
+        
+        # A fresh row from Canvas under a new course, then the same object changed in place
+        db.save_assignment(Assignment(id="assign_2001", canvas_assignment_id="2001",
+                                      course_id="course_1002", name="A1"))
+        self.assertEqual(db.get_assignments_for_course("course_1001"), [])
+        self.assertEqual([a.id for a in db.get_assignments_for_course("course_1002")], ["assign_2001"])
+        assignment.course_id = "course_1003"
+        db.save_assignments_bulk([assignment])
+        self.assertEqual(db.get_assignments_for_course("course_1002"), [])
+        self.assertEqual(db.get_assignments_for_course("course_1003"), [assignment])
+        
+        submission.assignment_id = "assign_2002"
+        db.save_submission(submission)
+        self.assertEqual(db.get_submissions_for_assignment("assign_2001"), [])
+        self.assertEqual(db.get_submissions_for_assignment("assign_2002"), [submission])
+        self.assertIs(db.get_submission("sub_1"), submission)
+
+
 class TestCanvasAuthService(unittest.TestCase):
     """Test cases for Canvas authentication service"""
     
-    def setUp(self):
-        self.token_manager = TokenManager()
-        self.auth_service = CanvasAuthService(
+    @classmethod
+    def setUpClass(cls):
+        # These tests only read the service's configuration, so one instance serves all
+        cls.token_manager = TokenManager()
+        cls.auth_service = CanvasAuthService(
             canvas_base_url="https://test.instructure.com",
             client_id="test_client_id",
             client_secret="test_client_secret",
             redirect_uri="http://localhost:8000/auth/callback",
-            token_manager=self.token_manager
+            token_manager=cls.token_manager
         )
     
     def test_get_authorization_url(self):
@@ -208,14 +464,7 @@ class TestCanvasAuthService(unittest.TestCase):
     @patch('requests.post')
     def test_exchange_code_for_token(self, mock_post):
         """Test token exchange"""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            'access_token': 'test_access_token',
-            'refresh_token': 'test_refresh_token',
-            'expires_in': 3600
-        }
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        mock_post.return_value = _TOKEN_RESPONSE
         
         result = self.auth_service.exchange_code_for_token('test_code')
         self.assertIsNotNone(result)
@@ -224,10 +473,7 @@ class TestCanvasAuthService(unittest.TestCase):
     @patch('requests.get')
     def test_get_user_info(self, mock_get):
         """Test user info retrieval"""
-        mock_response = Mock()
-        mock_response.json.return_value = MockCanvasData.get_user_info()
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        mock_get.return_value = _USER_INFO_RESPONSE
         
         result = self.auth_service.get_user_info('test_token')
         self.assertIsNotNone(result)
@@ -237,60 +483,86 @@ class TestCanvasAuthService(unittest.TestCase):
 class TestCanvasAPIClient(unittest.TestCase):
     """Test cases for Canvas API client"""
     
-    def setUp(self):
-        self.client = CanvasAPIClient(
+    @classmethod
+    def setUpClass(cls):
+        cls.client = CanvasAPIClient(
             base_url="https://test.instructure.com",
             access_token="test_token"
         )
+        # The client sends everything through its session, so patch that
+        # once for the class rather than requests.get in every test
+        cls._request_patcher = patch.object(cls.client.session, 'request')
+        cls.mock_request = cls._request_patcher.start()
+        cls.addClassCleanup(cls._request_patcher.stop)
     
-    @patch('requests.get')
-    def test_get_user_info(self, mock_get):
-        """Test user info retrieval"""
+    def setUp(self):
+        self.mock_request.reset_mock(return_value=True, side_effect=True)
+        self.client.clear_cache()
+    
+    def _respond_with(self, body: bytes) -> None:
         mock_response = Mock()
-        mock_response.json.return_value = MockCanvasData.get_user_info()
+        mock_response.content = body
         mock_response.raise_for_status.return_value = None
         mock_response.headers = {}
-        mock_get.return_value = mock_response
+        self.mock_request.return_value = mock_response
+    
+    def test_get_user_info(self):
+        """Test user info retrieval"""
+        self._respond_with(_USER_INFO_BODY)
         
         result = self.client.get_user_info()
         self.assertIsNotNone(result)
         self.assertEqual(result['name'], 'Test Student')
     
-    @patch('requests.get')
-    def test_get_courses(self, mock_get):
+    def test_get_courses(self):
         """Test courses retrieval"""
-        mock_response = Mock()
-        mock_response.json.return_value = MockCanvasData.get_courses()
-        mock_response.raise_for_status.return_value = None
-        mock_response.headers = {}
-        mock_get.return_value = mock_response
+        self._respond_with(_COURSES_BODY)
         
         result = self.client.get_courses()
         self.assertIsNotNone(result)
         self.assertEqual(len(result), 2)
         self.assertEqual(result[0]['name'], 'Introduction to Computer Science')
     
-    @patch('requests.get')
-    def test_get_assignments(self, mock_get):
+    def test_get_assignments(self):
         """Test assignments retrieval"""
-        mock_response = Mock()
-        mock_response.json.return_value = MockCanvasData.get_assignments(1001)
-        mock_response.raise_for_status.return_value = None
-        mock_response.headers = {}
-        mock_get.return_value = mock_response
+        self._respond_with(_ASSIGNMENTS_BODY)
         
         result = self.client.get_assignments('1001')
         self.assertIsNotNone(result)
         self.assertEqual(len(result), 2)
         self.assertEqual(result[0]['name'], 'Programming Assignment 1')
+    
+    def test_etag_revalidation_across_clients(self):
+        """A client built later for the same token revalidates with the stored ETag"""
+        first = Mock(status_code=200, content=b'[{"id": 1}]', headers={'ETag': '"v1"'})
+        not_modified = Mock(status_code=304, content=b'', headers={})
+        self.mock_request.side_effect = [first]
+        self.assertEqual(self.client.get_folders('1001'), [{'id': 1}])
+        
+        # The API builds a client per request; the validator must outlive this one
+        later = CanvasAPIClient(base_url="https://test.instructure.com", access_token="test_token")
+        with patch.object(later.session, 'request', side_effect=[not_modified]) as later_request:
+            self.assertEqual(later.get_folders('1001'), [{'id': 1}])
+        self.assertEqual(later_request.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+        
+        # Nothing stored, so a 304 (say after an eviction) falls back to a plain fetch
+        self.client.clear_cache()
+        self.mock_request.side_effect = [not_modified, first]
+        self.assertEqual(self.client.get_folders('1001'), [{'id': 1}])
+        self.assertIsNone(self.mock_request.call_args.kwargs.get('headers'))
 
 
 class TestLLMService(unittest.TestCase):
     """Test cases for LLM service"""
     
+    @classmethod
+    def setUpClass(cls):
+        from llm.llm_service import LLMService
+        cls.mock_adapter = Mock()
+        cls.llm_service = LLMService(cls.mock_adapter)
+    
     def setUp(self):
-        self.mock_adapter = Mock()
-        self.llm_service = LLMService(self.mock_adapter)
+        self.mock_adapter.reset_mock(return_value=True, side_effect=True)
     
     def test_create_reminder_message(self):
         """Test reminder message generation"""
@@ -299,17 +571,9 @@ class TestLLMService(unittest.TestCase):
             canvas_assignment_id="123",
             course_id="course_1",
             name="Test Assignment",
-            due_at=datetime.utcnow() + timedelta(hours=24)
-        )
-        
-        user = User(
-            id="user_1",
-            canvas_user_id="456",
-            email="test@example.com",
-            name="Test Student",
-            role=UserRole.STUDENT,
-            access_token="dummy_token"
+            due_at=_FIXED_DUE_AT
         )
+        user = _FIXTURE_USER
         
         self.mock_adapter.generate_reminder_message.return_value = Mock(
             content="Don't forget about Test Assignment!"
@@ -320,40 +584,313 @@ class TestLLMService(unittest.TestCase):
         self.mock_adapter.generate_reminder_message.assert_called_once()
 
 
+class TestPromptTemplates(unittest.TestCase):
+    """Test cases for prompt token counting"""
+    
+    @classmethod
+    def setUpClass(cls):
+        from llm import _templates_impl
+        cls.impl = _templates_impl
+    
+    def test_tokenizer_load_is_bounded(self):
+        """A tokenizer download that hangs falls back to the estimate after the timeout"""
+        release = threading.Event()
+        tiktoken = Mock()
+        tiktoken.encoding_for_model.side_effect = lambda model: release.wait()
+        encoder = self.impl._LazyEncoder("gpt-4o", timeout=0.05)
+        
+        with patch.object(self.impl, 'tiktoken', tiktoken, create=True), \
+                patch.object(self.impl, 'TIKTOKEN_AVAILABLE', True):
+            started = time.monotonic()
+            self.assertIsNone(encoder.get())
+            self.assertLess(time.monotonic() - started, 2)
+            # Later calls do not wait again
+            self.assertIsNone(encoder.get())
+        release.set()
+        tiktoken.encoding_for_model.assert_called_once_with("gpt-4o")
+    
+    def test_token_count_estimate(self):
+        """Without an encoding, counts are four characters per token on top of the static budget"""
+        from llm.prompt_templates import PromptTemplates, PromptType
+        with patch.object(self.impl._ENCODER, 'get', return_value=None):
+            self.impl._base_token_count.cache_clear()
+            budget = PromptTemplates.token_budget(PromptType.ESSAY_WRITING)
+            self.assertGreater(budget, 0)
+            self.assertEqual(PromptTemplates.token_count("essay_writing", "x" * 9), budget + 3)
+        self.impl._base_token_count.cache_clear()
+    
+    def test_help_prompt_bytes_match_text(self):
+        """The bytes prompt is the text prompt encoded, a None question included"""
+        from llm.prompt_templates import PromptTemplates, PromptContext
+        context = PromptContext(course_name="CS101", course_materials=[{'name': 'Notes'}])
+        for name, question in (("Essay on café culture", "How long?"), ("Discussion post", None)):
+            text = PromptTemplates.get_assignment_help_prompt(name, "", question, context)
+            self.assertEqual(PromptTemplates.get_assignment_help_prompt_bytes(name, "", question, context),
+                             text.encode("utf-8"))
+
+
 class TestNotificationService(unittest.TestCase):
     """Test cases for notification service"""
     
+    @classmethod
+    def setUpClass(cls):
+        from notifications.notification_service import NotificationService, NotificationType, SendResult
+        cls.notification_service = NotificationService()
+        cls.mock_provider = Mock()
+        cls.push = NotificationType.PUSH
+        cls.sent = SendResult.SENT
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.notification_service.close()
+    
     def setUp(self):
-        self.notification_service = NotificationService()
+        self.mock_provider.reset_mock(return_value=True, side_effect=True)
+        self.notification_service.providers[self.push] = self.mock_provider
     
     def test_send_notification(self):
         """Test notification sending"""
-        # Mock providers
-        mock_provider = Mock()
-        mock_provider.send.return_value = True
-        self.notification_service.providers[NotificationType.PUSH] = mock_provider
+        mock_provider = self.mock_provider
+        mock_provider.send.return_value = self.sent
         
         notification_id = self.notification_service.send_notification(
             user_id="test_user",
             title="Test Notification",
             message="This is a test",
-            notification_type=NotificationType.PUSH,
+            notification_type=self.push,
             metadata={'device_token': 'test_token'}
         )
         
         self.assertIsNotNone(notification_id)
         mock_provider.send.assert_called_once()
+        self.assertEqual(self.notification_service.get_notification_status(notification_id).value, "sent")
+
+
+class FakeProvider:
+    """Notification provider recording each batch and answering from a script
+    
+    results holds one SendResult per send, in order; once it runs out every
+    send answers default. When gate is set, send_many waits on it after
+    setting entered, so a test can hold the batch in flight.
+    """
+    
+    def __init__(self, default, results=(), gate: Optional[threading.Event] = None):
+        self.default = default
+        self.results = list(results)
+        self.batches: List[List[str]] = []
+        self.gate = gate
+        self.entered = threading.Event()
+    
+    def send(self, notification):
+        return self.send_many([notification])[0]
+    
+    def send_many(self, notifications):
+        self.batches.append([notification.id for notification in notifications])
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        return [self.results.pop(0) if self.results else self.default for _ in notifications]
+    
+    def close(self):
+        pass
+
+
+class TestNotificationServiceBehaviour(unittest.TestCase):
+    """Batching, eviction, retries and shutdown of the notification service"""
+    
+    @classmethod
+    def setUpClass(cls):
+        from notifications.notification_service import (
+            NotificationService, NotificationType, NotificationStatus, SendResult
+        )
+        cls.NotificationService = NotificationService
+        cls.Type = NotificationType
+        cls.Status = NotificationStatus
+        cls.Result = SendResult
+    
+    def _service(self, **kwargs):
+        """A service sending through fake push and SMS providers, closed after the test"""
+        service = self.NotificationService(**kwargs)
+        self.addCleanup(service.close)
+        self.push = FakeProvider(self.Result.SENT)
+        self.sms = FakeProvider(self.Result.SENT)
+        service.providers[self.Type.PUSH] = self.push
+        service.providers[self.Type.SMS] = self.sms
+        return service
+    
+    def _wait_for_status(self, service, notification_id, status, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while service.get_notification_status(notification_id) is not status:
+            if time.monotonic() > deadline:
+                self.fail(f"{notification_id} is {service.get_notification_status(notification_id)}, not {status}")
+            time.sleep(0.01)
+    
+    def _assert_indexes_consistent(self, service):
+        """_by_user and _by_user_status hold exactly what notifications_db holds"""
+        stored = list(service.notifications_db.values())
+        by_user = {}
+        by_status = {}
+        for notification in stored:
+            by_user.setdefault(notification.user_id, []).append(notification.id)
+            by_status.setdefault((notification.user_id, notification.status), set()).add(notification.id)
+        self.assertEqual({user: [n.id for n in queue] for user, queue in service._by_user.items()}, by_user)
+        self.assertEqual(service._by_user_status, by_status)
+    
+    def test_send_many_batches_by_type(self):
+        """One provider batch per type, with ids returned in item order"""
+        service = self._service()
+        items = [
+            {'user_id': "u1", 'title': "t", 'message': "m", 'notification_type': notification_type}
+            for notification_type in (self.Type.PUSH, self.Type.SMS, self.Type.PUSH)
+        ]
+        
+        ids = service.send_many(items)
+        
+        self.assertEqual(self.push.batches, [[ids[0], ids[2]]])
+        self.assertEqual(self.sms.batches, [[ids[1]]])
+        for notification_id in ids:
+            self.assertIs(service.get_notification_status(notification_id), self.Status.SENT)
+    
+    def test_enqueue_sends_inline_when_queue_full(self):
+        """With the worker busy and the queue full, a notification is sent on the caller's thread"""
+        service = self._service(max_queued=1, batch_timeout=0)
+        release = threading.Event()
+        self.push.gate = release
+        self.addCleanup(release.set)
+        
+        in_flight = service.enqueue_notification("u1", "t", "m", self.Type.PUSH)
+        self.assertTrue(self.push.entered.wait(5))
+        queued = service.enqueue_notification("u1", "t", "m", self.Type.PUSH)
+        inline = service.enqueue_notification("u1", "t", "m", self.Type.SMS)
+        
+        # Sent before enqueue_notification returned, while the worker is still blocked
+        self.assertIs(service.get_notification_status(inline), self.Status.SENT)
+        self.assertIs(service.get_notification_status(queued), self.Status.PENDING)
+        
+        release.set()
+        self._wait_for_status(service, in_flight, self.Status.SENT)
+        self._wait_for_status(service, queued, self.Status.SENT)
+    
+    def test_eviction_keeps_indexes_consistent(self):
+        """Per-user and overall limits evict the oldest and keep both indexes in step"""
+        service = self._service(max_stored=3, max_per_user=2)
+        
+        first, second, third = [service.send_notification("u1", "t", "m") for _ in range(3)]
+        self.assertEqual(list(service.notifications_db), [second, third])
+        self._assert_indexes_consistent(service)
+        
+        fourth, fifth = [service.send_notification("u2", "t", "m") for _ in range(2)]
+        self.assertEqual(list(service.notifications_db), [third, fourth, fifth])
+        self.assertIsNone(service.get_notification_status(first))
+        self._assert_indexes_consistent(service)
+        
+        self.assertEqual(service.unread_count("u1"), 1)
+        self.assertTrue(service.mark_notification_read(fourth))
+        self.assertEqual(service.unread_count("u2"), 1)
+        self.assertEqual(service.count_by_status("u2", self.Status.READ), 1)
+        self._assert_indexes_consistent(service)
+    
+    def test_retry_then_sent(self):
+        """A transient failure stays PENDING, then is SENT by the retry"""
+        service = self._service(retry_base=0.01)
+        self.push.results = [self.Result.RETRY]
+        
+        notification_id = service.send_notification("u1", "t", "m")
+        
+        self._wait_for_status(service, notification_id, self.Status.SENT)
+        self.assertEqual(len(self.push.batches), 2)
+        self.assertEqual(service._retry_attempts, {})
+    
+    def test_retries_stop_at_max_attempts(self):
+        """A send that keeps failing transiently is FAILED after max_attempts sends"""
+        service = self._service(retry_base=0.01, max_attempts=3)
+        self.push.default = self.Result.RETRY
+        
+        notification_id = service.send_notification("u1", "t", "m")
+        
+        self._wait_for_status(service, notification_id, self.Status.FAILED)
+        self.assertEqual(len(self.push.batches), 3)
+    
+    def test_permanent_failure_not_retried(self):
+        """FAILED from the provider is final on the first send"""
+        service = self._service(retry_base=0.01)
+        self.push.default = self.Result.FAILED
+        
+        notification_id = service.send_notification("u1", "t", "m")
+        
+        self.assertIs(service.get_notification_status(notification_id), self.Status.FAILED)
+        self.assertEqual(len(self.push.batches), 1)
+        self.assertEqual(service._retry_heap, [])
+    
+    def test_close_fails_pending_retries(self):
+        """Retries not yet due when the service closes are marked FAILED"""
+        service = self._service(retry_base=60)
+        self.push.results = [self.Result.RETRY]
+        
+        notification_id = service.send_notification("u1", "t", "m")
+        self.assertIs(service.get_notification_status(notification_id), self.Status.PENDING)
+        
+        service.close()
+        
+        self.assertIs(service.get_notification_status(notification_id), self.Status.FAILED)
+        self.assertEqual(len(self.push.batches), 1)
+    
+    def test_reminder_channels(self):
+        """A reminder over several channels sends once per channel, ids in channel order"""
+        service = self._service()
+        user = Mock(id="u1", email="test@example.com",
+                    metadata={'device_token': "token", 'phone_number': "+15550100"})
+        reminder = Reminder(id="reminder_1", user_id="u1", assignment_id="assign_2001",
+                            message="Due soon", scheduled_for=_FIXED_DUE_AT)
+        
+        ids = service.send_reminder_channels(reminder, user, [self.Type.PUSH, self.Type.SMS])
+        
+        self.assertEqual(self.push.batches, [[ids[0]]])
+        self.assertEqual(self.sms.batches, [[ids[1]]])
+        self.assertEqual(service.notifications_db[ids[1]].metadata, {'phone_number': "+15550100"})
 
 
 class TestSyncService(unittest.TestCase):
     """Test cases for sync service"""
     
+    @classmethod
+    def setUpClass(cls):
+        from sync.sync_service import CanvasSyncService
+        # Building a sync service starts its event loop thread, so tests share one
+        cls.mock_auth_service = Mock()
+        cls.sync_service = CanvasSyncService(cls.mock_auth_service, MockDatabase())
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.sync_service.close()
+    
     def setUp(self):
-        self.mock_auth_service = Mock()
+        self.mock_auth_service.reset_mock(return_value=True, side_effect=True)
         self.mock_database = MockDatabase()
-        self.sync_service = CanvasSyncService(self.mock_auth_service, self.mock_database)
+        self.sync_service.database = self.mock_database
+        # Forget clients, responses and row checksums left by the previous test
+        self.sync_service._client_cache.clear()
+        self.sync_service._resp_cache.clear()
+        self.sync_service._row_hashes.clear()
     
-    @patch('src.sync.sync_service.CanvasAPIClient')
+    @patch('sync.sync_service.AsyncCanvasClient')
+    def test_assignment_lists_not_shared_between_users(self, mock_client_class):
+        """Each user's sync reads their own assignment list, even for the same course"""
+        self.mock_auth_service.get_user.side_effect = lambda user_id: Mock(id=user_id, access_token=f"enc_{user_id}")
+        clients = []
+        for name in ("Programming Assignment 1", "Programming Assignment 1 (extended)"):
+            client = Mock(base_url="https://test.instructure.com")
+            client.iter_assignments = mock_pages([dict(_ASSIGNMENTS[0], name=name)])
+            clients.append(client)
+        mock_client_class.side_effect = clients
+        assignment_id = f"assign_{_ASSIGNMENTS[0]['id']}"
+        
+        for user_id, name in (("alice", "Programming Assignment 1"),
+                              ("bob", "Programming Assignment 1 (extended)")):
+            self.sync_service._run(self.sync_service.sync_course_assignments(user_id, "course_1001"))
+            self.assertEqual(self.mock_database.assignments[assignment_id].name, name)
+    
+    @patch('sync.sync_service.AsyncCanvasClient')
     def test_sync_user_courses(self, mock_client_class):
         """Test course synchronization"""
         # Mock user
@@ -364,94 +901,150 @@ class TestSyncService(unittest.TestCase):
         
         # Mock Canvas client
         mock_client = Mock()
-        mock_client.get_courses.return_value = MockCanvasData.get_courses()
+        mock_client.iter_courses = mock_pages(MockCanvasData.get_courses())
         mock_client_class.return_value = mock_client
         
-        job_id = self.sync_service.sync_user_courses("test_user")
+        job_id = self.sync_service.trigger_sync("test_user")
         
         self.assertIsNotNone(job_id)
         self.assertEqual(len(self.mock_database.courses), 2)
 
+    @patch('sync.sync_service.AsyncCanvasClient')
+    def test_unchanged_rows_skipped_until_save_fails(self, mock_client_class):
+        """A second sync skips unchanged rows, but rows from a failed bulk save are written again"""
+        self.mock_auth_service.get_user.return_value = Mock(id="test_user")
+        mock_client = Mock(base_url="https://test.instructure.com")
+        mock_client.iter_courses = mock_pages(MockCanvasData.get_courses())
+        mock_client_class.return_value = mock_client
+        saved = []
+        outcomes = iter([False, True, True])
+
+        def save_courses_bulk(courses):
+            saved.append([course.id for course in courses])
+            return next(outcomes)
+        self.mock_database.save_courses_bulk = save_courses_bulk
+
+        def sync():
+            return self.sync_service._run(self.sync_service.sync_user_courses("test_user"))
+
+        sync()   # save fails: nothing is recorded as synced
+        sync()   # the same rows are written again
+        job_id = sync()   # now they are known, so the save is skipped
+
+        self.assertEqual(saved, [["course_1001", "course_1002"]] * 2)
+        self.assertEqual(self.sync_service.sync_jobs[job_id].items_processed, 2)
+
+        # A changed row is the only one written
+        mock_client.iter_courses = mock_pages([dict(MockCanvasData.get_courses()[0], name="Renamed"),
+                                               MockCanvasData.get_courses()[1]])
+        sync()
+        self.assertEqual(saved[-1], ["course_1001"])
+
+
+    def test_parse_assignments_status(self):
+        """Parsed assignments carry an AssignmentStatus, so to_dict works"""
+        from sync.sync_service import _parse_assignments
+        from models.data_models import AssignmentStatus
+        rows = [dict(item, workflow_state=state)
+                for item, state in zip(MockCanvasData.get_assignments(1001), ("unpublished", "deleted"))]
+        
+        (first, error), (second, _) = _parse_assignments(rows, "course_1001")
+        
+        self.assertIsNone(error)
+        self.assertIs(first.status, AssignmentStatus.UNPUBLISHED)
+        self.assertIs(second.status, AssignmentStatus.DRAFT)
+        self.assertEqual(first.to_dict()['status'], "unpublished")
+
 
 class IntegrationTestSuite(unittest.TestCase):
     """Integration tests for the complete system"""
     
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
+    @classmethod
+    def setUpClass(cls):
+        from notifications.notification_service import NotificationService
+        from sync.sync_service import CanvasSyncService
+        cls.temp_dir = tempfile.mkdtemp()
         
         # Initialize services
-        self.token_manager = TokenManager()
-        self.auth_service = CanvasAuthService(
+        cls.token_manager = TokenManager()
+        cls.auth_service = CanvasAuthService(
             canvas_base_url="https://test.instructure.com",
             client_id="test_client_id",
             client_secret="test_client_secret",
             redirect_uri="http://localhost:8000/auth/callback",
-            token_manager=self.token_manager
+            token_manager=cls.token_manager
         )
         
-        self.database = MockDatabase()
-        self.sync_service = CanvasSyncService(self.auth_service, self.database)
+        # Canvas data every test starts from, saved once; tests layer over it
+        cls.baseline = MockDatabase()
+        for assignment_data in _ASSIGNMENTS:
+            cls.baseline.save_assignment(Assignment(
+                id=f"assign_{assignment_data['id']}",
+                canvas_assignment_id=str(assignment_data['id']),
+                course_id="course_1001",
+                name=assignment_data['name']
+            ))
         
-        self.notification_service = NotificationService()
+        cls.sync_service = CanvasSyncService(cls.auth_service, cls.baseline)
+        
+        cls.notification_service = NotificationService()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.sync_service.close()
+        cls.notification_service.close()
+        shutil.rmtree(cls.temp_dir)
     
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir)
+    def setUp(self):
+        # A fresh layer over the baseline per test, and no clients or row
+        # checksums from the last one
+        self.database = MockDatabase(baseline=self.baseline)
+        self.sync_service.database = self.database
+        self.sync_service._client_cache.clear()
+        self.sync_service._row_hashes.clear()
     
     @patch('requests.post')
     @patch('requests.get')
     def test_complete_workflow(self, mock_get, mock_post):
         """Test complete workflow from authentication to sync"""
         # Mock authentication
-        mock_token_response = Mock()
-        mock_token_response.json.return_value = {
-            'access_token': 'test_access_token',
-            'expires_in': 3600
-        }
-        mock_token_response.raise_for_status.return_value = None
-        
-        mock_user_response = Mock()
-        mock_user_response.json.return_value = MockCanvasData.get_user_info()
-        mock_user_response.raise_for_status.return_value = None
-        
-        mock_courses_response = Mock()
-        mock_courses_response.json.return_value = MockCanvasData.get_courses()
-        mock_courses_response.raise_for_status.return_value = None
-        mock_courses_response.headers = {}
-        
-        mock_post.return_value = mock_token_response
-        mock_get.return_value = mock_user_response
+        mock_post.return_value = _TOKEN_RESPONSE
+        mock_get.return_value = _USER_INFO_RESPONSE
         
         # Authenticate user
         user = self.auth_service.authenticate_user('test_code')
         self.assertIsNotNone(user)
         
         # Mock Canvas client for sync
-        with patch('src.sync.sync_service.CanvasAPIClient') as mock_client_class:
+        with patch('sync.sync_service.AsyncCanvasClient') as mock_client_class:
             mock_client = Mock()
-            mock_client.get_courses.return_value = MockCanvasData.get_courses()
+            mock_client.iter_courses = mock_pages(MockCanvasData.get_courses())
             mock_client_class.return_value = mock_client
             
             # Sync courses
-            job_id = self.sync_service.sync_user_courses(user.id)
+            job_id = self.sync_service.trigger_sync(user.id)
             self.assertIsNotNone(job_id)
             
             # Verify data was synced
             courses = self.database.get_courses_for_user(user.id)
             self.assertEqual(len(courses), 2)
+            
+            # Baseline rows stay visible, and the sync's writes stay out of the baseline
+            self.assertEqual(len(self.database.get_assignments_for_course("course_1001")), 2)
+            self.assertEqual(len(self.baseline.courses), 0)
 
 
 def run_tests():
     """Run all test suites"""
     # Create test suite
+    loader = unittest.TestLoader()
     test_suite = unittest.TestSuite()
     
     # Add test cases
-    test_suite.addTest(unittest.makeSuite(TestCanvasAuthService))
-    test_suite.addTest(unittest.makeSuite(TestCanvasAPIClient))
-    test_suite.addTest(unittest.makeSuite(TestLLMService))
-    test_suite.addTest(unittest.makeSuite(TestNotificationService))
-    test_suite.addTest(unittest.makeSuite(TestSyncService))
-    test_suite.addTest(unittest.makeSuite(IntegrationTestSuite))
+    for case in (TestDataModels, TestCanvasAuthService, TestCanvasAPIClient, TestLLMService,
+                 TestPromptTemplates, TestNotificationService, TestNotificationServiceBehaviour,
+                 TestSyncService, IntegrationTestSuite):
+        test_suite.addTests(loader.loadTestsFromTestCase(case))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -1,6 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
 # Updated import line
 from models.data_models import Course, Assignment, Submission, Reminder, FeedbackDraft, AssignmentStatus, File
 
+try:
+    import h2  # noqa: F401  (lets httpx negotiate HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# The file routes take their File fields from _file_fields in api/app.py
+# rather than repeating the mapping
+
 # File endpoints to add before notification endpoints
 @app.route('/api/courses/<course_id>/files', methods=['GET'])
 @require_auth
@@ -16,27 +29,12 @@ def get_course_files(course_id: str):
         folder_id = request.args.get('folder_id')
         files_data = client.get_files(course_id, folder_id)
         
-        files = []
-        for file_data in files_data:
-            file_obj = File(
-                id=f"file_{file_data['id']}",
-                canvas_file_id=str(file_data['id']),
-                course_id=course_id,
-                folder_id=str(file_data.get('folder_id', '')),
-                display_name=file_data.get('display_name', ''),
-                filename=file_data.get('filename', ''),
-                content_type=file_data.get('content-type', ''),
-                size=file_data.get('size', 0),
-                url=file_data.get('url', ''),
-                download_url=file_data.get('url', ''),  # Same as url for Canvas
-                thumbnail_url=file_data.get('thumbnail_url'),
-                mime_class=file_data.get('mime_class', ''),
-                locked=file_data.get('locked', False),
-                hidden=file_data.get('hidden', False),
-                uuid=file_data.get('uuid', '')
-            )
-            
-            files.append(file_obj.to_dict())
+        # Built straight as File.to_dict() output; the route never uses the File
+        now = datetime.utcnow().isoformat()
+        files = [
+            {**_file_fields(file_data, course_id), 'created_at': now, 'updated_at': now}
+            for file_data in files_data
+        ]
         
         return jsonify({'files': files})
         
@@ -61,23 +59,7 @@ def get_file_details(course_id: str, file_id: str):
         
         file_data = client.get_file(course_id, file_id)
         
-        file_obj = File(
-            id=f"file_{file_data['id']}",
-            canvas_file_id=str(file_data['id']),
-            course_id=course_id,
-            folder_id=str(file_data.get('folder_id', '')),
-            display_name=file_data.get('display_name', ''),
-            filename=file_data.get('filename', ''),
-            content_type=file_data.get('content-type', ''),
-            size=file_data.get('size', 0),
-            url=file_data.get('url', ''),
-            download_url=file_data.get('url', ''),
-            thumbnail_url=file_data.get('thumbnail_url'),
-            mime_class=file_data.get('mime_class', ''),
-            locked=file_data.get('locked', False),
-            hidden=file_data.get('hidden', False),
-            uuid=file_data.get('uuid', '')
-        )
+        file_obj = File(**_file_fields(file_data, course_id))
         
         return jsonify({'file': file_obj.to_dict()})
         
@@ -137,15 +119,21 @@ def get_user_submissions():
             access_token=g.canvas_token
         )
         
-        # Get user's courses first
-        courses_data = client.get_courses()
-        all_submissions = []
+        # Get user's active courses first, then their submissions in parallel
+        course_ids = client.get_active_course_ids()
         
-        for course_data in courses_data:
-            course_id = str(course_data['id'])
+        def fetch_submissions(course_id):
             try:
-                submissions_data = client.get_user_submissions(course_id, 'self')
-                
+                return client.get_user_submissions(course_id, 'self')
+            except CanvasAPIError:
+                # Rare once Canvas has filtered to active enrollments, but one
+                # course's permissions should not fail the whole listing
+                return []
+        
+        all_submissions = []
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            # map keeps course order, so the response is the same as a serial fetch
+            for submissions_data in executor.map(fetch_submissions, course_ids):
                 for submission_data in submissions_data:
                     submission = Submission(
                         id=f"sub_{submission_data['id']}",
@@ -164,13 +152,9 @@ def get_user_submissions():
                     )
                     
                     if submission_data.get('submitted_at'):
-                        submission.submitted_at = datetime.fromisoformat(submission_data['submitted_at'].replace('Z', '+00:00'))
+                        submission.submitted_at = datetime.fromisoformat(submission_data['submitted_at'])
                     
                     all_submissions.append(submission.to_dict())
-                    
-            except CanvasAPIError:
-                # Skip courses where we can't access submissions
-                continue
         
         return jsonify({'submissions': all_submissions})
         
@@ -183,6 +167,11 @@ def get_user_submissions():
 
 
 # File download proxy endpoint
+# Shared by every download, so concurrent proxies reuse connections (and,
+# over HTTP/2, one connection) to Canvas's file host
+_download_http = httpx.Client(http2=HTTP2_AVAILABLE, timeout=30, follow_redirects=True)
+
+
 @app.route('/api/files/<file_id>/download', methods=['GET'])
 @require_auth
 def download_file(file_id: str):
@@ -206,18 +195,35 @@ def download_file(file_id: str):
             return jsonify({'error': 'File download URL not available'}), 404
         
         # Proxy the download request with authentication
-        response = client.session.get(download_url, stream=True)
-        response.raise_for_status()
+        response = _download_http.send(
+            _download_http.build_request('GET', download_url,
+                                         headers={'Authorization': f'Bearer {g.canvas_token}'}),
+            stream=True
+        )
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError:
+            response.close()
+            raise
+        
+        def relay():
+            try:
+                yield from response.iter_bytes(64 * 1024)
+            finally:
+                response.close()
         
-        # Return file with proper headers
+        # Return file with proper headers, relayed in 64 KiB chunks
         from flask import Response
+        headers = {
+            'Content-Disposition': f'attachment; filename="{file_data.get("display_name", "file")}"'
+        }
+        # Only promise a length Canvas reported; otherwise the body is chunked
+        if file_data.get('size'):
+            headers['Content-Length'] = str(file_data['size'])
         return Response(
-            response.iter_content(chunk_size=8192),
+            relay(),
             content_type=file_data.get('content-type', 'application/octet-stream'),
-            headers={
-                'Content-Disposition': f'attachment; filename="{file_data.get("display_name", "file")}"',
-                'Content-Length': str(file_data.get('size', 0))
-            }
+            headers=headers
         )
         
     except CanvasAPIError as e: